@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import AuditEvent
+from .models import AuditArchive, AuditEvent
 
 
 @admin.register(AuditEvent)
@@ -16,3 +16,16 @@ class AuditEventAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+@admin.register(AuditArchive)
+class AuditArchiveAdmin(admin.ModelAdmin):
+    list_display = ["month", "part", "event_count", "first_timestamp", "last_timestamp", "path"]
+    readonly_fields = [field.name for field in AuditArchive._meta.fields]
+    actions = None
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,186 @@
+"""
+Monthly archival of old AuditEvents into gzipped NDJSON files.
+
+Whole local months older than the retention window are written to
+GDC_AUDIT_ARCHIVE_DIR, recorded in an AuditArchive manifest row and removed
+from the live table in one transaction. Events inside the retention window
+are never touched, so the live table stays append-only for recent data.
+archived_events() reads them back through the manifest.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.core.exports import encode_rows, to_blocks
+from apps.core.utils import local_day_bounds
+from .models import AuditArchive, AuditEvent
+
+ARCHIVE_COLUMNS = [
+    "id",
+    "timestamp",
+    "user_id",
+    "user_email",
+    "ip_address",
+    "user_agent",
+    "event_type",
+    "model_name",
+    "object_id",
+    "action",
+    "before_data",
+    "after_data",
+    "metadata",
+    "correlation_id",
+]
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def _next_month(month):
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def month_bounds(month):
+    """Aware [start, end) datetimes for the local month starting on `month`."""
+    return local_day_bounds(month)[0], local_day_bounds(_next_month(month))[0]
+
+
+def archivable_months(retention_days, now=None):
+    """First days of the local months with live events that end before the retention cutoff."""
+    cutoff = (now or timezone.now()) - timedelta(days=retention_days)
+    oldest = AuditEvent.objects.order_by("timestamp").values_list("timestamp", flat=True).first()
+    if oldest is None:
+        return []
+    months = []
+    month = timezone.localtime(oldest).date().replace(day=1)
+    while month_bounds(month)[1] <= cutoff:
+        months.append(month)
+        month = _next_month(month)
+    return months
+
+
+def _write_file(path, events, chunk_size):
+    """Write `events` to `path` as gzipped NDJSON; returns (count, first, last, sha256)."""
+    digest = hashlib.sha256()
+    count = 0
+    first = last = None
+
+    def rows():
+        nonlocal count, first, last
+        for row in events.values_list(*ARCHIVE_COLUMNS).iterator(chunk_size=chunk_size):
+            count += 1
+            first = first or row[1]
+            last = row[1]
+            yield row
+
+    partial = f"{path}.partial"
+    with open(partial, "wb") as out:
+        for block in to_blocks(encode_rows(ARCHIVE_COLUMNS, rows(), "ndjson"), compress=True):
+            digest.update(block)
+            out.write(block)
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(partial, path)
+    return count, first, last, digest.hexdigest()
+
+
+def archive_month(month, chunk_size=5000):
+    """
+    Move the live events of local `month` into a new archive part. Returns
+    the AuditArchive row, or None when the month had no events.
+    """
+    start, end = month_bounds(month)
+    events = AuditEvent.objects.filter(timestamp__gte=start, timestamp__lt=end).order_by("timestamp", "id")
+    if not events.exists():
+        return None
+
+    directory = settings.GDC_AUDIT_ARCHIVE_DIR
+    os.makedirs(directory, exist_ok=True)
+    part = (AuditArchive.objects.filter(month=month).aggregate(last=Max("part"))["last"] or 0) + 1
+    name = f"audit-{month:%Y-%m}-{part}.ndjson.gz"
+    path = os.path.join(directory, name)
+
+    count, first, last, sha256 = _write_file(path, events, chunk_size)
+    try:
+        with transaction.atomic():
+            # A queryset delete does not go through AuditEvent.delete(); this
+            # is the one place rows leave the table, and only once they are
+            # safely on disk.
+            deleted, _ = AuditEvent.objects.filter(timestamp__gte=start, timestamp__lt=end).delete()
+            if deleted != count:
+                raise ArchiveError(f"{month:%Y-%m}: wrote {count} events but {deleted} matched; nothing deleted")
+            return AuditArchive.objects.create(
+                month=month,
+                part=part,
+                path=name,
+                event_count=count,
+                first_timestamp=first,
+                last_timestamp=last,
+                sha256=sha256,
+            )
+    except BaseException:
+        os.remove(path)
+        raise
+
+
+def _event_from_json(data):
+    for name in ("id", "timestamp", "correlation_id"):
+        data[name] = AuditEvent._meta.get_field(name).to_python(data[name])
+    event = AuditEvent(**data)
+    # Archived events are read-only copies; saving one must not re-insert it.
+    event._state.adding = False
+    return event
+
+
+def archived_events(since=None, until=None, event_types=(), model_names=(), object_id=None):
+    """
+    Yield archived AuditEvents (unsaved, oldest first) matching the filters.
+
+    Only the files whose time range overlaps [since, until) are opened; each
+    is read line by line, so memory does not grow with the archive size.
+    """
+    archives = AuditArchive.objects.all()
+    if since is not None:
+        archives = archives.filter(last_timestamp__gte=since)
+    if until is not None:
+        archives = archives.filter(first_timestamp__lt=until)
+
+    for archive in archives.order_by("month", "part"):
+        path = os.path.join(settings.GDC_AUDIT_ARCHIVE_DIR, archive.path)
+        with gzip.open(path, "rt", encoding="utf-8") as lines:
+            for line in lines:
+                data = json.loads(line)
+                if event_types and data["event_type"] not in event_types:
+                    continue
+                if model_names and data["model_name"] not in model_names:
+                    continue
+                if object_id is not None and data["object_id"] != str(object_id):
+                    continue
+                event = _event_from_json(data)
+                if since is not None and event.timestamp < since:
+                    continue
+                if until is not None and event.timestamp >= until:
+                    continue
+                yield event
+
+
+def verify_archive(archive):
+    """True when the archive file is present and matches its manifest checksum."""
+    path = os.path.join(settings.GDC_AUDIT_ARCHIVE_DIR, archive.path)
+    if not os.path.exists(path):
+        return False
+    digest = hashlib.sha256()
+    with open(path, "rb") as fileobj:
+        for block in iter(lambda: fileobj.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest() == archive.sha256
@@ -0,0 +1,85 @@
+"""Buffered AuditEvent writes: collect events in a scope, insert them in one statement."""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import transaction
+
+from .signals import events_logged
+
+_current_buffer = ContextVar("gdc_audit_buffer", default=None)
+
+
+class AuditBuffer:
+    """Pending AuditEvents for one buffered scope."""
+
+    def __init__(self, max_size=None):
+        self.max_size = max_size or settings.GDC_AUDIT_BUFFER_MAX_SIZE
+        self.events = []
+        # The transaction level the scope was opened at; its flush runs there.
+        self.depth = len(transaction.get_connection().atomic_blocks)
+
+    def add(self, event):
+        if len(transaction.get_connection().atomic_blocks) > self.depth:
+            # Logged inside an atomic block opened within the scope: the flush
+            # would run after that block has committed or rolled back, so the
+            # event is written now, inside it, and shares its fate.
+            event.save(force_insert=True)
+            events_logged.send(sender=type(event), events=[event])
+            return event
+        self.events.append(event)
+        if len(self.events) >= self.max_size:
+            self.flush()
+        return event
+
+    def flush(self):
+        if not self.events:
+            return 0
+        events, self.events = self.events, []
+        model = type(events[0])
+        model.objects.bulk_create(events)
+        events_logged.send(sender=model, events=events)
+        return len(events)
+
+    def discard(self):
+        self.events = []
+
+
+def current_buffer():
+    return _current_buffer.get()
+
+
+@contextmanager
+def buffered_audit(max_size=None):
+    """
+    Collect every AuditEvent.log() call in this scope and insert them with a
+    single bulk_create when the scope exits (or whenever `max_size` events are
+    pending).
+
+    Opened inside a transaction, the flush happens before the commit, so the
+    events are committed or rolled back with the changes they describe. If the
+    scope exits with an exception inside a transaction the pending events are
+    dropped, since the surrounding rollback would discard them anyway; outside
+    a transaction they are still written, because the work they describe was.
+    Events logged inside an atomic block opened within the scope (e.g. by a
+    view under AuditBufferMiddleware) are not buffered but written at once,
+    so they are committed or rolled back with that block.
+
+    Events only get their `timestamp` (auto_now_add) when they are flushed.
+    Nested scopes keep their own buffers and flush on their own exit.
+    """
+    buffer = AuditBuffer(max_size=max_size)
+    token = _current_buffer.set(buffer)
+    try:
+        yield buffer
+    except BaseException:
+        _current_buffer.reset(token)
+        if transaction.get_connection().in_atomic_block:
+            buffer.discard()
+        else:
+            buffer.flush()
+        raise
+    _current_buffer.reset(token)
+    buffer.flush()
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.audit.archive import archivable_months, archive_month, verify_archive
+from apps.audit.models import AuditArchive
+
+
+class Command(BaseCommand):
+    """
+    WHAT: Moves whole months of AuditEvents older than the retention window into gzipped archive files
+    WHY: The audit table grows with every write; keeping it bounded keeps metrics and admin fast
+    USAGE: python manage.py archive_audit_events --retention-days 365
+    """
+
+    help = "Archive AuditEvents older than the retention window into monthly NDJSON.gz files"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=None,
+            help="Keep at least this many days live (default: GDC_AUDIT_RETENTION_DAYS)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Events read per round trip")
+        parser.add_argument("--dry-run", action="store_true", help="List the months that would be archived")
+        parser.add_argument("--verify", action="store_true", help="Check every archive file against its checksum")
+
+    def handle(self, *args, **options):
+        if options["verify"]:
+            bad = [archive for archive in AuditArchive.objects.all() if not verify_archive(archive)]
+            for archive in bad:
+                self.stderr.write(f"Missing or corrupt: {archive.path}")
+            if bad:
+                raise CommandError(f"{len(bad)} archive files failed verification.")
+            self.stdout.write(self.style.SUCCESS("All archive files match the manifest."))
+            return
+
+        retention_days = options["retention_days"]
+        if retention_days is None:
+            retention_days = settings.GDC_AUDIT_RETENTION_DAYS
+        if retention_days < 1:
+            raise CommandError("--retention-days must be at least 1.")
+
+        months = archivable_months(retention_days)
+        if options["dry_run"]:
+            for month in months:
+                self.stdout.write(f"Would archive {month:%Y-%m}")
+            return
+
+        archived = files = 0
+        for month in months:
+            archive = archive_month(month, chunk_size=max(1, options["chunk_size"]))
+            if archive is None:
+                continue
+            archived += archive.event_count
+            files += 1
+            self.stdout.write(f"{month:%Y-%m}: {archive.event_count} events -> {archive.path}")
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} events from {files} months."))
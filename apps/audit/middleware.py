@@ -0,0 +1,16 @@
+from .buffer import buffered_audit
+
+
+class AuditBufferMiddleware:
+    """
+    Buffer the request's AuditEvents and write them in one INSERT at the end.
+    Events logged inside the view's own atomic blocks are written with them
+    (see buffered_audit()).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with buffered_audit():
+            return self.get_response(request)
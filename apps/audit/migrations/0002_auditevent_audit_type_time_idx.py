@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="auditevent",
+            index=models.Index(
+                fields=["event_type", "timestamp"], name="audit_type_time_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0003_auditevent_audit_time_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditArchive",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "month",
+                    models.DateField(
+                        help_text="First day of the (local) month the events fall in"
+                    ),
+                ),
+                ("part", models.PositiveIntegerField(default=1)),
+                (
+                    "path",
+                    models.CharField(
+                        help_text="File name under GDC_AUDIT_ARCHIVE_DIR",
+                        max_length=255,
+                    ),
+                ),
+                ("event_count", models.PositiveIntegerField()),
+                ("first_timestamp", models.DateTimeField()),
+                ("last_timestamp", models.DateTimeField()),
+                ("sha256", models.CharField(max_length=64)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["month", "part"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("month", "part"), name="audit_archive_month_part_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -6,6 +6,9 @@ import uuid
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from .buffer import current_buffer
+from .signals import events_logged
+
 User = get_user_model()
 
 
@@ -36,6 +39,9 @@ class AuditEvent(models.Model):
         indexes = [
             models.Index(fields=["-timestamp", "event_type"]),
             models.Index(fields=["model_name", "object_id"]),
+            models.Index(fields=["event_type", "timestamp"], name="audit_type_time_idx"),
+            # Change feed order.
+            models.Index(fields=["timestamp", "id"], name="audit_time_id_idx"),
         ]
 
     def __str__(self) -> str:
@@ -50,7 +56,22 @@ class AuditEvent(models.Model):
         raise ValueError("AuditEvent records are append-only.")
 
     @classmethod
-    def log(
+    def log(cls, *args, **kwargs):
+        """
+        Record an event. Inside a `buffered_audit()` scope the event is queued
+        and inserted in bulk when the scope exits; otherwise it is written
+        immediately.
+        """
+        event = cls.build(*args, **kwargs)
+        buffer = current_buffer()
+        if buffer is not None:
+            return buffer.add(event)
+        event.save(force_insert=True)
+        events_logged.send(sender=cls, events=[event])
+        return event
+
+    @classmethod
+    def build(
         cls,
         event_type: str,
         model_name: str,
@@ -62,6 +83,7 @@ class AuditEvent(models.Model):
         metadata=None,
         request=None,
     ):
+        """Unsaved event with the same fields as log(), for bulk_create callers."""
         ip = None
         user_agent = ""
         if request:
@@ -72,7 +94,7 @@ class AuditEvent(models.Model):
                 ip = request.META.get("REMOTE_ADDR")
             user_agent = request.META.get("HTTP_USER_AGENT", "")[:500]
 
-        return cls.objects.create(
+        return cls(
             user=user,
             user_email=getattr(user, "email", "") or "system",
             ip_address=ip,
@@ -85,3 +107,29 @@ class AuditEvent(models.Model):
             after_data=after,
             metadata=metadata or {},
         )
+
+
+class AuditArchive(models.Model):
+    """
+    Manifest entry for one archive file of AuditEvents moved out of the live
+    table (see apps.audit.archive). A month can have several parts if late
+    events were archived after it.
+    """
+
+    month = models.DateField(help_text="First day of the (local) month the events fall in")
+    part = models.PositiveIntegerField(default=1)
+    path = models.CharField(max_length=255, help_text="File name under GDC_AUDIT_ARCHIVE_DIR")
+    event_count = models.PositiveIntegerField()
+    first_timestamp = models.DateTimeField()
+    last_timestamp = models.DateTimeField()
+    sha256 = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["month", "part"]
+        constraints = [
+            models.UniqueConstraint(fields=["month", "part"], name="audit_archive_month_part_uniq"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.month:%Y-%m} part {self.part} ({self.event_count} events)"
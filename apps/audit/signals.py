@@ -0,0 +1,7 @@
+"""Signals sent when AuditEvents are written, including in bulk."""
+from django.dispatch import Signal
+
+# Sent after AuditEvents are inserted, whether one at a time by
+# AuditEvent.log() or in bulk by a buffered_audit() flush, with `events`
+# (a list of saved AuditEvent instances).
+events_logged = Signal()
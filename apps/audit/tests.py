@@ -0,0 +1,231 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.audit.archive import archived_events
+from apps.audit.buffer import buffered_audit, current_buffer
+from apps.audit.feed import feed_events, stream_changes
+from apps.audit.middleware import AuditBufferMiddleware
+from apps.audit.models import AuditArchive, AuditEvent
+from apps.core.utils import encode_cursor
+from apps.crm.models import Lead, PipelineStage
+
+
+def _log(object_id="1"):
+    return AuditEvent.log(event_type="test.event", model_name="Test", object_id=object_id, action="create")
+
+
+class AuditBufferTests(TestCase):
+    def test_log_outside_a_scope_writes_immediately(self):
+        with self.assertNumQueries(2):
+            _log("1")
+            _log("2")
+
+        self.assertEqual(AuditEvent.objects.count(), 2)
+
+    def test_scope_writes_all_events_in_one_insert(self):
+        with self.assertNumQueries(1):
+            with buffered_audit():
+                for i in range(20):
+                    _log(str(i))
+                self.assertEqual(len(current_buffer().events), 20)
+
+        self.assertIsNone(current_buffer())
+        self.assertEqual(AuditEvent.objects.count(), 20)
+
+    def test_buffer_flushes_early_at_max_size(self):
+        with buffered_audit(max_size=3) as buffer:
+            for i in range(7):
+                _log(str(i))
+            self.assertEqual(AuditEvent.objects.count(), 6)
+            self.assertEqual(len(buffer.events), 1)
+
+        self.assertEqual(AuditEvent.objects.count(), 7)
+
+    def test_error_inside_a_transaction_discards_pending_events(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic(), buffered_audit():
+                _log()
+                raise RuntimeError("boom")
+
+        self.assertFalse(AuditEvent.objects.exists())
+
+    def test_nested_scopes_flush_independently(self):
+        with buffered_audit():
+            _log("outer")
+            with buffered_audit():
+                _log("inner")
+            self.assertEqual(list(AuditEvent.objects.values_list("object_id", flat=True)), ["inner"])
+
+        self.assertEqual(AuditEvent.objects.count(), 2)
+
+    def test_inner_atomic_blocks_keep_their_events(self):
+        with buffered_audit():
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                _log("rolled-back")
+                raise RuntimeError("boom")
+            with transaction.atomic():
+                _log("committed")
+            # Written with its block rather than at scope exit.
+            self.assertEqual(list(AuditEvent.objects.values_list("object_id", flat=True)), ["committed"])
+            _log("buffered")
+
+        self.assertEqual(set(AuditEvent.objects.values_list("object_id", flat=True)), {"committed", "buffered"})
+
+    def test_middleware_drops_events_of_a_rolled_back_block(self):
+        stage = PipelineStage.objects.create(name="Cold", order=0)
+
+        def view(request):
+            try:
+                with transaction.atomic():
+                    Lead.objects.create(
+                        business_name="Acme", contact_person="J", phone="07", pain_point="P", stage=stage
+                    )
+                    raise RuntimeError("boom")
+            except RuntimeError:
+                pass
+            return HttpResponse("ok")
+
+        AuditBufferMiddleware(view)(RequestFactory().get("/"))
+
+        self.assertFalse(Lead.all_objects.exists())
+        self.assertFalse(AuditEvent.objects.filter(event_type="lead.created").exists())
+
+    def test_middleware_buffers_the_request(self):
+        def view(request):
+            for i in range(5):
+                _log(str(i))
+            self.assertFalse(AuditEvent.objects.exists())
+            return HttpResponse("ok")
+
+        middleware = AuditBufferMiddleware(view)
+        response = middleware(RequestFactory().get("/"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(AuditEvent.objects.count(), 5)
+
+
+@override_settings(GDC_CHANGE_FEED_LAG_SECONDS=0)
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        start = timezone.now() - timedelta(hours=1)
+        for i in range(7):
+            event = AuditEvent.log(
+                event_type="lead.created" if i % 2 == 0 else "lead.stage_changed",
+                model_name="Lead",
+                object_id=str(i),
+                action="create",
+            )
+            # Two events share each timestamp, so the id has to break ties.
+            AuditEvent.objects.filter(pk=event.pk).update(timestamp=start + timedelta(minutes=i // 2))
+
+    def _poll(self, **kwargs):
+        stream = stream_changes(feed_events(**kwargs), limit=3, cursor=kwargs.get("cursor"))
+        lines = [json.loads(line) for line in stream]
+        return lines[:-1], lines[-1]
+
+    def test_cursor_resumes_without_gaps_or_repeats(self):
+        seen, cursor = [], None
+        while True:
+            events, trailer = self._poll(cursor=cursor)
+            seen.extend(event["object_id"] for event in events)
+            cursor = trailer["next_cursor"]
+            if not trailer["has_more"]:
+                break
+
+        self.assertEqual(sorted(seen), [str(i) for i in range(7)])
+        self.assertEqual(len(seen), 7)
+        # Caught up: the cursor is handed back and nothing new is sent.
+        self.assertEqual(self._poll(cursor=cursor), ([], {"next_cursor": cursor, "has_more": False}))
+
+    def test_each_poll_is_one_query(self):
+        with self.assertNumQueries(1):
+            events, _ = self._poll(event_types=["lead.stage_changed"])
+        self.assertEqual([event["object_id"] for event in events], ["1", "3", "5"])
+
+    @override_settings(GDC_CHANGE_FEED_LAG_SECONDS=5)
+    def test_unsettled_events_are_held_back(self):
+        _log("fresh")
+        events, _ = self._poll(model_names=["Test", "Lead"])
+        self.assertNotIn("fresh", [event["object_id"] for event in events])
+
+    def test_endpoint_streams_ndjson_for_owners_only(self):
+        user = get_user_model().objects.create_superuser("owner", "owner@example.com", "pw")
+        self.client.force_login(user)
+        response = self.client.get(reverse("audit-changes"), {"event_type": "lead.created", "limit": 10})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(len(lines), 5)
+        self.assertFalse(lines[-1]["has_more"])
+
+        for cursor in ("garbage", encode_cursor([[1], "x"]), encode_cursor(["not-a-date", "zzz"])):
+            self.assertEqual(self.client.get(reverse("audit-changes"), {"cursor": cursor}).status_code, 400)
+        self.client.force_login(get_user_model().objects.create_user("sales", "sales@example.com", "pw"))
+        self.assertEqual(self.client.get(reverse("audit-changes")).status_code, 403)
+
+
+class AuditArchiveTests(TestCase):
+    def setUp(self):
+        self.archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.archive_dir)
+        override = override_settings(GDC_AUDIT_ARCHIVE_DIR=self.archive_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.now = timezone.now()
+        old = timezone.localtime(self.now - timedelta(days=500)).replace(day=10, hour=12)
+        for i in range(4):
+            event = _log(f"old-{i}")
+            # Two events in one old month, one in the next, one in the month after.
+            AuditEvent.objects.filter(pk=event.pk).update(timestamp=old + timedelta(days=31 * max(0, i - 1)))
+        _log("recent")
+
+    def test_old_months_move_to_files_and_read_back(self):
+        out = StringIO()
+        call_command("archive_audit_events", retention_days=365, stdout=out)
+
+        self.assertIn("Archived 4 events from 3 months", out.getvalue())
+        self.assertEqual(list(AuditEvent.objects.values_list("object_id", flat=True)), ["recent"])
+        self.assertEqual(AuditArchive.objects.count(), 3)
+        paths = AuditArchive.objects.values_list("path", flat=True)
+        self.assertEqual(sorted(os.listdir(self.archive_dir)), sorted(paths))
+
+        events = list(archived_events())
+        self.assertEqual(sorted(event.object_id for event in events), [f"old-{i}" for i in range(4)])
+        self.assertEqual([event.timestamp for event in events], sorted(event.timestamp for event in events))
+        self.assertEqual(list(archived_events(object_id="old-3"))[0].event_type, "test.event")
+
+        call_command("archive_audit_events", verify=True, stdout=StringIO())
+
+    def test_reader_only_opens_overlapping_files(self):
+        call_command("archive_audit_events", retention_days=365, stdout=StringIO())
+        latest = AuditArchive.objects.order_by("-month").first()
+
+        events = list(archived_events(since=latest.first_timestamp))
+        self.assertEqual([event.object_id for event in events], ["old-3"])
+
+    def test_months_inside_the_window_are_kept(self):
+        call_command("archive_audit_events", retention_days=600, stdout=StringIO())
+
+        self.assertEqual(AuditEvent.objects.count(), 5)
+        self.assertFalse(AuditArchive.objects.exists())
+
+    def test_corrupt_file_fails_verification(self):
+        call_command("archive_audit_events", retention_days=365, stdout=StringIO())
+        with open(os.path.join(self.archive_dir, AuditArchive.objects.first().path), "ab") as fileobj:
+            fileobj.write(b"tampered")
+
+        with self.assertRaises(CommandError):
+            call_command("archive_audit_events", verify=True, stdout=StringIO(), stderr=StringIO())
@@ -0,0 +1,48 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+from rest_framework.views import APIView
+
+from apps.core.api import CanExportData
+from .feed import feed_events, stream_changes
+
+FEED_PAGE_SIZE = 1000
+FEED_MAX_PAGE_SIZE = 10000
+
+
+def _list_param(request, name):
+    values = []
+    for value in request.query_params.getlist(name):
+        values.extend(part.strip() for part in value.split(",") if part.strip())
+    return values
+
+
+class ChangeFeedView(APIView):
+    """
+    GET /audit/changes/?cursor=...&event_type=lead.created,lead.stage_changed&model_name=Lead
+
+    Streams AuditEvents as NDJSON, oldest first, ending with a
+    {"next_cursor", "has_more"} line. Pass next_cursor back to resume.
+    """
+
+    permission_classes = [CanExportData]
+
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get("limit", FEED_PAGE_SIZE)), 1), FEED_MAX_PAGE_SIZE)
+        except ValueError:
+            raise ValidationError({"limit": "Invalid limit."})
+        cursor = request.query_params.get("cursor") or None
+        try:
+            events = feed_events(
+                cursor=cursor,
+                event_types=_list_param(request, "event_type"),
+                model_names=_list_param(request, "model_name"),
+            )
+        except (ValueError, DjangoValidationError):
+            raise ValidationError({"cursor": "Invalid cursor."})
+        response = StreamingHttpResponse(
+            stream_changes(events, limit, cursor=cursor), content_type="application/x-ndjson"
+        )
+        response["Cache-Control"] = "no-store"
+        return response
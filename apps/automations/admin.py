@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import AutomationRun
+from .models import AutomationRun, WebhookCircuit, WebhookOutbox
 
 
 @admin.register(AutomationRun)
@@ -9,9 +9,11 @@ class AutomationRunAdmin(admin.ModelAdmin):
                     "event_type",
                     "lead_id",
                     "success",
+                    "status",
                     "status_code",
-                    "attempts")
-    list_filter = ("event_type", "success")
+                    "attempts",
+                    "next_retry_at")
+    list_filter = ("event_type", "success", "status")
     search_fields = ("lead_id", "correlation_id", "webhook_url")
     readonly_fields = (
         "created_at",
@@ -30,4 +32,32 @@ class AutomationRunAdmin(admin.ModelAdmin):
         "duration_ms",
         "last_attempt_at",
         "payload_preview",
+        "status",
+        "next_retry_at",
+        "claim_token",
     )
+
+
+@admin.register(WebhookOutbox)
+class WebhookOutboxAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "event_type", "lead_id", "status", "available_at", "dispatched_at")
+    list_filter = ("event_type", "status")
+    search_fields = ("lead_id", "automation_run_id")
+    readonly_fields = (
+        "created_at",
+        "updated_at",
+        "event_type",
+        "lead_id",
+        "payload",
+        "claim_token",
+        "locked_at",
+        "automation_run_id",
+        "dispatched_at",
+    )
+
+
+@admin.register(WebhookCircuit)
+class WebhookCircuitAdmin(admin.ModelAdmin):
+    list_display = ("host", "state", "consecutive_failures", "opened_at", "retry_at", "updated_at")
+    list_filter = ("state",)
+    readonly_fields = ("updated_at",)
@@ -0,0 +1,104 @@
+"""Per-host circuit breaker for webhook delivery, shared through the database."""
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import WebhookCircuit
+
+
+def webhook_host(url):
+    parts = urlsplit(url)
+    return parts.netloc or url
+
+
+class CircuitBreaker:
+    """
+    Circuit state for one webhook host for the duration of a delivery batch.
+
+    The persisted WebhookCircuit row is read once when the breaker is loaded
+    and written once by `save()`, so every worker process sees the same
+    state. In between, `allow()` and `record()` work in memory and are
+    thread-safe, so a batch delivered over a thread pool stops sending as soon
+    as the failure threshold is crossed.
+
+    - closed: sends go through; GDC_WEBHOOK_CIRCUIT_THRESHOLD consecutive
+      failures open the circuit.
+    - open: sends are deferred until `retry_at` (the cool-down).
+    - half-open: once the cool-down has passed, exactly one process claims
+      the right to send a single probe; success closes the circuit, failure
+      re-opens it for another cool-down.
+    """
+
+    def __init__(self, circuit, now=None):
+        self.circuit = circuit
+        self.now = now or timezone.now()
+        self.threshold = settings.GDC_WEBHOOK_CIRCUIT_THRESHOLD
+        self.cooldown = timedelta(seconds=settings.GDC_WEBHOOK_CIRCUIT_COOLDOWN)
+        self._lock = threading.Lock()
+        self._initial = (circuit.state, circuit.consecutive_failures)
+        self._probe_pending = False
+
+    @classmethod
+    def load(cls, url, now=None):
+        now = now or timezone.now()
+        circuit, _ = WebhookCircuit.objects.get_or_create(host=webhook_host(url))
+        breaker = cls(circuit, now=now)
+        if circuit.state != WebhookCircuit.STATE_CLOSED:
+            breaker._claim_probe()
+        return breaker
+
+    def _claim_probe(self):
+        # Only one process wins the conditional UPDATE and gets to probe.
+        claimed = WebhookCircuit.objects.filter(
+            Q(state=WebhookCircuit.STATE_OPEN) | Q(state=WebhookCircuit.STATE_HALF_OPEN),
+            pk=self.circuit.pk,
+            retry_at__lte=self.now,
+        ).update(state=WebhookCircuit.STATE_HALF_OPEN, retry_at=self.now + self.cooldown)
+        self.circuit.refresh_from_db()
+        self._initial = (self.circuit.state, self.circuit.consecutive_failures)
+        self._probe_pending = bool(claimed)
+
+    @property
+    def retry_at(self):
+        return self.circuit.retry_at
+
+    def allow(self):
+        with self._lock:
+            if self.circuit.state == WebhookCircuit.STATE_CLOSED:
+                return True
+            if self._probe_pending:
+                self._probe_pending = False
+                return True
+            return False
+
+    def record(self, healthy):
+        with self._lock:
+            circuit = self.circuit
+            if healthy:
+                circuit.state = WebhookCircuit.STATE_CLOSED
+                circuit.consecutive_failures = 0
+                circuit.opened_at = None
+                circuit.retry_at = None
+                return
+            circuit.consecutive_failures += 1
+            if (
+                circuit.state == WebhookCircuit.STATE_HALF_OPEN
+                or circuit.consecutive_failures >= self.threshold
+            ):
+                now = timezone.now()
+                circuit.state = WebhookCircuit.STATE_OPEN
+                circuit.opened_at = now
+                circuit.retry_at = now + self.cooldown
+
+    def save(self):
+        circuit = self.circuit
+        if (circuit.state, circuit.consecutive_failures) == self._initial:
+            return
+        circuit.save(update_fields=["state", "consecutive_failures", "opened_at", "retry_at", "updated_at"])
+        self._initial = (circuit.state, circuit.consecutive_failures)
@@ -0,0 +1,150 @@
+"""Keep-alive HTTP connection pool shared by every webhook send."""
+from __future__ import annotations
+
+import http.client
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+# Errors that mean a pooled keep-alive socket was closed by the server while
+# it sat idle; the request is retried once on a fresh connection.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+@dataclass
+class PooledResponse:
+    status: int
+    reason: str
+    body: bytes
+
+
+class HTTPConnectionPool:
+    """
+    Thread-safe pool of idle HTTP(S) connections, keyed by (scheme, host, port).
+
+    At most `max_size` idle connections are kept per host; connections idle
+    for longer than `idle_timeout` seconds are closed instead of reused.
+    Concurrency is not capped here: when no idle connection is available a
+    new one is opened, and surplus connections are closed on release.
+    """
+
+    def __init__(self, max_size=10, idle_timeout=30.0):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(parts):
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        return scheme, parts.hostname, port
+
+    def _new_connection(self, key, timeout):
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _acquire(self, key, timeout):
+        now = time.monotonic()
+        stale = []
+        conn = None
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                candidate, last_used = idle.pop()
+                if now - last_used > self.idle_timeout:
+                    stale.append(candidate)
+                    continue
+                conn = candidate
+                break
+        for candidate in stale:
+            candidate.close()
+        if conn is None:
+            return self._new_connection(key, timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            if len(idle) < self.max_size:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def request(self, method, url, body=None, headers=None, timeout=None):
+        parts = urlsplit(url)
+        key = self._key(parts)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        conn, reused = self._acquire(key, timeout)
+        try:
+            try:
+                response, data = self._send(conn, method, path, body, headers)
+            except STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                conn.close()
+                conn = self._new_connection(key, timeout)
+                response, data = self._send(conn, method, path, body, headers)
+        except BaseException:
+            conn.close()
+            raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+        return PooledResponse(status=response.status, reason=response.reason, body=data)
+
+    @staticmethod
+    def _send(conn, method, path, body, headers):
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        # Drain the body so the connection can carry the next request.
+        return response, response.read()
+
+    def idle_count(self, url=None):
+        with self._lock:
+            if url is None:
+                return sum(len(idle) for idle in self._idle.values())
+            return len(self._idle.get(self._key(urlsplit(url)), ()))
+
+    def clear(self):
+        with self._lock:
+            pools, self._idle = self._idle, {}
+        for idle in pools.values():
+            for conn, _ in idle:
+                conn.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_webhook_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HTTPConnectionPool(
+                    max_size=settings.GDC_WEBHOOK_POOL_SIZE,
+                    idle_timeout=settings.GDC_WEBHOOK_POOL_IDLE_TIMEOUT,
+                )
+    return _pool
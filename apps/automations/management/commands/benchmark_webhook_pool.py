@@ -0,0 +1,72 @@
+import json
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from apps.automations.http_pool import HTTPConnectionPool
+from apps.automations.testing import StubWebhookServer
+
+
+def _unpooled_post(url, body, headers, timeout):
+    req = urllib.request.Request(url, data=body, method="POST")
+    for key, value in headers.items():
+        req.add_header(key, value)
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        resp.read()
+        return resp.getcode()
+
+
+class Command(BaseCommand):
+    help = "Compares pooled vs. unpooled webhook throughput against a local HTTP stub."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000, help="Requests per mode")
+        parser.add_argument("--concurrency", type=int, default=8, help="Parallel senders")
+        parser.add_argument("--delay", type=float, default=0.0, help="Stub response delay in seconds")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    def handle(self, *args, **options):
+        total = options["requests"]
+        concurrency = max(1, options["concurrency"])
+        body = json.dumps({"event_type": "benchmark", "padding": "x" * 512}).encode("utf-8")
+        headers = {"Content-Type": "application/json", "X-GDC-Event": "benchmark"}
+
+        results = {}
+        with StubWebhookServer(delay=options["delay"]) as stub:
+            url = stub.base_url + "gdc-benchmark"
+            pool = HTTPConnectionPool(max_size=concurrency)
+            modes = {
+                "unpooled": lambda _: _unpooled_post(url, body, headers, 10),
+                "pooled": lambda _: pool.request("POST", url, body=body, headers=headers, timeout=10).status,
+            }
+            for name, send in modes.items():
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    statuses = list(executor.map(send, range(total)))
+                elapsed = time.perf_counter() - started
+                results[name] = {
+                    "requests": total,
+                    "errors": sum(1 for status in statuses if not 200 <= status < 300),
+                    "seconds": round(elapsed, 3),
+                    "requests_per_second": round(total / elapsed, 1) if elapsed else None,
+                    "mean_latency_ms": round(elapsed * 1000 * concurrency / total, 3) if total else None,
+                }
+            pool.clear()
+
+        unpooled = results["unpooled"]["requests_per_second"]
+        pooled = results["pooled"]["requests_per_second"]
+        results["speedup"] = round(pooled / unpooled, 2) if unpooled and pooled else None
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name in modes:
+            row = results[name]
+            self.stdout.write(
+                f"{name:>9}: {row['requests']} requests in {row['seconds']}s "
+                f"({row['requests_per_second']} req/s, ~{row['mean_latency_ms']} ms/request, "
+                f"{row['errors']} errors)"
+            )
+        self.stdout.write(f"  speedup: {results['speedup']}x")
@@ -0,0 +1,44 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.automations.services import drain_outbox
+
+
+class Command(BaseCommand):
+    help = "Delivers queued webhooks from the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Entries claimed per batch")
+        parser.add_argument("--loop", action="store_true", help="Keep polling the outbox until interrupted")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="Seconds to sleep between polls when the outbox is empty (with --loop)",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.GDC_AUTOMATIONS_ENABLED:
+            self.stdout.write("Automations disabled.")
+            return
+
+        batch_size = options["batch_size"] or settings.GDC_OUTBOX_BATCH_SIZE
+        interval = options["interval"] if options["interval"] is not None else settings.GDC_OUTBOX_POLL_INTERVAL
+
+        total = 0
+        try:
+            while True:
+                runs = drain_outbox(batch_size=batch_size)
+                total += len(runs)
+                if runs:
+                    failed = sum(1 for run in runs if not run.success)
+                    self.stdout.write(f"Dispatched {len(runs)} webhooks ({failed} failed).")
+                    continue
+                if not options["loop"]:
+                    break
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f"Outbox entries dispatched: {total}")
@@ -1,57 +1,84 @@
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db.models import Q
 from django.utils import timezone
 
+from apps.audit.buffer import buffered_audit
 from apps.automations.models import AutomationRun
-from apps.automations.services import send_daily_summary_webhook, send_lead_overdue_webhook
-from apps.crm.models import Lead
+from apps.automations.services import (
+    retry_due_webhooks,
+    send_daily_summary_webhook,
+    send_overdue_webhooks,
+)
 
 
 class Command(BaseCommand):
-    help = "Runs automation hooks (overdue and daily summary)."
+    help = "Runs automation hooks (overdue, daily summary and due retries)."
 
     def add_arguments(self, parser):
         parser.add_argument("--overdue", action="store_true", help="Send overdue lead notifications")
         parser.add_argument("--daily-summary", action="store_true", help="Send daily summary")
+        parser.add_argument("--retry-due", action="store_true", help="Re-attempt failed webhooks whose retry is due")
+        parser.add_argument("--batch-size", type=int, default=None, help="Runs claimed per retry batch")
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Parallel webhook deliveries for the overdue sweep (default: GDC_AUTOMATIONS_CONCURRENCY)",
+        )
 
     def handle(self, *args, **options):
         if not settings.GDC_AUTOMATIONS_ENABLED:
             self.stdout.write("Automations disabled.")
             return
 
+        with buffered_audit():
+            self._run(options)
+
+    def _run(self, options):
         run_overdue = options["overdue"]
         run_daily = options["daily_summary"]
-        if not run_overdue and not run_daily:
+        run_retries = options["retry_due"]
+        if not run_overdue and not run_daily and not run_retries:
             run_overdue = True
             run_daily = True
+            run_retries = True
 
         now = timezone.now()
         today = timezone.localdate(now)
 
         if run_overdue:
-            overdue_qs = Lead.objects.filter(next_action_due__lt=now, next_action_due__isnull=False)
-            sent = 0
-            for lead in overdue_qs:
-                already_sent = AutomationRun.objects.filter(
-                    event_type="lead.overdue",
-                    lead_id=lead.id,
-                    created_at__date=today,
-                    success=True,
-                ).exists()
-                if already_sent:
-                    continue
-                send_lead_overdue_webhook(lead)
-                sent += 1
-            self.stdout.write(f"Overdue notifications sent: {sent}")
+            summary = send_overdue_webhooks(now=now, concurrency=options["concurrency"])
+            dispatched = summary["sent"] + summary["retrying"] + summary["deferred"] + summary["failed"]
+            elapsed = summary["elapsed_seconds"]
+            rate = dispatched / elapsed if elapsed else 0.0
+            self.stdout.write(f"Overdue notifications sent: {summary['sent']}")
+            self.stdout.write(
+                f"Overdue sweep: {summary['overdue']} overdue, {summary['skipped']} already notified, "
+                f"{summary['retrying']} retrying, {summary['deferred']} deferred (circuit open), "
+                f"{summary['failed']} failed, "
+                f"{elapsed:.2f}s ({rate:.1f} webhooks/s)"
+            )
 
         if run_daily:
             already_sent = AutomationRun.objects.filter(
+                Q(success=True) | Q(status__in=AutomationRun.IN_FLIGHT_STATUSES),
                 event_type="daily.summary",
                 created_at__date=today,
-                success=True,
             ).exists()
             if already_sent:
                 self.stdout.write("Daily summary already sent today.")
             else:
                 send_daily_summary_webhook(now=now)
                 self.stdout.write("Daily summary sent.")
+
+        if run_retries:
+            summary = retry_due_webhooks(
+                now=timezone.now(),
+                batch_size=options["batch_size"],
+                concurrency=options["concurrency"],
+            )
+            self.stdout.write(
+                f"Retries attempted: {summary['retried']} ({summary['sent']} sent, "
+                f"{summary['retrying']} rescheduled, {summary['deferred']} deferred, {summary['failed']} failed)"
+            )
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:18
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("automations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WebhookOutbox",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("is_deleted", models.BooleanField(default=False)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                ("event_type", models.CharField(max_length=100)),
+                ("lead_id", models.UUIDField(blank=True, null=True)),
+                ("payload", models.JSONField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("dispatched", "Dispatched"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "available_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("claim_token", models.UUIDField(blank=True, null=True)),
+                ("locked_at", models.DateTimeField(blank=True, null=True)),
+                ("automation_run_id", models.UUIDField(blank=True, null=True)),
+                ("dispatched_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Webhook Outbox Entry",
+                "verbose_name_plural": "Webhook Outbox",
+                "ordering": ["available_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "available_at"],
+                        name="automations_status_5674de_idx",
+                    ),
+                    models.Index(
+                        fields=["claim_token"], name="automations_claim_t_ae3fc8_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
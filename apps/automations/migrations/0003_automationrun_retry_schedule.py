@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:20
+
+from django.db import migrations, models
+
+
+def backfill_status(apps, schema_editor):
+    AutomationRun = apps.get_model("automations", "AutomationRun")
+    AutomationRun.objects.filter(success=True).update(status="succeeded")
+    AutomationRun.objects.filter(success=False).update(status="failed")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("automations", "0002_webhookoutbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="automationrun",
+            name="claim_token",
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="automationrun",
+            name="next_retry_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="automationrun",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("succeeded", "Succeeded"),
+                    ("retry_scheduled", "Retry scheduled"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="automationrun",
+            index=models.Index(
+                fields=["status", "next_retry_at"], name="automations_status_5e5a20_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="automationrun",
+            index=models.Index(
+                fields=["claim_token"], name="automations_claim_t_55a742_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_status, migrations.RunPython.noop),
+    ]
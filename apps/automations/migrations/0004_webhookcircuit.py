@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("automations", "0003_automationrun_retry_schedule"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WebhookCircuit",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("host", models.CharField(max_length=255, unique=True)),
+                (
+                    "state",
+                    models.CharField(
+                        choices=[
+                            ("closed", "Closed"),
+                            ("open", "Open"),
+                            ("half_open", "Half-open"),
+                        ],
+                        default="closed",
+                        max_length=20,
+                    ),
+                ),
+                ("consecutive_failures", models.IntegerField(default=0)),
+                ("opened_at", models.DateTimeField(blank=True, null=True)),
+                ("retry_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Webhook Circuit",
+                "verbose_name_plural": "Webhook Circuits",
+                "ordering": ["host"],
+            },
+        ),
+        migrations.AlterField(
+            model_name="automationrun",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("succeeded", "Succeeded"),
+                    ("retry_scheduled", "Retry scheduled"),
+                    ("deferred", "Deferred (circuit open)"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+    ]
@@ -3,11 +3,27 @@ from __future__ import annotations
 import uuid
 
 from django.db import models
+from django.utils import timezone
 
 from apps.core.models import BaseModel
 
 
 class AutomationRun(BaseModel):
+    STATUS_PENDING = "pending"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_RETRY_SCHEDULED = "retry_scheduled"
+    STATUS_DEFERRED = "deferred"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_RETRY_SCHEDULED, "Retry scheduled"),
+        (STATUS_DEFERRED, "Deferred (circuit open)"),
+        (STATUS_FAILED, "Failed"),
+    ]
+    # Runs that have not succeeded yet but will be attempted again.
+    IN_FLIGHT_STATUSES = (STATUS_RETRY_SCHEDULED, STATUS_DEFERRED)
+
     correlation_id = models.UUIDField(default=uuid.uuid4, db_index=True)
     event_type = models.CharField(max_length=100, db_index=True)
     lead_id = models.UUIDField(null=True, blank=True, db_index=True)
@@ -22,13 +38,77 @@ class AutomationRun(BaseModel):
     duration_ms = models.IntegerField(null=True, blank=True)
     last_attempt_at = models.DateTimeField(null=True, blank=True)
     payload_preview = models.JSONField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    next_retry_at = models.DateTimeField(null=True, blank=True)
+    claim_token = models.UUIDField(null=True, blank=True)
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["event_type", "created_at"]),
             models.Index(fields=["lead_id", "event_type"]),
+            models.Index(fields=["status", "next_retry_at"]),
+            models.Index(fields=["claim_token"]),
         ]
 
     def __str__(self) -> str:
         return f"{self.event_type} {self.created_at:%Y-%m-%d %H:%M:%S}"
+
+
+class WebhookOutbox(BaseModel):
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_DISPATCHED = "dispatched"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_PROCESSING, "Processing"),
+        (STATUS_DISPATCHED, "Dispatched"),
+    ]
+
+    event_type = models.CharField(max_length=100)
+    lead_id = models.UUIDField(null=True, blank=True)
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    available_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.UUIDField(null=True, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    automation_run_id = models.UUIDField(null=True, blank=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["available_at"]
+        verbose_name = "Webhook Outbox Entry"
+        verbose_name_plural = "Webhook Outbox"
+        indexes = [
+            models.Index(fields=["status", "available_at"]),
+            models.Index(fields=["claim_token"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event_type} ({self.status})"
+
+
+class WebhookCircuit(models.Model):
+    STATE_CLOSED = "closed"
+    STATE_OPEN = "open"
+    STATE_HALF_OPEN = "half_open"
+    STATE_CHOICES = [
+        (STATE_CLOSED, "Closed"),
+        (STATE_OPEN, "Open"),
+        (STATE_HALF_OPEN, "Half-open"),
+    ]
+
+    host = models.CharField(max_length=255, unique=True)
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default=STATE_CLOSED)
+    consecutive_failures = models.IntegerField(default=0)
+    opened_at = models.DateTimeField(null=True, blank=True)
+    retry_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["host"]
+        verbose_name = "Webhook Circuit"
+        verbose_name_plural = "Webhook Circuits"
+
+    def __str__(self) -> str:
+        return f"{self.host} ({self.state})"
@@ -3,19 +3,24 @@ from __future__ import annotations
 import hashlib
 import hmac
 import json
+import random
 import time
-import urllib.error
-import urllib.request
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 
 from django.conf import settings
-from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models import Q
 from django.utils import timezone
 
+from apps.audit.buffer import buffered_audit
 from apps.audit.models import AuditEvent
+from apps.core.models import AppSetting
 from apps.crm.models import Lead
-from .models import AutomationRun
+from apps.dashboard.services import lead_bucket_counts, prioritized_leads
+from .circuit import CircuitBreaker, webhook_host
+from .http_pool import get_webhook_pool
+from .models import AutomationRun, WebhookOutbox
 
 WEBHOOK_PATHS = {
     "lead.created": "gdc-lead-created",
@@ -32,7 +37,7 @@ def _lead_summary(lead):
     return {
         "lead_id": str(lead.id),
         "business_name": lead.business_name,
-        "stage": lead.stage.name,
+        "stage": lead.stage_name,
         "phone": lead.phone,
         "next_action": lead.next_action,
         "next_action_due": _unix_ts(lead.next_action_due) if lead.next_action_due else None,
@@ -58,98 +63,264 @@ def _sign_payload(payload_bytes, secret):
     return f"sha256={signature}"
 
 
-def _send_webhook(event_type, payload, lead_id=None):
+RUN_DELIVERY_FIELDS = [
+    "status",
+    "next_retry_at",
+    "claim_token",
+    "attempts",
+    "last_attempt_at",
+    "status_code",
+    "success",
+    "error_message",
+    "response_body_snippet",
+    "duration_ms",
+    "request_headers",
+    "updated_at",
+]
+
+
+def _serialize_payload(payload):
+    return json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def _new_run(event_type, payload, lead_id=None):
     if event_type not in WEBHOOK_PATHS:
         raise ValueError(f"Unknown event_type: {event_type}")
 
     base_url = settings.GDC_WEBHOOK_BASE_URL.rstrip("/") + "/"
     webhook_url = base_url + WEBHOOK_PATHS[event_type]
-    secret = settings.GDC_WEBHOOK_SECRET
-    payload_bytes = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
-    payload_hash = hashlib.sha256(payload_bytes).hexdigest()
+    payload_bytes = _serialize_payload(payload)
 
-    run = AutomationRun.objects.create(
+    return AutomationRun(
         correlation_id=uuid.UUID(payload["correlation_id"]),
         event_type=event_type,
         lead_id=lead_id,
         webhook_url=webhook_url,
-        payload_hash=payload_hash,
+        payload_hash=hashlib.sha256(payload_bytes).hexdigest(),
         payload_preview=payload,
     )
 
-    max_retries = settings.GDC_AUTOMATIONS_RETRY_MAX
-    for attempt in range(1, max_retries + 1):
-        start = time.monotonic()
-        run.attempts = attempt
-        run.last_attempt_at = timezone.now()
 
-        headers = {
-            "Content-Type": "application/json",
-            "X-GDC-Event": event_type,
-            "X-GDC-Timestamp": str(payload["timestamp"]),
-        }
+def retry_delay_seconds(attempt, rng=random):
+    """
+    Exponential backoff with jitter for the retry after `attempt` failures.
 
-        if not secret:
-            run.success = False
-            run.error_message = "Missing GDC_WEBHOOK_SECRET"
-            run.duration_ms = int((time.monotonic() - start) * 1000)
-            run.request_headers = headers
-            run.save(update_fields=["attempts", "last_attempt_at", "success", "error_message", "duration_ms", "request_headers"])
-            break
-
-        headers["X-GDC-Signature"] = _sign_payload(payload_bytes, secret)
-
-        try:
-            req = urllib.request.Request(webhook_url, data=payload_bytes, method="POST")
-            for key, value in headers.items():
-                req.add_header(key, value)
-            with urllib.request.urlopen(req, timeout=settings.GDC_WEBHOOK_TIMEOUT) as resp:
-                body = resp.read().decode("utf-8", errors="replace")
-                run.status_code = resp.getcode()
-                run.response_body_snippet = body[:1000]
-                run.success = 200 <= resp.getcode() < 300
-        except urllib.error.HTTPError as exc:
-            body = exc.read().decode("utf-8", errors="replace")
-            run.status_code = exc.code
-            run.response_body_snippet = body[:1000]
-            run.error_message = f"HTTPError: {exc}"
-            run.success = False
-        except Exception as exc:  # noqa: BLE001
-            run.error_message = str(exc)
-            run.success = False
-        finally:
-            run.duration_ms = int((time.monotonic() - start) * 1000)
-            run.request_headers = headers
-            run.save(
-                update_fields=[
-                    "attempts",
-                    "last_attempt_at",
-                    "status_code",
-                    "success",
-                    "error_message",
-                    "response_body_snippet",
-                    "duration_ms",
-                    "request_headers",
-                ]
-            )
+    Half of the exponential delay is fixed and half is random, so retries
+    from a burst of failures spread out instead of arriving together.
+    """
+    base = settings.GDC_AUTOMATIONS_RETRY_BASE_SECONDS
+    ceiling = settings.GDC_AUTOMATIONS_RETRY_MAX_DELAY
+    delay = min(ceiling, base * (2 ** max(attempt - 1, 0)))
+    return delay / 2 + rng.uniform(0, delay / 2)
 
-        if run.success:
-            break
 
-    AuditEvent.log(
+def _is_retryable(status_code):
+    if status_code is None:
+        return True
+    return status_code >= 500 or status_code in (408, 429)
+
+
+def _defer(run, breaker):
+    run.success = False
+    run.status = AutomationRun.STATUS_DEFERRED
+    run.next_retry_at = breaker.retry_at or timezone.now()
+    run.claim_token = None
+    run.error_message = f"Circuit open for {breaker.circuit.host}"
+    return run
+
+
+def _deliver(run, breaker=None):
+    """
+    Make one delivery attempt for `run` and schedule the next one on failure.
+
+    Failed attempts are not retried inline: the run is marked
+    retry_scheduled with a backed-off next_retry_at (picked up later by
+    `run_automations --retry-due`) until GDC_AUTOMATIONS_RETRY_MAX attempts
+    have been made. When `breaker` is open the run is deferred until the
+    circuit's cool-down ends without any HTTP call. Only mutates `run` and
+    the in-memory breaker; it never touches the database, so it is safe to
+    call from worker threads and persist the results in bulk.
+    """
+    if breaker is not None and not breaker.allow():
+        return _defer(run, breaker)
+
+    payload = run.payload_preview
+    payload_bytes = _serialize_payload(payload)
+    secret = settings.GDC_WEBHOOK_SECRET
+
+    start = time.monotonic()
+    run.attempts += 1
+    run.last_attempt_at = timezone.now()
+    run.claim_token = None
+    run.status_code = None
+    run.error_message = ""
+
+    headers = {
+        "Content-Type": "application/json",
+        "X-GDC-Event": run.event_type,
+        "X-GDC-Timestamp": str(payload["timestamp"]),
+    }
+
+    if not secret:
+        run.success = False
+        run.error_message = "Missing GDC_WEBHOOK_SECRET"
+        run.status = AutomationRun.STATUS_FAILED
+        run.next_retry_at = None
+        run.duration_ms = int((time.monotonic() - start) * 1000)
+        run.request_headers = headers
+        return run
+
+    headers["X-GDC-Signature"] = _sign_payload(payload_bytes, secret)
+
+    try:
+        resp = get_webhook_pool().request(
+            "POST",
+            run.webhook_url,
+            body=payload_bytes,
+            headers=headers,
+            timeout=settings.GDC_WEBHOOK_TIMEOUT,
+        )
+        run.status_code = resp.status
+        run.response_body_snippet = resp.body.decode("utf-8", errors="replace")[:1000]
+        run.success = 200 <= resp.status < 300
+        if not run.success:
+            run.error_message = f"HTTPError: HTTP Error {resp.status}: {resp.reason}"
+    except Exception as exc:  # noqa: BLE001
+        run.error_message = str(exc)
+        run.success = False
+    finally:
+        run.duration_ms = int((time.monotonic() - start) * 1000)
+        run.request_headers = headers
+
+    if breaker is not None:
+        # A 4xx still proves the endpoint is up; only outages trip the circuit.
+        breaker.record(run.success or not _is_retryable(run.status_code))
+
+    if run.success:
+        run.status = AutomationRun.STATUS_SUCCEEDED
+        run.next_retry_at = None
+    elif run.attempts < settings.GDC_AUTOMATIONS_RETRY_MAX and _is_retryable(run.status_code):
+        run.status = AutomationRun.STATUS_RETRY_SCHEDULED
+        run.next_retry_at = run.last_attempt_at + timedelta(seconds=retry_delay_seconds(run.attempts))
+    else:
+        run.status = AutomationRun.STATUS_FAILED
+        run.next_retry_at = None
+    return run
+
+
+def _log_run(run):
+    return AuditEvent.log(
         event_type="automation.run",
         model_name="AutomationRun",
         object_id=str(run.id),
-        action="create",
+        action="create" if run.attempts <= 1 else "retry",
         metadata={
             "correlation_id": str(run.correlation_id),
-            "event_type": event_type,
-            "lead_id": str(lead_id) if lead_id else None,
+            "event_type": run.event_type,
+            "lead_id": str(run.lead_id) if run.lead_id else None,
             "success": run.success,
             "attempts": run.attempts,
+            "status": run.status,
         },
     )
-    return run
+
+
+def _send_webhook(event_type, payload, lead_id=None):
+    return dispatch_webhooks([(event_type, payload, lead_id)])[0]
+
+
+def _deliver_runs(runs, concurrency=None, executor=None, now=None):
+    now = now or timezone.now()
+    breakers = {}
+    for run in runs:
+        host = webhook_host(run.webhook_url)
+        if host not in breakers:
+            breakers[host] = CircuitBreaker.load(run.webhook_url, now=now)
+
+    def deliver(run):
+        return _deliver(run, breakers[webhook_host(run.webhook_url)])
+
+    if executor is not None:
+        list(executor.map(deliver, runs))
+    else:
+        workers = max(1, min(concurrency or settings.GDC_AUTOMATIONS_CONCURRENCY, len(runs)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(deliver, runs))
+
+    for breaker in breakers.values():
+        breaker.save()
+
+    now = timezone.now()
+    for run in runs:
+        run.updated_at = now
+    AutomationRun.objects.bulk_update(runs, RUN_DELIVERY_FIELDS)
+    with buffered_audit():
+        for run in runs:
+            _log_run(run)
+    return runs
+
+
+def dispatch_webhooks(jobs, concurrency=None, executor=None):
+    """
+    Deliver many webhooks at once.
+
+    `jobs` is an iterable of (event_type, payload, lead_id) tuples. Runs are
+    inserted and updated with one bulk statement each, and the HTTP calls are
+    spread over a bounded thread pool (GDC_AUTOMATIONS_CONCURRENCY workers by
+    default). Pass `executor` to reuse a pool across several batches.
+    """
+    runs = [_new_run(event_type, payload, lead_id=lead_id) for event_type, payload, lead_id in jobs]
+    if not runs:
+        return []
+    AutomationRun.objects.bulk_create(runs)
+    return _deliver_runs(runs, concurrency=concurrency, executor=executor)
+
+
+def _claim_due_retries(batch_size, now, pass_started):
+    # Runs already handled in this pass have updated_at >= pass_started, which
+    # keeps one pass from picking the same run up twice.
+    candidate_ids = list(
+        AutomationRun.objects.filter(
+            status__in=AutomationRun.IN_FLIGHT_STATUSES,
+            next_retry_at__lte=now,
+            updated_at__lt=pass_started,
+        )
+        .order_by("next_retry_at")
+        .values_list("id", flat=True)[:batch_size]
+    )
+    if not candidate_ids:
+        return []
+
+    # Push next_retry_at out by the lock timeout while the claim is held, so a
+    # crashed worker's runs become due again instead of being stuck.
+    token = uuid.uuid4()
+    AutomationRun.objects.filter(
+        pk__in=candidate_ids,
+        status__in=AutomationRun.IN_FLIGHT_STATUSES,
+        next_retry_at__lte=now,
+    ).update(
+        claim_token=token,
+        next_retry_at=now + timedelta(seconds=settings.GDC_OUTBOX_LOCK_TIMEOUT),
+    )
+    return list(AutomationRun.objects.filter(claim_token=token).order_by("next_retry_at"))
+
+
+def retry_due_webhooks(now=None, batch_size=None, concurrency=None):
+    """Re-attempt every retry-scheduled or deferred run that is due, one batch at a time."""
+    pass_started = timezone.now()
+    now = now or pass_started
+    batch_size = batch_size or settings.GDC_OUTBOX_BATCH_SIZE
+    summary = {"retried": 0, "sent": 0, "retrying": 0, "deferred": 0, "failed": 0}
+    workers = max(1, concurrency or settings.GDC_AUTOMATIONS_CONCURRENCY)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            runs = _claim_due_retries(batch_size, now, pass_started)
+            if not runs:
+                break
+            _deliver_runs(runs, executor=pool, now=now)
+            summary["retried"] += len(runs)
+            _tally(summary, runs)
+    return summary
 
 
 def send_lead_created_webhook(lead):
@@ -158,37 +329,154 @@ def send_lead_created_webhook(lead):
     return _send_webhook("lead.created", payload, lead_id=lead.id)
 
 
+def enqueue_webhook(event_type, payload, lead_id=None):
+    if event_type not in WEBHOOK_PATHS:
+        raise ValueError(f"Unknown event_type: {event_type}")
+    return WebhookOutbox.objects.create(
+        event_type=event_type,
+        lead_id=lead_id,
+        payload=payload,
+    )
+
+
+def enqueue_lead_created_webhook(lead):
+    correlation_id = uuid.uuid4()
+    payload = _build_payload("lead.created", correlation_id, lead=lead)
+    return enqueue_webhook("lead.created", payload, lead_id=lead.id)
+
+
+def enqueue_lead_created_webhooks(leads):
+    """Queue lead.created webhooks for many leads with a single INSERT."""
+    return WebhookOutbox.objects.bulk_create(
+        [
+            WebhookOutbox(
+                event_type="lead.created",
+                lead_id=lead.id,
+                payload=_build_payload("lead.created", uuid.uuid4(), lead=lead),
+            )
+            for lead in leads
+        ]
+    )
+
+
+def _claim_outbox_batch(batch_size, now):
+    lock_expiry = now - timedelta(seconds=settings.GDC_OUTBOX_LOCK_TIMEOUT)
+    candidate_ids = list(
+        WebhookOutbox.objects.filter(
+            Q(status=WebhookOutbox.STATUS_PENDING)
+            | Q(status=WebhookOutbox.STATUS_PROCESSING, locked_at__lt=lock_expiry),
+            available_at__lte=now,
+        )
+        .order_by("available_at")
+        .values_list("id", flat=True)[:batch_size]
+    )
+    if not candidate_ids:
+        return []
+
+    # Claim with a token so concurrent workers never pick up the same row.
+    token = uuid.uuid4()
+    WebhookOutbox.objects.filter(
+        Q(status=WebhookOutbox.STATUS_PENDING)
+        | Q(status=WebhookOutbox.STATUS_PROCESSING, locked_at__lt=lock_expiry),
+        pk__in=candidate_ids,
+    ).update(status=WebhookOutbox.STATUS_PROCESSING, claim_token=token, locked_at=now)
+    return list(WebhookOutbox.objects.filter(claim_token=token).order_by("available_at"))
+
+
+def drain_outbox(batch_size=None, now=None, concurrency=None):
+    """Deliver one batch of queued webhooks. Returns the AutomationRuns created."""
+    batch_size = batch_size or settings.GDC_OUTBOX_BATCH_SIZE
+    now = now or timezone.now()
+    entries = _claim_outbox_batch(batch_size, now)
+    runs = dispatch_webhooks(
+        [(entry.event_type, entry.payload, entry.lead_id) for entry in entries],
+        concurrency=concurrency,
+    )
+
+    dispatched_at = timezone.now()
+    for entry, run in zip(entries, runs):
+        entry.status = WebhookOutbox.STATUS_DISPATCHED
+        entry.automation_run_id = run.id
+        entry.dispatched_at = dispatched_at
+        entry.updated_at = dispatched_at
+    WebhookOutbox.objects.bulk_update(
+        entries, ["status", "automation_run_id", "dispatched_at", "updated_at"]
+    )
+    return runs
+
+
 def send_lead_overdue_webhook(lead):
     correlation_id = uuid.uuid4()
     payload = _build_payload("lead.overdue", correlation_id, lead=lead)
     return _send_webhook("lead.overdue", payload, lead_id=lead.id)
 
 
-def _priority_leads(now, limit=5):
+def send_overdue_webhooks(now=None, concurrency=None, batch_size=500):
+    """
+    Notify n8n about every overdue lead not already notified today.
+
+    Today's successful (or still in-flight) notifications are loaded once
+    into a set instead of being checked per lead, and each batch of leads is
+    dispatched through a shared thread pool. Returns a summary dict for
+    reporting.
+    """
+    now = now or timezone.now()
     today = timezone.localdate(now)
-    stale_cutoff = now - timedelta(days=7)
-    qs = (
-        Lead.objects.select_related("stage")
-        .annotate(
-            priority_rank=Case(
-                When(next_action_due__lt=now, then=Value(1)),
-                When(next_action_due__date=today, then=Value(2)),
-                When(
-                    Q(last_interaction_date__lte=stale_cutoff)
-                    | Q(last_interaction_date__isnull=True, first_contact_date__lte=stale_cutoff),
-                    then=Value(3),
-                ),
-                default=Value(4),
-                output_field=IntegerField(),
-            )
-        )
-        .order_by("priority_rank", "-value_estimate")[:limit]
+    started = time.monotonic()
+
+    already_sent = set(
+        AutomationRun.objects.filter(
+            Q(success=True) | Q(status__in=AutomationRun.IN_FLIGHT_STATUSES),
+            event_type="lead.overdue",
+            created_at__date=today,
+        ).values_list("lead_id", flat=True)
     )
+
+    overdue_qs = (
+        Lead.objects.filter(next_action_due__lt=now, next_action_due__isnull=False)
+        .order_by("next_action_due", "id")
+    )
+
+    summary = {"overdue": 0, "skipped": 0, "sent": 0, "retrying": 0, "deferred": 0, "failed": 0}
+    workers = max(1, concurrency or settings.GDC_AUTOMATIONS_CONCURRENCY)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        batch = []
+        for lead in overdue_qs.iterator(chunk_size=batch_size):
+            summary["overdue"] += 1
+            if lead.id in already_sent:
+                summary["skipped"] += 1
+                continue
+            payload = _build_payload("lead.overdue", uuid.uuid4(), lead=lead)
+            batch.append(("lead.overdue", payload, lead.id))
+            if len(batch) >= batch_size:
+                _tally(summary, dispatch_webhooks(batch, executor=pool))
+                batch = []
+        if batch:
+            _tally(summary, dispatch_webhooks(batch, executor=pool))
+
+    summary["elapsed_seconds"] = round(time.monotonic() - started, 3)
+    return summary
+
+
+def _tally(summary, runs):
+    for run in runs:
+        if run.success:
+            summary["sent"] += 1
+        elif run.status == AutomationRun.STATUS_RETRY_SCHEDULED:
+            summary["retrying"] += 1
+        elif run.status == AutomationRun.STATUS_DEFERRED:
+            summary["deferred"] += 1
+        else:
+            summary["failed"] += 1
+
+
+def _priority_leads(now, stale_days, limit=5):
+    qs = prioritized_leads(now, stale_days=stale_days)[:limit]
     return [
         {
             "lead_id": str(lead.id),
             "business_name": lead.business_name,
-            "stage": lead.stage.name,
+            "stage": lead.stage_name,
             "next_action_due": _unix_ts(lead.next_action_due) if lead.next_action_due else None,
         }
         for lead in qs
@@ -197,20 +485,11 @@ def _priority_leads(now, limit=5):
 
 def send_daily_summary_webhook(now=None):
     now = now or timezone.now()
-    today = timezone.localdate(now)
-    stale_cutoff = now - timedelta(days=7)
+    stale_days = AppSetting.get_int("stale_days", 7)
 
     summary = {
-        "counts": {
-            "new_leads": Lead.objects.filter(created_at__date=today).count(),
-            "overdue": Lead.objects.filter(next_action_due__lt=now, next_action_due__isnull=False).count(),
-            "due_today": Lead.objects.filter(next_action_due__date=today).count(),
-            "stale": Lead.objects.filter(
-                Q(last_interaction_date__lte=stale_cutoff)
-                | Q(last_interaction_date__isnull=True, first_contact_date__lte=stale_cutoff)
-            ).count(),
-        },
-        "top_priorities": _priority_leads(now, limit=5),
+        "counts": lead_bucket_counts(now, stale_days=stale_days),
+        "top_priorities": _priority_leads(now, stale_days, limit=5),
     }
 
     correlation_id = uuid.uuid4()
@@ -3,7 +3,8 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 
 from apps.crm.models import Lead
-from .services import send_lead_created_webhook
+from apps.crm.signals import leads_imported
+from .services import enqueue_lead_created_webhook, enqueue_lead_created_webhooks
 
 
 @receiver(post_save, sender=Lead)
@@ -12,4 +13,15 @@ def lead_created_webhook(sender, instance, created, **kwargs):
         return
     if not getattr(settings, "GDC_AUTOMATIONS_ENABLED", False):
         return
-    send_lead_created_webhook(instance)
+    # The outbox row is written in the same transaction as the lead, so it
+    # commits (or rolls back) with it; delivery happens in process_outbox.
+    enqueue_lead_created_webhook(instance)
+
+
+@receiver(leads_imported, sender=Lead)
+def leads_imported_webhooks(sender, leads, webhooks=True, **kwargs):
+    if not webhooks:
+        return
+    if not getattr(settings, "GDC_AUTOMATIONS_ENABLED", False):
+        return
+    enqueue_lead_created_webhooks(leads)
@@ -0,0 +1,92 @@
+"""Local HTTP stub for exercising webhook delivery without n8n."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        stub = self.server.stub
+        if stub.delay:
+            time.sleep(stub.delay)
+        with stub.lock:
+            stub.requests.append(
+                {
+                    "path": self.path,
+                    "client": self.client_address,
+                    "headers": dict(self.headers.items()),
+                    "body": body,
+                }
+            )
+            status = stub.next_status()
+        response = json.dumps({"ok": 200 <= status < 300}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):  # noqa: A002
+        return
+
+
+class StubWebhookServer:
+    """
+    Threaded HTTP server on 127.0.0.1 that records every POST it receives.
+
+    `statuses` is consumed one per request (the last value repeats), so
+    `StubWebhookServer(statuses=[500, 200])` fails once and then succeeds.
+    """
+
+    def __init__(self, statuses=None, delay=0.0):
+        self.statuses = list(statuses or [200])
+        self.delay = delay
+        self.requests = []
+        self.lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def next_status(self):
+        if len(self.statuses) > 1:
+            return self.statuses.pop(0)
+        return self.statuses[0]
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/webhook/"
+
+    def payloads(self):
+        with self.lock:
+            return [json.loads(request["body"]) for request in self.requests]
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,273 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.automations.http_pool import HTTPConnectionPool, get_webhook_pool
+from apps.automations.models import AutomationRun, WebhookCircuit, WebhookOutbox
+from apps.automations.services import (
+    drain_outbox,
+    retry_due_webhooks,
+    retry_delay_seconds,
+    send_daily_summary_webhook,
+    send_overdue_webhooks,
+)
+from apps.automations.testing import StubWebhookServer
+from apps.crm.models import Lead, PipelineStage
+
+
+class WebhookTestMixin:
+    def setUp(self):
+        self.stage = PipelineStage.objects.create(name="Cold", order=0)
+        self.stub = StubWebhookServer().start()
+        self.addCleanup(self.stub.stop)
+        self.addCleanup(get_webhook_pool().clear)
+        overrides = override_settings(
+            GDC_AUTOMATIONS_ENABLED=True,
+            GDC_WEBHOOK_BASE_URL=self.stub.base_url,
+            GDC_WEBHOOK_SECRET="test-secret",
+            GDC_WEBHOOK_TIMEOUT=2,
+            GDC_AUTOMATIONS_RETRY_MAX=3,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def _make_lead(self, name="Acme Ltd", **kwargs):
+        return Lead.objects.create(
+            business_name=name,
+            contact_person="Jane Doe",
+            phone="0700000000",
+            pain_point="Needs a better process",
+            stage=self.stage,
+            **kwargs,
+        )
+
+
+class WebhookOutboxTests(WebhookTestMixin, TestCase):
+    def test_lead_creation_enqueues_without_sending(self):
+        lead = self._make_lead()
+
+        entry = WebhookOutbox.objects.get()
+        self.assertEqual(entry.event_type, "lead.created")
+        self.assertEqual(entry.lead_id, lead.id)
+        self.assertEqual(entry.status, WebhookOutbox.STATUS_PENDING)
+        self.assertEqual(entry.payload["lead"]["business_name"], "Acme Ltd")
+        self.assertEqual(self.stub.requests, [])
+        self.assertFalse(AutomationRun.objects.exists())
+
+    def test_rolled_back_lead_leaves_no_outbox_entry(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self._make_lead()
+                raise RuntimeError("abort")
+
+        self.assertFalse(WebhookOutbox.objects.exists())
+
+    def test_drain_delivers_queued_webhooks(self):
+        lead = self._make_lead()
+
+        runs = drain_outbox()
+
+        self.assertEqual(len(runs), 1)
+        self.assertTrue(runs[0].success)
+        self.assertEqual(self.stub.requests[0]["path"], "/webhook/gdc-lead-created")
+        self.assertEqual(self.stub.payloads()[0]["lead_id"], str(lead.id))
+        entry = WebhookOutbox.objects.get()
+        self.assertEqual(entry.status, WebhookOutbox.STATUS_DISPATCHED)
+        self.assertEqual(entry.automation_run_id, runs[0].id)
+        self.assertEqual(drain_outbox(), [])
+
+    def test_failed_delivery_is_recorded_on_the_run(self):
+        self.stub.statuses = [503]
+        self._make_lead()
+
+        runs = drain_outbox()
+
+        self.assertFalse(runs[0].success)
+        self.assertEqual(runs[0].status_code, 503)
+        self.assertEqual(runs[0].attempts, 1)
+        self.assertEqual(runs[0].status, AutomationRun.STATUS_RETRY_SCHEDULED)
+        self.assertIsNotNone(runs[0].next_retry_at)
+        self.assertEqual(
+            WebhookOutbox.objects.get().status, WebhookOutbox.STATUS_DISPATCHED
+        )
+
+
+class OverdueSweepTests(WebhookTestMixin, TestCase):
+    def test_sweep_skips_leads_already_notified_today(self):
+        now = timezone.now()
+        due = now - timedelta(hours=2)
+        notified = self._make_lead("Notified", next_action_due=due)
+        pending = [self._make_lead(f"Pending {i}", next_action_due=due) for i in range(3)]
+        self._make_lead("Not due", next_action_due=now + timedelta(days=1))
+        AutomationRun.objects.create(
+            event_type="lead.overdue",
+            lead_id=notified.id,
+            webhook_url=self.stub.base_url,
+            payload_hash="x",
+            success=True,
+        )
+
+        summary = send_overdue_webhooks(now=now, concurrency=4, batch_size=2)
+
+        self.assertEqual(summary["overdue"], 4)
+        self.assertEqual(summary["skipped"], 1)
+        self.assertEqual(summary["sent"], 3)
+        self.assertEqual(summary["failed"], 0)
+        self.assertEqual(
+            {payload["lead_id"] for payload in self.stub.payloads()},
+            {str(lead.id) for lead in pending},
+        )
+        runs = AutomationRun.objects.filter(event_type="lead.overdue", success=True)
+        self.assertEqual(runs.count(), 4)
+        self.assertTrue(all(run.attempts == 1 for run in runs.exclude(lead_id=notified.id)))
+
+        repeat = send_overdue_webhooks(now=now, concurrency=4)
+        self.assertEqual(repeat["sent"], 0)
+        self.assertEqual(repeat["skipped"], 4)
+
+
+class HTTPConnectionPoolTests(TestCase):
+    def setUp(self):
+        self.stub = StubWebhookServer().start()
+        self.addCleanup(self.stub.stop)
+        self.url = self.stub.base_url + "gdc-lead-created"
+
+    def test_connections_are_reused(self):
+        pool = HTTPConnectionPool(max_size=2)
+        self.addCleanup(pool.clear)
+
+        for _ in range(3):
+            self.assertEqual(pool.request("POST", self.url, body=b"{}").status, 200)
+
+        clients = {request["client"] for request in self.stub.requests}
+        self.assertEqual(len(clients), 1)
+        self.assertEqual(pool.idle_count(self.url), 1)
+
+    def test_idle_connections_are_evicted(self):
+        pool = HTTPConnectionPool(max_size=2, idle_timeout=-1)
+        self.addCleanup(pool.clear)
+
+        pool.request("POST", self.url, body=b"{}")
+        pool.request("POST", self.url, body=b"{}")
+
+        clients = {request["client"] for request in self.stub.requests}
+        self.assertEqual(len(clients), 2)
+
+    def test_webhook_sends_share_the_module_pool(self):
+        self.addCleanup(get_webhook_pool().clear)
+        with override_settings(GDC_WEBHOOK_BASE_URL=self.stub.base_url, GDC_WEBHOOK_SECRET="s"):
+            send_daily_summary_webhook()
+            send_daily_summary_webhook()
+
+        self.assertEqual(len({request["client"] for request in self.stub.requests}), 1)
+
+
+@override_settings(GDC_AUTOMATIONS_RETRY_BASE_SECONDS=10, GDC_AUTOMATIONS_RETRY_MAX_DELAY=60)
+class DeferredRetryTests(WebhookTestMixin, TestCase):
+    def test_retry_delay_grows_exponentially_with_jitter(self):
+        self.assertTrue(5 <= retry_delay_seconds(1) <= 10)
+        self.assertTrue(10 <= retry_delay_seconds(2) <= 20)
+        self.assertTrue(20 <= retry_delay_seconds(3) <= 40)
+        self.assertTrue(30 <= retry_delay_seconds(10) <= 60)
+
+    def test_due_retries_are_redelivered(self):
+        self.stub.statuses = [500, 200]
+        self._make_lead()
+        run = drain_outbox()[0]
+        self.assertEqual(run.status, AutomationRun.STATUS_RETRY_SCHEDULED)
+
+        not_due = retry_due_webhooks(now=run.next_retry_at - timedelta(seconds=1))
+        self.assertEqual(not_due["retried"], 0)
+
+        summary = retry_due_webhooks(now=run.next_retry_at)
+
+        self.assertEqual(summary["retried"], 1)
+        self.assertEqual(summary["sent"], 1)
+        run.refresh_from_db()
+        self.assertTrue(run.success)
+        self.assertEqual(run.status, AutomationRun.STATUS_SUCCEEDED)
+        self.assertEqual(run.attempts, 2)
+        self.assertIsNone(run.next_retry_at)
+        self.assertEqual(len(self.stub.requests), 2)
+
+    def test_run_fails_after_max_attempts(self):
+        self.stub.statuses = [503]
+        self._make_lead()
+        run = drain_outbox()[0]
+
+        for _ in range(5):
+            retry_due_webhooks(now=timezone.now() + timedelta(days=1))
+
+        run.refresh_from_db()
+        self.assertEqual(run.status, AutomationRun.STATUS_FAILED)
+        self.assertEqual(run.attempts, 3)
+        self.assertIsNone(run.next_retry_at)
+        self.assertEqual(len(self.stub.requests), 3)
+
+    def test_client_errors_are_not_retried(self):
+        self.stub.statuses = [400]
+        self._make_lead()
+
+        run = drain_outbox()[0]
+
+        self.assertEqual(run.status, AutomationRun.STATUS_FAILED)
+        self.assertIsNone(run.next_retry_at)
+
+
+@override_settings(GDC_WEBHOOK_CIRCUIT_THRESHOLD=2, GDC_WEBHOOK_CIRCUIT_COOLDOWN=60)
+class CircuitBreakerTests(WebhookTestMixin, TestCase):
+    def _overdue_leads(self, count):
+        due = timezone.now() - timedelta(hours=1)
+        return [self._make_lead(f"Lead {i}", next_action_due=due) for i in range(count)]
+
+    def test_open_circuit_defers_sends_without_http(self):
+        self.stub.statuses = [503]
+        self._overdue_leads(5)
+
+        summary = send_overdue_webhooks(concurrency=1)
+
+        self.assertEqual(len(self.stub.requests), 2)
+        self.assertEqual(summary["retrying"], 2)
+        self.assertEqual(summary["deferred"], 3)
+        circuit = WebhookCircuit.objects.get()
+        self.assertEqual(circuit.state, WebhookCircuit.STATE_OPEN)
+        deferred = AutomationRun.objects.filter(status=AutomationRun.STATUS_DEFERRED)
+        self.assertEqual(deferred.count(), 3)
+        self.assertTrue(all(run.attempts == 0 for run in deferred))
+        self.assertTrue(all(run.next_retry_at == circuit.retry_at for run in deferred))
+
+        # Another worker sees the shared state and does not call the endpoint.
+        drain_outbox()
+        self.assertEqual(len(self.stub.requests), 2)
+
+    def test_half_open_probe_closes_circuit(self):
+        self.stub.statuses = [503, 503, 200]
+        self._overdue_leads(4)
+        send_overdue_webhooks(concurrency=1)
+        circuit = WebhookCircuit.objects.get()
+
+        retry_due_webhooks(now=circuit.retry_at - timedelta(seconds=1), concurrency=1)
+        self.assertEqual(len(self.stub.requests), 2)
+
+        summary = retry_due_webhooks(now=circuit.retry_at + timedelta(hours=1), concurrency=1)
+
+        self.assertEqual(summary["sent"], 4)
+        circuit.refresh_from_db()
+        self.assertEqual(circuit.state, WebhookCircuit.STATE_CLOSED)
+        self.assertEqual(circuit.consecutive_failures, 0)
+
+    def test_failed_probe_reopens_circuit(self):
+        self.stub.statuses = [503]
+        self._overdue_leads(3)
+        send_overdue_webhooks(concurrency=1)
+        circuit = WebhookCircuit.objects.get()
+        first_retry_at = circuit.retry_at
+
+        retry_due_webhooks(now=first_retry_at, concurrency=1)
+
+        self.assertEqual(len(self.stub.requests), 3)
+        circuit.refresh_from_db()
+        self.assertEqual(circuit.state, WebhookCircuit.STATE_OPEN)
+        self.assertGreater(circuit.retry_at, first_retry_at)
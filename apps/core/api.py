@@ -0,0 +1,104 @@
+"""Shared REST framework building blocks: keyset pagination, sparse fields, ETags."""
+from __future__ import annotations
+
+import hashlib
+import json
+
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .permissions import user_permissions
+from .utils import keyset_page
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on the view's `keyset_ordering` (ending in a unique
+    field), via core.utils.keyset_page. Every page is one range query with no
+    COUNT, so it costs the same on page 1 and page 10,000.
+    """
+
+    page_size = 20
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = list(getattr(view, "keyset_ordering", self.ordering))
+        try:
+            limit = min(max(int(request.query_params.get("limit", self.page_size)), 1), self.max_page_size)
+        except ValueError:
+            raise ValidationError({"limit": "Invalid limit."})
+        try:
+            rows, self.next_cursor = keyset_page(
+                queryset, ordering, cursor=request.query_params.get("cursor"), limit=limit
+            )
+        except ValueError:
+            raise ValidationError({"cursor": "Invalid cursor."})
+        self.request = request
+        return rows
+
+    def get_paginated_response(self, data):
+        next_url = None
+        if self.next_cursor:
+            next_url = replace_query_param(self.request.build_absolute_uri(), "cursor", self.next_cursor)
+        return Response({"next": next_url, "next_cursor": self.next_cursor, "results": data})
+
+
+class SparseFieldsMixin:
+    """Serializer mixin: `?fields=a,b` on a read limits the output to those fields."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return
+        requested = request.query_params.get("fields")
+        if not requested:
+            return
+        wanted = {name.strip() for name in requested.split(",") if name.strip()}
+        unknown = wanted - set(self.fields)
+        if unknown:
+            raise ValidationError({"fields": f"Unknown fields: {', '.join(sorted(unknown))}"})
+        for name in set(self.fields) - wanted:
+            self.fields.pop(name)
+
+
+class ConditionalGetMixin:
+    """
+    View mixin: GET responses carry an ETag of their payload, and a request
+    whose If-None-Match matches gets an empty 304 instead.
+
+    The payload is still built, so this saves bandwidth and client work
+    (polling integrations), not queries.
+    """
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if request.method in ("GET", "HEAD") and response.status_code == status.HTTP_200_OK:
+            payload = json.dumps(response.data, sort_keys=True, default=str).encode("utf-8")
+            etag = quote_etag(hashlib.md5(payload, usedforsecurity=False).hexdigest())
+            client_etags = parse_etags(request.headers.get("If-None-Match", ""))
+            if etag in client_etags or "*" in client_etags:
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            response["ETag"] = etag
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class CanViewLeads(permissions.BasePermission):
+    """Owners and Sales; writes on views with `owner_only_writes` need Owner."""
+
+    def has_permission(self, request, view):
+        capabilities = user_permissions(request.user)
+        if request.method not in permissions.SAFE_METHODS and getattr(view, "owner_only_writes", False):
+            return capabilities["can_edit_pipeline"]
+        return capabilities["can_view_leads"]
+
+
+class CanExportData(permissions.BasePermission):
+    """Owners only: change feeds and exports expose every record."""
+
+    def has_permission(self, request, view):
+        return user_permissions(request.user)["can_export_data"]
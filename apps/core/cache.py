@@ -0,0 +1,115 @@
+"""Cache helpers shared across apps."""
+from __future__ import annotations
+
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+# namespace -> (on-commit callback, values read since) for this thread's writes.
+_pending = threading.local()
+
+
+def _version_key(namespace):
+    return f"gdc:version:{namespace}"
+
+
+def get_version(namespace):
+    """
+    Current version number of a cache namespace.
+
+    Keys built with the version go stale all at once when it is bumped. A
+    lost version (evicted or after a restart of a local-memory cache) starts
+    again from the clock rather than 1, so it never revisits old keys.
+    """
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace):
+    """Invalidate every key built with the namespace's current version."""
+    key = _version_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        return get_version(namespace)
+
+
+def invalidate_version(namespace):
+    """
+    bump_version() now, for this process and its open transaction, and again
+    on commit, so another process that refilled the namespace in between
+    does not keep what it read before the commit.
+    """
+    bump_version(namespace)
+
+    def bump():
+        bump_version(namespace)
+
+    transaction.on_commit(bump)
+    if transaction.get_connection().in_atomic_block:
+        _pending.__dict__[namespace] = (bump, {})
+
+
+def pending_values(namespace):
+    """
+    A dict for caching what this thread reads of `namespace` while its open
+    transaction holds an uncommitted invalidate_version() of it, or None.
+
+    Such reads may include uncommitted rows: they must not go into a shared
+    cache, where other workers would see them and a rollback (which bumps
+    nothing) would leave them. The dict lives until the transaction (or the
+    savepoint that made the write) commits or rolls back.
+    """
+    entry = _pending.__dict__.get(namespace)
+    if entry is None:
+        return None
+    bump, values = entry
+    connection = transaction.get_connection()
+    # Django drops a callback from run_on_commit when it runs or is rolled back.
+    if connection.in_atomic_block and any(callback is bump for _, callback, _ in connection.run_on_commit):
+        return values
+    del _pending.__dict__[namespace]
+    return None
+
+
+class ReferenceCache:
+    """
+    An in-process copy of a small, rarely changing table (settings, pipeline
+    stages), loaded once per worker by `loader` and reused until the
+    namespace's version moves.
+
+    Checking the version is one cache-backend read and no database query.
+    Writers call invalidate() (see invalidate_version()); until their
+    transaction ends, their own reads bypass the shared copy.
+    Multi-process deployments need a shared GDC_CACHE_BACKEND for the bump
+    to reach every worker. Cached objects are shared: treat them as read-only.
+    """
+
+    def __init__(self, namespace, loader):
+        self.namespace = namespace
+        self.loader = loader
+        self._entry = (None, None)
+
+    def get(self):
+        pending = pending_values(self.namespace)
+        if pending is not None:
+            if "data" not in pending:
+                pending["data"] = self.loader()
+            return pending["data"]
+        version = get_version(self.namespace)
+        loaded_version, data = self._entry
+        if data is None or loaded_version != version:
+            data = self.loader()
+            # One tuple assignment, so a concurrent reader never pairs a new
+            # version with old data.
+            self._entry = (version, data)
+        return data
+
+    def invalidate(self):
+        invalidate_version(self.namespace)
@@ -0,0 +1,80 @@
+"""Streaming CSV/NDJSON encoders for exports that must run in constant memory."""
+from __future__ import annotations
+
+import csv
+import json
+import zlib
+
+# Encoded output is handed on in blocks of about this size; gzip compresses
+# better and a streaming response sends fewer, larger writes.
+BLOCK_SIZE = 64 * 1024
+
+
+class _Echo:
+    """File-like object whose write() returns what it was given, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _json_value(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def encode_rows(columns, rows, fmt):
+    """
+    Yield text lines for `rows` (tuples in `columns` order) as CSV, with a
+    header, or NDJSON, one object per line.
+    """
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow([_cell(value) for value in row])
+        return
+    if fmt == "ndjson":
+        for row in rows:
+            yield json.dumps({column: _json_value(value) for column, value in zip(columns, row)}, default=str) + "\n"
+        return
+    raise ValueError(f"Unknown format: {fmt}")
+
+
+def to_blocks(lines, compress=False):
+    """
+    Join text lines into UTF-8 blocks of about BLOCK_SIZE bytes, gzipped on
+    the fly when `compress` is set. Only one block is held at a time.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    pending = []
+    size = 0
+    for line in lines:
+        data = line.encode("utf-8")
+        pending.append(data)
+        size += len(data)
+        if size >= BLOCK_SIZE:
+            block = b"".join(pending)
+            pending, size = [], 0
+            if compressor is None:
+                yield block
+            else:
+                compressed = compressor.compress(block)
+                if compressed:
+                    yield compressed
+    block = b"".join(pending)
+    if compressor is None:
+        if block:
+            yield block
+        return
+    yield compressor.compress(block) + compressor.flush()
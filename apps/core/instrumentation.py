@@ -0,0 +1,143 @@
+"""
+Per-request and per-command query and latency instrumentation.
+
+instrument() installs an execute wrapper on the thread's database
+connections and counts queries, DB time and the slowest statements (SQL
+text only, never parameters). InstrumentationMiddleware reports every
+request in response headers; a GDC_INSTRUMENTATION_SAMPLE_RATE share of
+them, and every request slower than GDC_INSTRUMENTATION_SLOW_MS, is
+logged as JSON and kept in a per-process ring buffer for superusers.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import random
+import time
+from collections import deque
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("gdc.instrumentation")
+
+SQL_MAX_LENGTH = 500
+
+_recent = deque(maxlen=max(1, settings.GDC_INSTRUMENTATION_BUFFER_SIZE))
+
+
+class QueryStats:
+    """Query count, DB time and the slowest queries of one request or command."""
+
+    def __init__(self, label, slow_queries=None):
+        self.label = label
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.total_seconds = 0.0
+        self.keep = settings.GDC_INSTRUMENTATION_SLOW_QUERIES if slow_queries is None else slow_queries
+        self._slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.db_seconds += elapsed
+            # A min-heap of the `keep` slowest; most queries only cost the comparison.
+            if len(self._slowest) < self.keep:
+                heapq.heappush(self._slowest, (elapsed, self.queries, sql))
+            elif self._slowest and elapsed > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, (elapsed, self.queries, sql))
+
+    @property
+    def slowest(self):
+        return [
+            {"ms": round(elapsed * 1000, 2), "sql": sql[:SQL_MAX_LENGTH]}
+            for elapsed, _, sql in sorted(self._slowest, reverse=True)
+        ]
+
+    def as_dict(self):
+        return {
+            "label": self.label,
+            "queries": self.queries,
+            "db_ms": round(self.db_seconds * 1000, 2),
+            "total_ms": round(self.total_seconds * 1000, 2),
+            "slowest": self.slowest,
+        }
+
+
+@contextmanager
+def instrument(label, slow_queries=None):
+    """
+    Collect QueryStats for the block on this thread's connections. Queries
+    run by other threads (e.g. a webhook pool) are not counted.
+    """
+    stats = QueryStats(label, slow_queries=slow_queries)
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        try:
+            yield stats
+        finally:
+            stats.total_seconds = time.perf_counter() - start
+
+
+def record(stats, sampled=True, **extra):
+    """Log `stats` as JSON and keep it in the ring buffer, if sampled or slow."""
+    slow = stats.total_seconds * 1000 >= settings.GDC_INSTRUMENTATION_SLOW_MS
+    if not (sampled or slow):
+        return None
+    entry = {"timestamp": time.time(), **extra, **stats.as_dict()}
+    _recent.append(entry)
+    logger.log(logging.WARNING if slow else logging.INFO, json.dumps(entry, default=str))
+    return entry
+
+
+def recent_stats():
+    """The buffered entries, newest first."""
+    return list(reversed(_recent))
+
+
+def clear_stats():
+    _recent.clear()
+
+
+class InstrumentationMiddleware:
+    """
+    Add X-DB-Queries and Server-Timing (db, total) headers to every response
+    and record() a sample. Put it first, so the other middleware's queries
+    count too. Streamed bodies are produced after the response is returned
+    and are not included.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = settings.GDC_INSTRUMENTATION_ENABLED
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+        with instrument(request.path) as stats:
+            response = self.get_response(request)
+
+        match = getattr(request, "resolver_match", None)
+        if match is not None:
+            stats.label = match.view_name or match.route
+        response["X-DB-Queries"] = str(stats.queries)
+        response["Server-Timing"] = (
+            f"db;dur={stats.db_seconds * 1000:.1f}, total;dur={stats.total_seconds * 1000:.1f}"
+        )
+        record(
+            stats,
+            sampled=random.random() < settings.GDC_INSTRUMENTATION_SAMPLE_RATE,
+            kind="request",
+            method=request.method,
+            path=request.path,
+            status=response.status_code,
+        )
+        return response
@@ -0,0 +1,30 @@
+import argparse
+import json
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from apps.core.instrumentation import instrument, record
+
+
+class Command(BaseCommand):
+    """
+    WHAT: Runs another management command and reports its query count, DB time, total time and slowest queries
+    WHY: Cron jobs such as run_automations have no request to hang the instrumentation middleware on
+    USAGE: python manage.py instrument run_automations --overdue
+    """
+
+    help = "Run a management command under query and latency instrumentation"
+
+    def add_arguments(self, parser):
+        parser.add_argument("command_name", help="Command to run, e.g. run_automations")
+        parser.add_argument("command_args", nargs=argparse.REMAINDER, help="Arguments for that command")
+        parser.add_argument("--slow-queries", type=int, default=None, help="Slowest queries to report")
+
+    def handle(self, *args, **options):
+        name = options["command_name"]
+        with instrument(name, slow_queries=options["slow_queries"]) as stats:
+            call_command(name, *options["command_args"], stdout=self.stdout, stderr=self.stderr)
+        # Commands are rare enough to always log; stderr keeps stdout for the command's own output.
+        entry = record(stats, kind="command", args=options["command_args"])
+        self.stderr.write(json.dumps(entry, indent=2, default=str))
@@ -6,6 +6,8 @@ import uuid
 from django.db import models
 from django.utils import timezone
 
+from .cache import ReferenceCache
+
 
 class BaseModelQuerySet(models.QuerySet):
     def alive(self):
@@ -27,6 +29,44 @@ class AllObjectsManager(models.Manager):
         return BaseModelQuerySet(self.model, using=self._db)
 
 
+class TrackedFieldsMixin:
+    """
+    Keep the loaded values of TRACKED_FIELDS (attnames) in memory, so save()
+    can tell what changed without re-reading the row.
+    """
+
+    TRACKED_FIELDS = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot_tracked_fields()
+
+    def _snapshot_tracked_fields(self, update_fields=None):
+        """Remember the tracked values as loaded (or as just saved), so save() can diff in memory."""
+        snapshot = {}
+        written = None
+        if update_fields is not None:
+            snapshot = dict(getattr(self, "_loaded_values", {}))
+            written = {self._meta.get_field(name).attname for name in update_fields}
+        for name in self.TRACKED_FIELDS:
+            if name in self.__dict__ and (written is None or name in written):
+                snapshot[name] = self.__dict__[name]
+        self._loaded_values = snapshot
+
+    def _loaded_value(self, name):
+        loaded = getattr(self, "_loaded_values", {})
+        if name in loaded:
+            return loaded[name]
+        # Only reached for instances loaded with .only()/.defer().
+        return type(self)._base_manager.filter(pk=self.pk).values_list(name, flat=True).first()
+
+
 class BaseModel(models.Model):
     """Base model for all GDC entities."""
 
@@ -67,12 +107,19 @@ class AppSetting(models.Model):
     def __str__(self) -> str:
         return f"{self.key}={self.value}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        _app_settings.invalidate()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        _app_settings.invalidate()
+        return result
+
     @classmethod
     def get_value(cls, key, default=None):
-        try:
-            return cls.objects.get(key=key).value
-        except cls.DoesNotExist:
-            return default
+        """The setting's value from the per-worker settings cache (no query once loaded)."""
+        return _app_settings.get().get(key, default)
 
     @classmethod
     def get_int(cls, key, default=0):
@@ -81,3 +128,15 @@ class AppSetting(models.Model):
             return int(value) if value is not None else default
         except (TypeError, ValueError):
             return default
+
+    @classmethod
+    def get_bool(cls, key, default=False):
+        value = cls.get_value(key, None)
+        if value is None:
+            return default
+        return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+_app_settings = ReferenceCache(
+    "core.appsetting", lambda: dict(AppSetting.objects.values_list("key", "value"))
+)
@@ -1 +1,78 @@
-"""Shared permission helpers."""
+"""Shared permission helpers: Owner/Sales/Ops roles and the capabilities they grant."""
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+from .cache import get_version, invalidate_version, pending_values
+
+ROLES = ("Owner", "Sales", "Ops")
+ROLES_NAMESPACE = "core.roles"
+# Entries are replaced on any membership change (via the version), so the
+# timeout only bounds how long an unused entry lingers.
+ROLES_CACHE_TTL = 24 * 60 * 60
+
+
+def _load_roles(user):
+    return frozenset(user.groups.filter(name__in=ROLES).values_list("name", flat=True))
+
+
+def user_roles(user):
+    """
+    The user's role (group) names as a frozenset, cached per user. A change
+    to any user's groups, or to a group, invalidates every entry.
+    """
+    if not user.is_authenticated:
+        return frozenset()
+    pending = pending_values(ROLES_NAMESPACE)
+    if pending is not None:
+        # This transaction changed memberships: keep what it reads out of the shared cache.
+        if user.pk not in pending:
+            pending[user.pk] = _load_roles(user)
+        return pending[user.pk]
+    key = f"gdc:roles:{user.pk}:v{get_version(ROLES_NAMESPACE)}"
+    roles = cache.get(key)
+    if roles is None:
+        roles = _load_roles(user)
+        cache.set(key, roles, ROLES_CACHE_TTL)
+    return roles
+
+
+def invalidate_roles():
+    """Drop every cached role set."""
+    invalidate_version(ROLES_NAMESPACE)
+
+
+def user_permissions(user, roles=None):
+    """Owner/Sales/Ops capabilities for `user`; pass `roles` (e.g. request.gdc_roles) if already resolved."""
+    if roles is None:
+        roles = user_roles(user)
+    is_owner = user.is_superuser or "Owner" in roles
+    is_sales = "Sales" in roles
+    is_ops = "Ops" in roles
+    return {
+        "can_view_leads": is_owner or is_sales,
+        "can_view_health": is_owner or is_ops,
+        "can_view_financials": is_owner,
+        "can_edit_pipeline": is_owner,
+        "can_export_data": is_owner,
+    }
+
+
+def request_permissions(request):
+    """user_permissions() for the request's user, using the roles RoleMiddleware resolved."""
+    return user_permissions(request.user, roles=getattr(request, "gdc_roles", None))
+
+
+class RoleMiddleware:
+    """
+    Set request.gdc_roles, the user's roles, resolved on first use from the
+    role cache (no query once cached). Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.gdc_roles = SimpleLazyObject(lambda: user_roles(request.user))
+        return self.get_response(request)
@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .permissions import invalidate_roles
+
+User = get_user_model()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_roles()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_written(sender, **kwargs):
+    invalidate_roles()
+
+
+# A new user can get the id of a deleted (or rolled back) one, whose roles
+# may still be cached under it.
+@receiver(post_save, sender=User)
+def user_created(sender, created, **kwargs):
+    if created:
+        invalidate_roles()
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, **kwargs):
+    invalidate_roles()
@@ -0,0 +1,112 @@
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from apps.core.instrumentation import clear_stats, instrument, recent_stats
+from apps.core.permissions import RoleMiddleware, user_permissions, user_roles
+
+
+class RoleResolutionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = get_user_model().objects.create_user("rep", "rep@example.com", "pw")
+        self.sales = Group.objects.get(name="Sales")
+
+    def test_roles_are_cached_until_membership_changes(self):
+        self.user.groups.add(self.sales)
+        self.assertEqual(user_roles(self.user), {"Sales"})
+
+        with self.assertNumQueries(0):
+            self.assertEqual(user_permissions(self.user)["can_view_leads"], True)
+            self.assertEqual(user_permissions(self.user)["can_view_financials"], False)
+
+        self.sales.user_set.remove(self.user)
+        self.assertEqual(user_roles(self.user), frozenset())
+        self.user.groups.add(Group.objects.get(name="Owner"))
+        self.assertTrue(user_permissions(self.user)["can_view_financials"])
+
+    def test_roles_read_inside_a_rolled_back_change_are_not_kept(self):
+        self.assertEqual(user_roles(self.user), frozenset())
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.user.groups.add(self.sales)
+            self.assertEqual(user_roles(self.user), {"Sales"})
+            raise RuntimeError("boom")
+
+        self.assertEqual(user_roles(self.user), frozenset())
+
+    def test_middleware_resolves_roles_lazily_once(self):
+        self.user.groups.add(self.sales)
+        request = RequestFactory().get("/")
+        request.user = self.user
+        seen = []
+        middleware = RoleMiddleware(lambda request: seen.append(request.gdc_roles) or None)
+
+        with self.assertNumQueries(1):
+            middleware(request)
+            self.assertIn("Sales", seen[0])
+            self.assertIn("Sales", request.gdc_roles)
+        with self.assertNumQueries(0):
+            middleware(request)
+            self.assertIn("Sales", request.gdc_roles)
+
+
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        clear_stats()
+        self.addCleanup(clear_stats)
+
+    def test_counts_queries_and_keeps_the_slowest(self):
+        with instrument("block", slow_queries=2) as stats:
+            for _ in range(3):
+                list(Group.objects.all())
+
+        self.assertEqual(stats.queries, 3)
+        self.assertGreater(stats.total_seconds, 0)
+        self.assertGreaterEqual(stats.total_seconds, stats.db_seconds)
+        self.assertEqual(len(stats.slowest), 2)
+        self.assertIn("auth_group", stats.slowest[0]["sql"])
+
+    @override_settings(GDC_INSTRUMENTATION_SAMPLE_RATE=1.0)
+    def test_middleware_sets_headers_and_buffers_samples(self):
+        owner = get_user_model().objects.create_superuser("owner", "owner@example.com", "pw")
+        self.client.force_login(owner)
+
+        with self.assertLogs("gdc.instrumentation", "INFO") as logs:
+            response = self.client.get(reverse("dashboard-home"))
+        self.assertGreater(int(response["X-DB-Queries"]), 0)
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertEqual(json.loads(logs.records[0].getMessage())["label"], "dashboard-home")
+
+        results = self.client.get(reverse("dashboard-instrumentation")).json()["results"]
+        self.assertEqual(results[0]["label"], "dashboard-home")
+        self.assertEqual(results[0]["status"], 200)
+
+    @override_settings(GDC_INSTRUMENTATION_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_are_not_buffered(self):
+        self.client.get(reverse("login"))
+        self.assertEqual(recent_stats(), [])
+
+    def test_buffer_is_superuser_only(self):
+        user = get_user_model().objects.create_user("ops", "ops@example.com", "pw")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(reverse("dashboard-instrumentation")).status_code, 403)
+
+    def test_command_wrapper_reports_to_stderr(self):
+        out, err = StringIO(), StringIO()
+        call_command("instrument", "consistency_metrics", stdout=out, stderr=err)
+
+        self.assertIn("speed_to_lead", json.loads(out.getvalue()))
+        report = json.loads(err.getvalue())
+        self.assertEqual(report["label"], "consistency_metrics")
+        self.assertEqual(report["kind"], "command")
+        self.assertGreater(report["queries"], 0)
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.crm.services import backfill_first_interaction_at
+
+
+class Command(BaseCommand):
+    """
+    WHAT: Recomputes Lead.first_interaction_at from the interactions table
+    WHY: Speed-to-lead reads the column instead of joining every interaction
+    USAGE: python manage.py backfill_first_interaction --batch-size 5000
+    """
+
+    help = "Recompute Lead.first_interaction_at for every lead, in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Leads updated per statement")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        updated = backfill_first_interaction_at(batch_size=max(1, options["batch_size"]))
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {updated} leads in {elapsed:.2f}s"))
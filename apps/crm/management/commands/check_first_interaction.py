@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from apps.crm.services import first_interaction_drift, repair_first_interaction_at
+
+
+class Command(BaseCommand):
+    """
+    WHAT: Finds leads whose first_interaction_at no longer matches their interactions
+    WHY: Deletes, back-dated edits and raw SQL can bypass Interaction.save
+    USAGE: python manage.py check_first_interaction --repair
+    """
+
+    help = "Report (and optionally repair) drift in Lead.first_interaction_at"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repair", action="store_true", help="Fix the drifted leads")
+        parser.add_argument("--show", type=int, default=20, help="Drifted leads to list")
+
+    def handle(self, *args, **options):
+        drifted = first_interaction_drift()
+        shown = list(drifted.values_list("pk", "first_interaction_at", "actual_first_interaction")[: options["show"]])
+        if not shown:
+            self.stdout.write(self.style.SUCCESS("No drift in first_interaction_at."))
+            return
+
+        for pk, stored, actual in shown:
+            self.stdout.write(f"Lead {pk}: stored {stored}, actual {actual}")
+        total = drifted.count()
+        if total > len(shown):
+            self.stdout.write(f"... and {total - len(shown)} more")
+
+        if not options["repair"]:
+            self.stdout.write(self.style.WARNING(f"{total} leads drifted. Re-run with --repair to fix them."))
+            return
+        repaired = repair_first_interaction_at(drifted)
+        self.stdout.write(self.style.SUCCESS(f"Repaired {repaired} leads."))
@@ -0,0 +1,64 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.crm.exports import EXPORT_FORMATS, EXPORTS, stream_export
+
+
+def _aware(value):
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        # Well formed but impossible, e.g. 2026-02-30.
+        parsed = None
+    if parsed is None:
+        raise CommandError(f"Invalid datetime: {value!r}")
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+class Command(BaseCommand):
+    """
+    WHAT: Streams leads, interactions or the audit log to a CSV/NDJSON file
+    WHY: Materializing a whole queryset for an export does not fit in memory at scale
+    USAGE: python manage.py export_data audit --format ndjson --gzip -o audit.ndjson.gz
+    """
+
+    help = "Export leads, interactions or audit events as CSV or NDJSON, in constant memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(EXPORTS))
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument("--gzip", action="store_true", help="Gzip the output on the fly")
+        parser.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+        parser.add_argument("--since", default=None, help="Only rows at or after this ISO datetime")
+        parser.add_argument("--until", default=None, help="Only rows before this ISO datetime")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows fetched per round trip")
+
+    def handle(self, *args, **options):
+        blocks = stream_export(
+            options["dataset"],
+            fmt=options["format"],
+            compress=options["gzip"],
+            since=_aware(options["since"]) if options["since"] else None,
+            until=_aware(options["until"]) if options["until"] else None,
+            chunk_size=max(1, options["chunk_size"]),
+        )
+        started = time.monotonic()
+        written = 0
+        if options["output"] == "-":
+            out = getattr(self.stdout, "buffer", None) or sys.stdout.buffer
+            for block in blocks:
+                out.write(block)
+                written += len(block)
+            out.flush()
+            return
+        with open(options["output"], "wb") as out:
+            for block in blocks:
+                out.write(block)
+                written += len(block)
+        self.stderr.write(
+            f"Wrote {written} bytes to {options['output']} in {time.monotonic() - started:.2f}s"
+        )
@@ -0,0 +1,58 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.crm.services import bulk_log_interactions, read_rows
+
+
+class Command(BaseCommand):
+    """
+    WHAT: Bulk-logs interactions from a CSV or JSONL file (call logs, chat exports)
+    WHY: Interaction.save costs an insert, a lead update and an audit write per row
+    USAGE: python manage.py import_interactions calls.csv
+    """
+
+    help = "Log interactions from a CSV or JSONL file in bulk"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSONL file with a lead_id column")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            default=None,
+            help="File format (default: taken from the file extension)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Interactions inserted per transaction")
+        parser.add_argument("--dry-run", action="store_true", help="Validate rows without writing anything")
+        parser.add_argument("--max-errors", type=int, default=50, help="Row errors to print")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        fmt = options["format"] or ("jsonl" if path.suffix.lower() in (".jsonl", ".ndjson") else "csv")
+
+        started = time.monotonic()
+        with path.open(newline="", encoding="utf-8-sig") as fileobj:
+            result = bulk_log_interactions(
+                read_rows(fileobj, fmt),
+                chunk_size=max(1, options["chunk_size"]),
+                dry_run=options["dry_run"],
+                max_errors=options["max_errors"],
+            )
+        elapsed = time.monotonic() - started
+
+        for line, message in result.errors:
+            self.stderr.write(f"Line {line}: {message}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... and {result.error_count - len(result.errors)} more errors")
+
+        verb = "Validated" if options["dry_run"] else "Logged"
+        rate = result.created / elapsed if elapsed else 0.0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {result.created} of {result.rows} rows in {elapsed:.2f}s "
+                f"({rate:.0f} interactions/s, {result.error_count} errors)"
+            )
+        )
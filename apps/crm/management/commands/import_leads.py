@@ -0,0 +1,65 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.crm.services import import_leads, read_rows
+
+
+class Command(BaseCommand):
+    """
+    WHAT: Bulk-loads leads from a CSV or JSONL file
+    WHY: Saving leads one by one costs several round trips each
+    USAGE: python manage.py import_leads leads.csv --default-stage Cold
+    """
+
+    help = "Import leads from a CSV or JSONL file in bulk"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSONL file")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            default=None,
+            help="File format (default: taken from the file extension)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Leads inserted per transaction")
+        parser.add_argument("--default-stage", default=None, help="Stage name for rows without a 'stage' column")
+        parser.add_argument("--no-webhooks", action="store_true", help="Do not queue lead.created webhooks")
+        parser.add_argument("--dry-run", action="store_true", help="Validate rows without writing anything")
+        parser.add_argument("--max-errors", type=int, default=50, help="Row errors to print")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        fmt = options["format"] or ("jsonl" if path.suffix.lower() in (".jsonl", ".ndjson") else "csv")
+
+        started = time.monotonic()
+        with path.open(newline="", encoding="utf-8-sig") as fileobj:
+            try:
+                result = import_leads(
+                    read_rows(fileobj, fmt),
+                    chunk_size=max(1, options["chunk_size"]),
+                    default_stage=options["default_stage"],
+                    webhooks=not options["no_webhooks"],
+                    dry_run=options["dry_run"],
+                    max_errors=options["max_errors"],
+                )
+            except ValueError as exc:
+                raise CommandError(str(exc)) from exc
+        elapsed = time.monotonic() - started
+
+        for line, message in result.errors:
+            self.stderr.write(f"Line {line}: {message}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... and {result.error_count - len(result.errors)} more errors")
+
+        verb = "Validated" if options["dry_run"] else "Imported"
+        rate = result.created / elapsed if elapsed else 0.0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {result.created} of {result.rows} rows in {elapsed:.2f}s "
+                f"({rate:.0f} leads/s, {result.error_count} errors)"
+            )
+        )
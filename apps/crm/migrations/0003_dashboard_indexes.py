@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("crm", "0002_alter_lead_options_alter_pipelinestage_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="interaction",
+            index=models.Index(
+                fields=["lead", "created_at"], name="crm_interaction_lead_time_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["next_action_due"],
+                name="crm_lead_due_live_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["last_interaction_date"],
+                name="crm_lead_last_touch_live_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_deleted", False), ("last_interaction_date__isnull", True)
+                ),
+                fields=["first_contact_date"],
+                name="crm_lead_untouched_live_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["created_at"],
+                name="crm_lead_created_live_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:36
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("crm", "0003_dashboard_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                django.db.models.functions.comparison.Coalesce(
+                    "last_interaction_date", "first_contact_date"
+                ),
+                models.F("id"),
+                condition=models.Q(("is_deleted", False)),
+                name="crm_lead_stale_order_idx",
+            ),
+        ),
+    ]
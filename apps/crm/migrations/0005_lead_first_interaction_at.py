@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:45
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_first_interaction_at(apps, schema_editor):
+    Lead = apps.get_model("crm", "Lead")
+    Interaction = apps.get_model("crm", "Interaction")
+    first = Interaction.objects.filter(lead=OuterRef("pk")).order_by("created_at").values("created_at")[:1]
+    Lead.objects.update(first_interaction_at=Subquery(first))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("crm", "0004_lead_stale_order_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lead",
+            name="first_interaction_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Earliest logged interaction (kept in sync by Interaction.save; used for speed-to-lead)",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(backfill_first_interaction_at, migrations.RunPython.noop),
+    ]
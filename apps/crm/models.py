@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 from django.db import models
+from django.db.models.functions import Coalesce, Greatest, Least
 from django.utils import timezone
 
 from apps.audit.models import AuditEvent
-from apps.core.models import ActiveObjectsManager, BaseModel
+from apps.core.cache import ReferenceCache
+from apps.core.models import ActiveObjectsManager, BaseModel, TrackedFieldsMixin
 
 
 class PipelineStage(models.Model):
@@ -49,8 +51,37 @@ class PipelineStage(models.Model):
         """
         return self.is_won or self.is_lost
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        _stages.invalidate()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        _stages.invalidate()
+        return result
+
+    @classmethod
+    def cached_all(cls):
+        """Every stage in pipeline order, from the per-worker stage cache."""
+        return list(_stages.get().values())
+
+    @classmethod
+    def cached(cls, pk):
+        """The stage with `pk` from the stage cache, or None."""
+        return _stages.get().get(pk)
 
-class Lead(BaseModel):
+    @classmethod
+    def cached_by_name(cls):
+        """{lowercased name: stage} from the stage cache."""
+        return {stage.name.lower(): stage for stage in _stages.get().values()}
+
+
+_stages = ReferenceCache(
+    "crm.pipelinestage", lambda: {stage.pk: stage for stage in PipelineStage.objects.order_by("order", "pk")}
+)
+
+
+class Lead(TrackedFieldsMixin, BaseModel):
     """
     WHAT: A potential client (prospect).
     WHY: Track everyone you talk to, what they need, where they are in pipeline.
@@ -105,6 +136,12 @@ class Lead(BaseModel):
         blank=True,
         help_text="Last time you called/emailed/met (auto-updated when logging interaction)",
     )
+    first_interaction_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Earliest logged interaction (kept in sync by Interaction.save; used for speed-to-lead)",
+    )
     next_action = models.CharField(
         max_length=200,
         blank=True,
@@ -129,13 +166,59 @@ class Lead(BaseModel):
     objects = ActiveObjectsManager()
     all_objects = models.Manager()
 
+    # Fields whose loaded values are kept in memory, so a save can be diffed
+    # without re-reading the row: stage changes are audited, due-date moves
+    # invalidate cached dashboard metrics.
+    TRACKED_FIELDS = ("stage_id", "next_action_due")
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Lead"
         verbose_name_plural = "Leads"
+        # Partial indexes over live rows only, matching ActiveObjectsManager,
+        # for the dashboard's overdue/due-today, stale and new-lead predicates.
+        indexes = [
+            models.Index(
+                fields=["next_action_due"],
+                condition=models.Q(is_deleted=False),
+                name="crm_lead_due_live_idx",
+            ),
+            models.Index(
+                fields=["last_interaction_date"],
+                condition=models.Q(is_deleted=False),
+                name="crm_lead_last_touch_live_idx",
+            ),
+            # Stale fallback: leads never interacted with, by first contact.
+            models.Index(
+                fields=["first_contact_date"],
+                condition=models.Q(is_deleted=False, last_interaction_date__isnull=True),
+                name="crm_lead_untouched_live_idx",
+            ),
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(is_deleted=False),
+                name="crm_lead_created_live_idx",
+            ),
+            # Stale list order (longest untouched first), paged by cursor.
+            models.Index(
+                Coalesce("last_interaction_date", "first_contact_date"),
+                models.F("id"),
+                condition=models.Q(is_deleted=False),
+                name="crm_lead_stale_order_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
-        return f"{self.business_name} - {self.stage.name}"
+        return f"{self.business_name} - {self.stage_name}"
+
+    @property
+    def stage_name(self):
+        """The stage's name without a query: the loaded stage, else the stage cache."""
+        if not Lead.stage.is_cached(self):
+            stage = PipelineStage.cached(self.stage_id)
+            if stage is not None:
+                return stage.name
+        return self.stage.name
 
     @property
     def is_overdue(self):
@@ -155,45 +238,51 @@ class Lead(BaseModel):
         delta = timezone.now() - self.last_interaction_date
         return delta.days
 
+    def created_audit_fields(self):
+        """AuditEvent.log()/build() arguments for the lead.created event."""
+        return {
+            "event_type": "lead.created",
+            "model_name": "Lead",
+            "object_id": str(self.id),
+            "action": "create",
+            "after": {
+                "business_name": self.business_name,
+                "stage": self.stage_name,
+                "source": self.source,
+                "value_estimate": float(self.value_estimate),
+            },
+        }
+
     def save(self, *args, **kwargs):
-        is_new = self.pk is None
-        old_stage = None
+        is_new = self._state.adding
+        update_fields = kwargs.get("update_fields")
+        stage_written = update_fields is None or {"stage", "stage_id"} & set(update_fields)
 
-        if not is_new:
-            try:
-                old_lead = Lead.objects.get(pk=self.pk)
-                old_stage = old_lead.stage
-            except Lead.DoesNotExist:
-                pass
+        old_stage_id = None
+        if not is_new and stage_written:
+            old_stage_id = self._loaded_value("stage_id")
 
         super().save(*args, **kwargs)
 
         if is_new:
-            AuditEvent.log(
-                event_type="lead.created",
-                model_name="Lead",
-                object_id=str(self.id),
-                action="create",
-                after={
-                    "business_name": self.business_name,
-                    "stage": self.stage.name,
-                    "source": self.source,
-                    "value_estimate": float(self.value_estimate),
-                },
-            )
-        elif old_stage and old_stage != self.stage:
+            AuditEvent.log(**self.created_audit_fields())
+        elif old_stage_id is not None and old_stage_id != self.stage_id:
+            old_stage = PipelineStage.cached(old_stage_id)
+            old_stage_name = old_stage.name if old_stage is not None else None
             AuditEvent.log(
                 event_type="lead.stage_changed",
                 model_name="Lead",
                 object_id=str(self.id),
                 action="update",
-                before={"stage": old_stage.name},
-                after={"stage": self.stage.name},
+                before={"stage": old_stage_name},
+                after={"stage": self.stage_name},
                 metadata={"days_to_move": (timezone.now() - self.first_contact_date).days},
             )
 
+        self._snapshot_tracked_fields(update_fields)
+
 
-class Interaction(BaseModel):
+class Interaction(TrackedFieldsMixin, BaseModel):
     """
     WHAT: Log of every contact with a lead (calls, emails, meetings).
     WHY: Track what was discussed, maintain context, measure response time.
@@ -236,27 +325,100 @@ class Interaction(BaseModel):
 
     objects = ActiveObjectsManager()
 
+    # Changes to these move the lead's first/last interaction times.
+    TRACKED_FIELDS = ("created_at", "lead_id")
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            # First-response and follow-up lookups: a lead's interactions by time.
+            models.Index(fields=["lead", "created_at"], name="crm_interaction_lead_time_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.lead.business_name} - {self.interaction_type} on {self.created_at.date()}"
 
     def save(self, *args, **kwargs):
-        is_new = self.pk is None
+        is_new = self._state.adding
+        update_fields = kwargs.get("update_fields")
+        time_written = update_fields is None or {"created_at", "lead", "lead_id"} & set(update_fields)
+
+        old_lead_id = old_created_at = None
+        moved = is_new
+        if not is_new and time_written:
+            old_lead_id = self._loaded_value("lead_id")
+            old_created_at = self._loaded_value("created_at")
+            moved = old_lead_id != self.lead_id or old_created_at != self.created_at
+
         super().save(*args, **kwargs)
 
-        Lead.objects.filter(pk=self.lead.pk).update(
-            last_interaction_date=self.created_at,
-        )
+        if moved:
+            if old_lead_id == self.lead_id and old_created_at is not None:
+                self._retime_lead(old_created_at)
+            else:
+                self._touch_lead()
+            if old_lead_id is not None and old_lead_id != self.lead_id:
+                Lead.all_objects.filter(pk=old_lead_id).update(**self.lead_time_bounds())
 
         if is_new:
-            AuditEvent.log(
-                event_type="interaction.logged",
-                model_name="Interaction",
-                object_id=str(self.id),
-                action="create",
-                after={
-                    "lead": self.lead.business_name,
-                    "type": self.interaction_type,
-                    "summary": self.summary[:100],
-                    "duration": self.duration_minutes,
-                },
-            )
+            AuditEvent.log(**self.logged_audit_fields())
+
+        self._snapshot_tracked_fields(update_fields)
+
+    def logged_audit_fields(self):
+        """AuditEvent.log()/build() arguments for the interaction.logged event."""
+        # Only use the lead if it is already loaded; a fetch just for the
+        # audit payload would cost a query per interaction.
+        lead_name = self.lead.business_name if Interaction.lead.is_cached(self) else None
+        return {
+            "event_type": "interaction.logged",
+            "model_name": "Interaction",
+            "object_id": str(self.id),
+            "action": "create",
+            "after": {
+                "lead": lead_name,
+                "lead_id": str(self.lead_id),
+                "type": self.interaction_type,
+                "summary": self.summary[:100],
+                "duration": self.duration_minutes,
+            },
+        }
+
+    def _touch_lead(self):
+        """
+        Move the lead's last/first interaction times out to this interaction,
+        in one UPDATE that only writes when one of them actually moves.
+        """
+        at = models.Value(self.created_at)
+        Lead.objects.filter(pk=self.lead_id).filter(
+            models.Q(last_interaction_date__isnull=True)
+            | models.Q(last_interaction_date__lt=self.created_at)
+            | models.Q(first_interaction_at__isnull=True)
+            | models.Q(first_interaction_at__gt=self.created_at)
+        ).update(
+            last_interaction_date=Coalesce(Greatest("last_interaction_date", at), at),
+            first_interaction_at=Coalesce(Least("first_interaction_at", at), at),
+        )
+
+    def _retime_lead(self, old_created_at):
+        """
+        Update the lead after this interaction's time changed. If the old
+        time was one of the lead's bounds, it may move inwards, so both are
+        recomputed from the table; otherwise they can only move outwards.
+        """
+        recomputed = (
+            Lead.all_objects.filter(pk=self.lead_id)
+            .filter(models.Q(last_interaction_date=old_created_at) | models.Q(first_interaction_at=old_created_at))
+            .update(**self.lead_time_bounds())
+        )
+        if not recomputed:
+            self._touch_lead()
+
+    @staticmethod
+    def lead_time_bounds():
+        """Lead.update() arguments recomputing both interaction times from the table."""
+        interactions = Interaction.all_objects.filter(lead=models.OuterRef("pk")).values("created_at")
+        return {
+            "last_interaction_date": models.Subquery(interactions.order_by("-created_at")[:1]),
+            "first_interaction_at": models.Subquery(interactions.order_by("created_at")[:1]),
+        }
@@ -0,0 +1,65 @@
+"""REST API serializers for the CRM models."""
+from rest_framework import serializers
+
+from apps.core.api import SparseFieldsMixin
+from .models import Interaction, Lead, PipelineStage
+
+
+class PipelineStageSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = PipelineStage
+        fields = ["id", "name", "order", "is_won", "is_lost"]
+
+
+class LeadSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    stage_name = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Lead
+        fields = [
+            "id",
+            "business_name",
+            "contact_person",
+            "phone",
+            "email",
+            "industry",
+            "pain_point",
+            "source",
+            "stage",
+            "stage_name",
+            "value_estimate",
+            "first_contact_date",
+            "last_interaction_date",
+            "first_interaction_at",
+            "next_action",
+            "next_action_due",
+            "notes",
+            "tags",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [
+            "first_contact_date",
+            "last_interaction_date",
+            "first_interaction_at",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class InteractionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    lead = serializers.PrimaryKeyRelatedField(queryset=Lead.objects.all())
+
+    class Meta:
+        model = Interaction
+        fields = [
+            "id",
+            "lead",
+            "interaction_type",
+            "summary",
+            "outcome",
+            "duration_minutes",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["created_at", "updated_at"]
@@ -0,0 +1,304 @@
+"""Bulk CRM operations."""
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.audit.buffer import buffered_audit
+from apps.audit.models import AuditEvent
+from .models import Interaction, Lead, PipelineStage
+from .signals import interactions_logged, leads_imported
+
+LEAD_IMPORT_FIELDS = (
+    "business_name",
+    "contact_person",
+    "phone",
+    "email",
+    "industry",
+    "pain_point",
+    "source",
+    "value_estimate",
+    "next_action",
+    "next_action_due",
+    "notes",
+    "tags",
+)
+
+INTERACTION_IMPORT_FIELDS = (
+    "interaction_type",
+    "summary",
+    "outcome",
+    "duration_minutes",
+)
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    errors: list = field(default_factory=list)
+    error_count: int = 0
+
+    def add_error(self, line, message, limit):
+        self.error_count += 1
+        if len(self.errors) < limit:
+            self.errors.append((line, message))
+
+
+def read_rows(fileobj, fmt):
+    """
+    Yield (line_number, dict) from a CSV or JSONL file object, one row at a time.
+
+    A malformed JSONL line is yielded as its JSONDecodeError so the caller can
+    report it against the line number and carry on.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(fileobj)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    if fmt == "jsonl":
+        for line_number, line in enumerate(fileobj, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_number, exc
+                continue
+            yield line_number, row
+        return
+    raise ValueError(f"Unknown format: {fmt}")
+
+
+def _parse_datetime(value, field_name):
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(str(value))
+    except ValueError:
+        # Well formed but impossible, e.g. 2026-02-30.
+        parsed = None
+    if parsed is None:
+        raise ValidationError({field_name: f"Invalid datetime: {value!r}"})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _lead_from_row(row, stages, default_stage):
+    if not isinstance(row, dict):
+        raise ValidationError(f"Invalid row: {row}")
+
+    stage_name = (row.get("stage") or "").strip()
+    stage = stages.get(stage_name.lower()) if stage_name else default_stage
+    if stage is None:
+        raise ValidationError({"stage": f"Unknown pipeline stage: {stage_name or '(blank)'}"})
+
+    data = {}
+    for name in LEAD_IMPORT_FIELDS:
+        value = row.get(name)
+        if value is None or value == "":
+            continue
+        data[name] = value.strip() if isinstance(value, str) else value
+    data["next_action_due"] = _parse_datetime(data.get("next_action_due"), "next_action_due")
+
+    lead = Lead(stage=stage, **data)
+    # Uniqueness checks would cost a query per row; Lead has no unique fields.
+    lead.full_clean(exclude=["stage"], validate_unique=False, validate_constraints=False)
+    return lead
+
+
+def _flush(chunk, webhooks):
+    with transaction.atomic(), buffered_audit(max_size=len(chunk)):
+        Lead.objects.bulk_create(chunk)
+        for lead in chunk:
+            AuditEvent.log(**lead.created_audit_fields())
+        leads_imported.send(sender=Lead, leads=chunk, webhooks=webhooks)
+
+
+def import_leads(
+    rows,
+    chunk_size=5000,
+    default_stage=None,
+    webhooks=True,
+    dry_run=False,
+    max_errors=100,
+):
+    """
+    Validate and insert leads from an iterable of (line_number, dict) rows.
+
+    Leads are written with bulk_create in chunks of `chunk_size`, each chunk in
+    its own transaction together with its lead.created audit events and (via
+    the leads_imported signal) its outbox webhooks. Memory use is bounded by
+    the chunk size, so arbitrarily large files can be streamed through.
+    Raises ValueError if `default_stage` names no stage.
+    """
+    stages = PipelineStage.cached_by_name()
+    if isinstance(default_stage, str):
+        name = default_stage
+        default_stage = stages.get(name.lower())
+        if default_stage is None:
+            raise ValueError(f"Unknown default stage: {name}")
+
+    result = ImportResult()
+    chunk = []
+    for line_number, row in rows:
+        result.rows += 1
+        if isinstance(row, Exception):
+            result.add_error(line_number, str(row), max_errors)
+            continue
+        try:
+            lead = _lead_from_row(row, stages, default_stage)
+        except ValidationError as exc:
+            result.add_error(line_number, "; ".join(exc.messages), max_errors)
+            continue
+        chunk.append(lead)
+        if len(chunk) >= chunk_size:
+            if not dry_run:
+                _flush(chunk, webhooks)
+            result.created += len(chunk)
+            chunk = []
+    if chunk:
+        if not dry_run:
+            _flush(chunk, webhooks)
+        result.created += len(chunk)
+    return result
+
+
+def _interaction_from_row(row):
+    """Unsaved Interaction and its `created_at` (None for "now") from a row."""
+    if not isinstance(row, dict):
+        raise ValidationError(f"Invalid row: {row}")
+
+    lead_id = str(row.get("lead_id") or "").strip()
+    if not lead_id:
+        raise ValidationError({"lead_id": "Missing lead_id"})
+
+    data = {}
+    for name in INTERACTION_IMPORT_FIELDS:
+        value = row.get(name)
+        if value is None or value == "":
+            continue
+        data[name] = value.strip() if isinstance(value, str) else value
+
+    interaction = Interaction(lead_id=Interaction._meta.get_field("lead").to_python(lead_id), **data)
+    # The lead is checked per chunk (see _flush_interactions), not per row.
+    interaction.full_clean(exclude=["lead"], validate_unique=False, validate_constraints=False)
+    return interaction, _parse_datetime(row.get("created_at"), "created_at")
+
+
+def _write_interactions(rows):
+    interactions = [interaction for interaction, _ in rows]
+    with transaction.atomic(), buffered_audit(max_size=len(interactions)):
+        Interaction.objects.bulk_create(interactions)
+        # created_at is auto_now_add, so bulk_create stamps it with the
+        # current time; rows that carry their own time are back-dated with
+        # one more statement.
+        backdated = []
+        for interaction, created_at in rows:
+            if created_at is not None:
+                interaction.created_at = created_at
+                backdated.append(interaction)
+        if backdated:
+            Interaction.objects.bulk_update(backdated, ["created_at"])
+        lead_ids = {interaction.lead_id for interaction in interactions}
+        Lead.all_objects.filter(pk__in=lead_ids).update(**Interaction.lead_time_bounds())
+        for interaction in interactions:
+            AuditEvent.log(**interaction.logged_audit_fields())
+        interactions_logged.send(sender=Interaction, interactions=interactions)
+
+
+def _flush_interactions(chunk, result, dry_run, max_errors):
+    lead_ids = {interaction.lead_id for _, interaction, _ in chunk}
+    known = set(Lead.objects.filter(pk__in=lead_ids).values_list("pk", flat=True))
+    rows = []
+    for line_number, interaction, created_at in chunk:
+        if interaction.lead_id in known:
+            rows.append((interaction, created_at))
+        else:
+            result.add_error(line_number, f"Unknown lead: {interaction.lead_id}", max_errors)
+    if rows and not dry_run:
+        _write_interactions(rows)
+    result.created += len(rows)
+
+
+def bulk_log_interactions(rows, chunk_size=5000, dry_run=False, max_errors=100):
+    """
+    Validate and insert interactions from an iterable of (line_number, dict)
+    rows, such as synced call logs or chat exports.
+
+    Each chunk of `chunk_size` rows costs a fixed number of statements
+    whatever its size: a lead lookup, the bulk insert, one UPDATE
+    recomputing the affected leads' first/last interaction times, and the
+    interaction.logged audit events in one insert. A row may carry its own
+    `created_at`; without one the interaction is logged as happening now.
+    """
+    result = ImportResult()
+    chunk = []
+    for line_number, row in rows:
+        result.rows += 1
+        if isinstance(row, Exception):
+            result.add_error(line_number, str(row), max_errors)
+            continue
+        try:
+            interaction, created_at = _interaction_from_row(row)
+        except ValidationError as exc:
+            result.add_error(line_number, "; ".join(exc.messages), max_errors)
+            continue
+        chunk.append((line_number, interaction, created_at))
+        if len(chunk) >= chunk_size:
+            _flush_interactions(chunk, result, dry_run, max_errors)
+            chunk = []
+    if chunk:
+        _flush_interactions(chunk, result, dry_run, max_errors)
+    return result
+
+
+def _first_interaction_subquery():
+    # All interactions, soft-deleted included, as speed-to-lead has always counted them.
+    return Interaction.lead_time_bounds()["first_interaction_at"]
+
+
+def first_interaction_drift():
+    """Leads whose first_interaction_at differs from their earliest interaction."""
+    leads = Lead.all_objects.annotate(actual_first_interaction=_first_interaction_subquery())
+    return leads.filter(
+        Q(first_interaction_at__isnull=True, actual_first_interaction__isnull=False)
+        | Q(first_interaction_at__isnull=False, actual_first_interaction__isnull=True)
+        | (
+            Q(first_interaction_at__isnull=False, actual_first_interaction__isnull=False)
+            & ~Q(first_interaction_at=F("actual_first_interaction"))
+        )
+    )
+
+
+def repair_first_interaction_at(leads):
+    """Recompute first_interaction_at for a Lead queryset in one UPDATE."""
+    return leads.update(first_interaction_at=_first_interaction_subquery())
+
+
+def backfill_first_interaction_at(batch_size=5000):
+    """
+    Recompute first_interaction_at for every lead, `batch_size` leads per
+    UPDATE so each statement (and lock) stays short. Returns the lead count.
+    """
+    updated = 0
+    last_pk = None
+    while True:
+        batch = Lead.all_objects.order_by("pk")
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        pks = list(batch.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return updated
+        updated += repair_first_interaction_at(Lead.all_objects.filter(pk__in=pks))
+        last_pk = pks[-1]
@@ -0,0 +1,10 @@
+"""Signals sent by CRM bulk operations, which bypass Model.save()."""
+from django.dispatch import Signal
+
+# Sent once per committed chunk of imported leads with `leads` (a list of
+# saved Lead instances) and `webhooks` (False when the import opted out).
+leads_imported = Signal()
+
+# Sent once per committed chunk of bulk-logged interactions with
+# `interactions` (a list of saved Interaction instances).
+interactions_logged = Signal()
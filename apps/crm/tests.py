@@ -0,0 +1,616 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.audit.buffer import buffered_audit
+from apps.audit.models import AuditEvent
+from apps.automations.models import WebhookOutbox
+from apps.core.exports import BLOCK_SIZE, to_blocks
+from apps.core.models import AppSetting
+from apps.core.utils import encode_cursor
+from apps.crm.exports import stream_export
+from apps.crm.models import Interaction, Lead, PipelineStage
+from apps.crm.services import bulk_log_interactions, first_interaction_drift, import_leads, read_rows
+
+
+@override_settings(GDC_AUTOMATIONS_ENABLED=False)
+class LeadChangeTrackingTests(TestCase):
+    def setUp(self):
+        self.cold = PipelineStage.objects.create(name="Cold", order=0)
+        self.warm = PipelineStage.objects.create(name="Warm", order=1)
+
+    def _make_lead(self, **kwargs):
+        return Lead.objects.create(
+            business_name="Acme Ltd",
+            contact_person="Jane Doe",
+            phone="0700000000",
+            pain_point="Needs a better process",
+            stage=self.cold,
+            **kwargs,
+        )
+
+    def test_create_logs_lead_created(self):
+        lead = self._make_lead()
+
+        event = AuditEvent.objects.get(event_type="lead.created")
+        self.assertEqual(event.object_id, str(lead.id))
+        self.assertEqual(event.after_data["stage"], "Cold")
+
+    def test_update_without_stage_change_is_a_single_query(self):
+        lead = Lead.objects.get(pk=self._make_lead().pk)
+        lead.next_action = "Send proposal"
+
+        with self.assertNumQueries(1):
+            lead.save()
+
+        self.assertFalse(AuditEvent.objects.filter(event_type="lead.stage_changed").exists())
+
+    def test_stage_change_is_detected_in_memory(self):
+        lead = Lead.objects.get(pk=self._make_lead().pk)
+        lead.stage = self.warm
+
+        # UPDATE, old stage name lookup, audit INSERT.
+        with self.assertNumQueries(3):
+            lead.save()
+
+        event = AuditEvent.objects.get(event_type="lead.stage_changed")
+        self.assertEqual(event.before_data, {"stage": "Cold"})
+        self.assertEqual(event.after_data, {"stage": "Warm"})
+
+        # The snapshot moves with the save, so saving again is not a change.
+        with self.assertNumQueries(1):
+            lead.save()
+        self.assertEqual(AuditEvent.objects.filter(event_type="lead.stage_changed").count(), 1)
+
+    def test_created_instance_tracks_changes_without_reload(self):
+        lead = self._make_lead()
+        lead.stage = self.warm
+        lead.save()
+
+        self.assertEqual(AuditEvent.objects.filter(event_type="lead.stage_changed").count(), 1)
+
+    def test_deferred_stage_falls_back_to_database(self):
+        lead = Lead.objects.only("business_name").get(pk=self._make_lead().pk)
+        lead.stage_id = self.warm.pk
+        lead.save()
+
+        event = AuditEvent.objects.get(event_type="lead.stage_changed")
+        self.assertEqual(event.before_data, {"stage": "Cold"})
+
+    def test_update_fields_without_stage_skips_the_diff(self):
+        lead = Lead.objects.get(pk=self._make_lead().pk)
+        lead.notes = "Called twice"
+
+        with self.assertNumQueries(1):
+            lead.save(update_fields=["notes", "updated_at"])
+
+
+@override_settings(GDC_AUTOMATIONS_ENABLED=True)
+class ImportLeadsTests(TestCase):
+    CSV = (
+        "business_name,contact_person,phone,pain_point,stage,value_estimate,next_action_due\n"
+        "Acme Ltd,Jane Doe,0700000000,Manual invoicing,cold,1500,2026-03-01T09:00:00\n"
+        "Beta Co,John Roe,0711111111,Slow quotes,Warm,,\n"
+        "Gamma,Ann Poe,0722222222,Lost orders,Unknown,,\n"
+        ",No Name,0733333333,Missing business,Cold,,\n"
+        "Delta,Dee,0744444444,No stage given,,abc,\n"
+    )
+
+    def setUp(self):
+        PipelineStage.objects.create(name="Cold", order=0)
+        PipelineStage.objects.create(name="Warm", order=1)
+
+    def test_valid_rows_are_bulk_inserted_with_audit_and_outbox(self):
+        result = import_leads(read_rows(io.StringIO(self.CSV), "csv"), chunk_size=10)
+
+        self.assertEqual(result.rows, 5)
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.error_count, 3)
+        self.assertEqual([line for line, _ in result.errors], [4, 5, 6])
+        acme = Lead.objects.get(business_name="Acme Ltd")
+        self.assertEqual(acme.stage.name, "Cold")
+        self.assertEqual(float(acme.value_estimate), 1500.0)
+        self.assertIsNotNone(acme.next_action_due)
+        self.assertEqual(AuditEvent.objects.filter(event_type="lead.created").count(), 2)
+        self.assertEqual(
+            set(WebhookOutbox.objects.values_list("lead_id", flat=True)),
+            set(Lead.objects.values_list("id", flat=True)),
+        )
+
+    def test_query_count_does_not_grow_with_rows(self):
+        rows = [
+            (i, {"business_name": f"Lead {i}", "contact_person": "X", "phone": "07", "pain_point": "P", "stage": "Cold"})
+            for i in range(50)
+        ]
+        # Stage map + per chunk: SAVEPOINT, leads, audit events, outbox, RELEASE.
+        with self.assertNumQueries(1 + 2 * 5):
+            result = import_leads(rows, chunk_size=25)
+        self.assertEqual(result.created, 50)
+
+    def test_jsonl_rows_and_default_stage(self):
+        data = '{"business_name": "Acme", "contact_person": "J", "phone": "07", "pain_point": "P"}\n{bad json\n'
+        result = import_leads(read_rows(io.StringIO(data), "jsonl"), default_stage="Warm", webhooks=False)
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.error_count, 1)
+        self.assertEqual(Lead.objects.get().stage.name, "Warm")
+        self.assertFalse(WebhookOutbox.objects.exists())
+
+    def test_impossible_date_is_a_row_error(self):
+        data = (
+            "business_name,contact_person,phone,pain_point,stage,next_action_due\n"
+            "Acme,J,07,P,Cold,2026-13-45T00:00:00\n"
+            "Beta,J,07,P,Cold,2026-02-30T00:00:00\n"
+            "Gamma,J,07,P,Cold,2026-03-01T09:00:00\n"
+        )
+        result = import_leads(read_rows(io.StringIO(data), "csv"), chunk_size=1, webhooks=False)
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual([line for line, _ in result.errors], [2, 3])
+        self.assertIn("Invalid datetime", result.errors[0][1])
+
+    def test_unknown_default_stage_rejects_the_run(self):
+        with self.assertRaisesMessage(ValueError, "Unknown default stage: Hot"):
+            import_leads(read_rows(io.StringIO(self.CSV), "csv"), default_stage="Hot")
+
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as fileobj:
+            fileobj.write(self.CSV)
+        self.addCleanup(os.remove, fileobj.name)
+        with self.assertRaisesMessage(CommandError, "Unknown default stage: Hot"):
+            call_command("import_leads", fileobj.name, default_stage="Hot", stdout=io.StringIO())
+        self.assertFalse(Lead.objects.exists())
+
+    def test_dry_run_writes_nothing(self):
+        result = import_leads(read_rows(io.StringIO(self.CSV), "csv"), dry_run=True)
+
+        self.assertEqual(result.created, 2)
+        self.assertFalse(Lead.objects.exists())
+
+
+@override_settings(GDC_AUTOMATIONS_ENABLED=False)
+class FirstInteractionTests(TestCase):
+    def setUp(self):
+        self.stage = PipelineStage.objects.create(name="Cold", order=0)
+        self.lead = Lead.objects.create(
+            business_name="Acme Ltd",
+            contact_person="Jane Doe",
+            phone="0700000000",
+            pain_point="Needs a better process",
+            stage=self.stage,
+        )
+
+    def _log(self):
+        return Interaction.objects.create(lead=self.lead, interaction_type="call", summary="Call")
+
+    def test_save_keeps_the_earliest_interaction(self):
+        first = self._log()
+        self._log()
+
+        self.lead.refresh_from_db()
+        self.assertEqual(self.lead.first_interaction_at, first.created_at)
+        self.assertFalse(first_interaction_drift().exists())
+
+    def test_check_detects_and_repairs_drift(self):
+        interaction = self._log()
+        earlier = interaction.created_at - timedelta(days=3)
+        Interaction.objects.filter(pk=interaction.pk).update(created_at=earlier)
+        other = Lead.objects.create(
+            business_name="Beta", contact_person="B", phone="07", pain_point="P", stage=self.stage
+        )
+        Lead.objects.filter(pk=other.pk).update(first_interaction_at=earlier)
+
+        out = io.StringIO()
+        call_command("check_first_interaction", stdout=out)
+        self.assertIn("2 leads drifted", out.getvalue())
+
+        call_command("check_first_interaction", repair=True, stdout=io.StringIO())
+        self.assertFalse(first_interaction_drift().exists())
+        self.assertEqual(Lead.objects.get(pk=self.lead.pk).first_interaction_at, earlier)
+        self.assertIsNone(Lead.objects.get(pk=other.pk).first_interaction_at)
+
+    def test_backfill_in_batches(self):
+        interaction = self._log()
+        for i in range(4):
+            Lead.objects.create(business_name=f"L{i}", contact_person="X", phone="07", pain_point="P", stage=self.stage)
+        Lead.objects.update(first_interaction_at=None)
+
+        call_command("backfill_first_interaction", batch_size=2, stdout=io.StringIO())
+
+        self.assertEqual(Lead.objects.get(pk=self.lead.pk).first_interaction_at, interaction.created_at)
+        self.assertFalse(first_interaction_drift().exists())
+
+
+@override_settings(GDC_AUTOMATIONS_ENABLED=False)
+class InteractionSaveTests(TestCase):
+    def setUp(self):
+        self.stage = PipelineStage.objects.create(name="Cold", order=0)
+        self.lead = Lead.objects.create(
+            business_name="Acme Ltd",
+            contact_person="Jane Doe",
+            phone="0700000000",
+            pain_point="Needs a better process",
+            stage=self.stage,
+        )
+
+    def test_create_by_lead_id_does_not_fetch_the_lead(self):
+        # INSERT interaction, conditional lead UPDATE, audit INSERT.
+        with self.assertNumQueries(3):
+            interaction = Interaction.objects.create(lead_id=self.lead.pk, interaction_type="call", summary="Call")
+
+        event = AuditEvent.objects.get(event_type="interaction.logged")
+        self.assertEqual(event.after_data["lead_id"], str(self.lead.pk))
+        self.lead.refresh_from_db()
+        self.assertEqual(self.lead.last_interaction_date, interaction.created_at)
+        self.assertEqual(self.lead.first_interaction_at, interaction.created_at)
+
+    def test_buffered_create_is_one_statement_per_interaction_plus_the_lead(self):
+        with self.assertNumQueries(2 * 5 + 1), buffered_audit():
+            for _ in range(5):
+                Interaction.objects.create(lead_id=self.lead.pk, interaction_type="call", summary="Call")
+
+    def test_editing_text_does_not_touch_the_lead(self):
+        interaction = Interaction.objects.get(
+            pk=Interaction.objects.create(lead=self.lead, interaction_type="call", summary="Call").pk
+        )
+        interaction.summary = "Call, they want a quote"
+
+        with self.assertNumQueries(1):
+            interaction.save()
+
+    def test_older_timestamp_never_moves_last_interaction_backwards(self):
+        latest = Interaction.objects.create(lead=self.lead, interaction_type="call", summary="Call")
+        older = Interaction.objects.get(
+            pk=Interaction.objects.create(lead=self.lead, interaction_type="email", summary="Email").pk
+        )
+        older.created_at = latest.created_at - timedelta(days=2)
+        older.save()
+
+        self.lead.refresh_from_db()
+        self.assertGreaterEqual(self.lead.last_interaction_date, latest.created_at)
+        self.assertEqual(self.lead.first_interaction_at, older.created_at)
+
+    def _interactions(self, *days_ago):
+        now = timezone.now()
+        interactions = []
+        for days in days_ago:
+            interaction = Interaction.objects.create(lead=self.lead, interaction_type="call", summary="Call")
+            interaction = Interaction.objects.get(pk=interaction.pk)
+            interaction.created_at = now - timedelta(days=days)
+            interaction.save()
+            interactions.append(interaction)
+        return interactions
+
+    def test_moving_the_latest_earlier_pulls_last_interaction_back(self):
+        earliest, latest = self._interactions(10, 1)
+        latest.created_at = earliest.created_at + timedelta(days=2)
+        latest.save()
+
+        self.lead.refresh_from_db()
+        self.assertEqual(self.lead.last_interaction_date, latest.created_at)
+        self.assertEqual(self.lead.first_interaction_at, earliest.created_at)
+
+    def test_moving_the_earliest_later_pushes_first_interaction_forward(self):
+        earliest, latest = self._interactions(10, 1)
+        earliest.created_at = latest.created_at + timedelta(hours=1)
+        earliest.save()
+
+        self.lead.refresh_from_db()
+        self.assertEqual(self.lead.first_interaction_at, latest.created_at)
+        self.assertEqual(self.lead.last_interaction_date, earliest.created_at)
+
+    def test_moving_to_another_lead_recomputes_the_old_one(self):
+        other = Lead.objects.create(
+            business_name="Beta", contact_person="B", phone="07", pain_point="P", stage=self.stage
+        )
+        interaction = Interaction.objects.get(
+            pk=Interaction.objects.create(lead=self.lead, interaction_type="call", summary="Call").pk
+        )
+        interaction.lead = other
+        interaction.save()
+
+        self.lead.refresh_from_db()
+        other.refresh_from_db()
+        self.assertIsNone(self.lead.last_interaction_date)
+        self.assertIsNone(self.lead.first_interaction_at)
+        self.assertEqual(other.first_interaction_at, interaction.created_at)
+
+
+@override_settings(GDC_AUTOMATIONS_ENABLED=False)
+class BulkLogInteractionsTests(TestCase):
+    def setUp(self):
+        stage = PipelineStage.objects.create(name="Cold", order=0)
+        self.leads = [
+            Lead.objects.create(business_name=f"Lead {i}", contact_person="X", phone="07", pain_point="P", stage=stage)
+            for i in range(3)
+        ]
+
+    def _rows(self, count):
+        return [
+            (i, {"lead_id": str(self.leads[i % 3].pk), "interaction_type": "call", "summary": f"Call {i}"})
+            for i in range(count)
+        ]
+
+    def test_rows_are_logged_with_lead_times_and_audit(self):
+        lead = self.leads[0]
+        data = (
+            "lead_id,interaction_type,summary,duration_minutes,created_at\n"
+            f"{lead.pk},call,Intro call,15,2026-01-05T09:00:00\n"
+            f"{lead.pk},whatsapp,Sent brochure,,2026-01-07T10:30:00\n"
+            "not-a-uuid,call,Bad lead,,\n"
+            f"{self.leads[1].pk},fax,Bad type,,\n"
+        )
+        result = bulk_log_interactions(read_rows(io.StringIO(data), "csv"))
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual([line for line, _ in result.errors], [4, 5])
+        lead.refresh_from_db()
+        times = sorted(Interaction.objects.filter(lead=lead).values_list("created_at", flat=True))
+        self.assertEqual(times[0].date().isoformat(), "2026-01-05")
+        self.assertEqual(lead.first_interaction_at, times[0])
+        self.assertEqual(lead.last_interaction_date, times[1])
+        self.assertEqual(Interaction.objects.get(summary="Intro call").duration_minutes, 15)
+        self.assertEqual(AuditEvent.objects.filter(event_type="interaction.logged").count(), 2)
+
+    def test_impossible_created_at_is_a_row_error(self):
+        rows = self._rows(2)
+        rows[0][1]["created_at"] = "2026-02-30T00:00:00"
+
+        result = bulk_log_interactions(rows)
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual([line for line, _ in result.errors], [0])
+        self.assertIn("Invalid datetime", result.errors[0][1])
+
+    def test_unknown_lead_is_reported(self):
+        Lead.objects.filter(pk=self.leads[2].pk).update(is_deleted=True)
+        result = bulk_log_interactions(self._rows(3))
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual([line for line, _ in result.errors], [2])
+
+    def test_query_count_does_not_grow_with_rows(self):
+        # Per chunk: lead lookup, SAVEPOINT, insert, lead UPDATE, audit events, RELEASE.
+        with self.assertNumQueries(2 * 6):
+            result = bulk_log_interactions(self._rows(50), chunk_size=25)
+        self.assertEqual(result.created, 50)
+        self.assertEqual(Interaction.objects.count(), 50)
+
+    def test_command_dry_run_writes_nothing(self):
+        path = self._write_jsonl(self._rows(4))
+        out = io.StringIO()
+        call_command("import_interactions", path, dry_run=True, stdout=out)
+
+        self.assertIn("Validated 4 of 4 rows", out.getvalue())
+        self.assertFalse(Interaction.objects.exists())
+
+    def _write_jsonl(self, rows):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as fileobj:
+            for _, row in rows:
+                fileobj.write(json.dumps(row) + "\n")
+        self.addCleanup(os.unlink, fileobj.name)
+        return fileobj.name
+
+
+@override_settings(GDC_AUTOMATIONS_ENABLED=False)
+class CRMApiTests(TestCase):
+    def setUp(self):
+        self.stage = PipelineStage.objects.create(name="Cold", order=0)
+        self.user = get_user_model().objects.create_superuser("owner", "owner@example.com", "pw")
+        self.client.force_login(self.user)
+        for i in range(30):
+            lead = Lead.objects.create(
+                business_name=f"Lead {i:02d}", contact_person="X", phone="07", pain_point="P", stage=self.stage
+            )
+            Interaction.objects.create(lead=lead, interaction_type="call", summary="Call")
+
+    def _queries(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        for name in ("api-lead-list", "api-interaction-list"):
+            url = reverse(name)
+            self._queries(url, {"limit": 1})  # Loads the stage cache.
+            self.assertEqual(self._queries(url, {"limit": 2}), self._queries(url, {"limit": 30}))
+
+    def test_cursor_walks_every_lead_once_newest_first(self):
+        names, url = [], reverse("api-lead-list") + "?limit=7"
+        while url:
+            page = self.client.get(url).json()
+            names.extend(row["business_name"] for row in page["results"])
+            url = page["next"]
+
+        self.assertEqual(names, [f"Lead {i:02d}" for i in reversed(range(30))])
+
+    def test_tampered_cursor_is_a_400(self):
+        tampered = [encode_cursor(values) for values in (["not-a-date", "zzz"], [[1], "x"], [{"a": 1}, "x"])]
+        for cursor in ["not-a-cursor", *tampered]:
+            response = self.client.get(reverse("api-lead-list"), {"cursor": cursor})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {"cursor": "Invalid cursor."})
+
+    def test_sparse_fields(self):
+        page = self.client.get(reverse("api-lead-list"), {"fields": "id,stage_name", "limit": 1}).json()
+        self.assertEqual(page["results"], [{"id": page["results"][0]["id"], "stage_name": "Cold"}])
+
+        response = self.client.get(reverse("api-lead-list"), {"fields": "id,secret"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_conditional_get(self):
+        url = reverse("api-lead-list")
+        etag = self.client.get(url)["ETag"]
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Lead.objects.filter(business_name="Lead 29").update(tags="vip")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_create_interaction_and_soft_delete_lead(self):
+        lead = Lead.objects.get(business_name="Lead 00")
+        response = self.client.post(
+            reverse("api-interaction-list"),
+            {"lead": str(lead.pk), "interaction_type": "email", "summary": "Sent proposal"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(AuditEvent.objects.filter(event_type="interaction.logged").count(), 31)
+
+        response = self.client.delete(reverse("api-lead-detail", args=[lead.pk]))
+        self.assertEqual(response.status_code, 204)
+        self.assertTrue(Lead.all_objects.get(pk=lead.pk).is_deleted)
+
+    def test_requires_lead_access_and_owner_for_stage_writes(self):
+        sales = get_user_model().objects.create_user("sales", "sales@example.com", "pw")
+        sales.groups.add(Group.objects.get_or_create(name="Sales")[0])
+        self.client.force_login(sales)
+
+        self.assertEqual(self.client.get(reverse("api-stage-list")).status_code, 200)
+        response = self.client.post(reverse("api-stage-list"), {"name": "Warm", "order": 1})
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_login(get_user_model().objects.create_user("ops", "ops@example.com", "pw"))
+        self.assertEqual(self.client.get(reverse("api-lead-list")).status_code, 403)
+
+
+@override_settings(GDC_AUTOMATIONS_ENABLED=False)
+class ExportTests(TestCase):
+    def setUp(self):
+        stage = PipelineStage.objects.create(name="Cold", order=0)
+        for i in range(5):
+            lead = Lead.objects.create(
+                business_name=f"Lead {i}", contact_person="X", phone="07", pain_point="P", stage=stage
+            )
+            Interaction.objects.create(lead=lead, interaction_type="call", summary=f"Call, {i}")
+
+    def test_leads_csv_has_stage_names_in_one_query(self):
+        with self.assertNumQueries(1):
+            data = b"".join(stream_export("leads", fmt="csv")).decode("utf-8")
+
+        rows = list(csv.DictReader(io.StringIO(data)))
+        self.assertEqual([row["business_name"] for row in rows], [f"Lead {i}" for i in range(5)])
+        self.assertEqual({row["stage"] for row in rows}, {"Cold"})
+
+    def test_gzip_stream_matches_plain_output(self):
+        plain = b"".join(stream_export("audit", fmt="ndjson"))
+        compressed = b"".join(stream_export("audit", fmt="ndjson", compress=True))
+
+        self.assertEqual(gzip.decompress(compressed), plain)
+        events = [json.loads(line) for line in plain.splitlines()]
+        self.assertEqual(len(events), 10)
+        self.assertEqual(events[0]["event_type"], "lead.created")
+
+    def test_blocks_are_bounded(self):
+        blocks = list(to_blocks(("x" * 1000 + "\n" for _ in range(500))))
+        self.assertGreater(len(blocks), 1)
+        self.assertLess(max(len(block) for block in blocks), BLOCK_SIZE + 1002)
+
+    def test_endpoint_streams_for_owners_only(self):
+        url = reverse("crm-export", kwargs={"dataset": "interactions", "fmt": "csv", "gz": ".gz"})
+        self.assertEqual(url, "/crm/export/interactions.csv.gz")
+        owner = get_user_model().objects.create_superuser("owner", "owner@example.com", "pw")
+        self.client.force_login(owner)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("interactions-", response["Content-Disposition"])
+        lines = gzip.decompress(b"".join(response.streaming_content)).decode("utf-8").splitlines()
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(self.client.get("/crm/export/clients.csv").status_code, 404)
+        for since in ("yesterday", "2026-13-45T00:00:00"):
+            self.assertEqual(self.client.get(url, {"since": since}).status_code, 400)
+
+        self.client.force_login(get_user_model().objects.create_user("sales", "sales@example.com", "pw"))
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_command_writes_a_filtered_file(self):
+        Lead.objects.filter(business_name="Lead 0").update(created_at=timezone.now() - timedelta(days=30))
+        with tempfile.NamedTemporaryFile(suffix=".ndjson.gz", delete=False) as fileobj:
+            self.addCleanup(os.unlink, fileobj.name)
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+
+        call_command(
+            "export_data", "leads", format="ndjson", gzip=True, output=fileobj.name, since=since, stderr=io.StringIO()
+        )
+
+        with gzip.open(fileobj.name, "rt") as exported:
+            names = [json.loads(line)["business_name"] for line in exported]
+        self.assertEqual(names, [f"Lead {i}" for i in range(1, 5)])
+
+        with self.assertRaisesMessage(CommandError, "Invalid datetime"):
+            call_command("export_data", "leads", output=fileobj.name, since="2026-02-30T00:00:00")
+
+
+@override_settings(GDC_AUTOMATIONS_ENABLED=False)
+class ReferenceCacheTests(TestCase):
+    def setUp(self):
+        self.stage = PipelineStage.objects.create(name="Cold", order=0)
+        self.lead = Lead.objects.create(
+            business_name="Acme Ltd", contact_person="X", phone="07", pain_point="P", stage=self.stage
+        )
+        self.addCleanup(cache.clear)
+
+    def test_stage_names_come_from_the_cache(self):
+        lead = Lead.objects.get(pk=self.lead.pk)
+        PipelineStage.cached_all()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(str(lead), "Acme Ltd - Cold")
+
+        PipelineStage.objects.filter(pk=self.stage.pk).update(name="Stale")
+        self.assertEqual(lead.stage_name, "Cold")
+        self.stage.name = "Cold Outreach"
+        self.stage.save()
+        self.assertEqual(Lead.objects.get(pk=self.lead.pk).stage_name, "Cold Outreach")
+
+    def test_stage_change_audit_reads_the_old_name_from_the_cache(self):
+        warm = PipelineStage.objects.create(name="Warm", order=1)
+        lead = Lead.objects.get(pk=self.lead.pk)
+        PipelineStage.cached_all()
+        lead.stage = warm
+
+        # UPDATE lead, INSERT audit event; no stage lookups.
+        with self.assertNumQueries(2):
+            lead.save()
+        event = AuditEvent.objects.get(event_type="lead.stage_changed")
+        self.assertEqual((event.before_data, event.after_data), ({"stage": "Cold"}, {"stage": "Warm"}))
+
+    def test_app_settings_are_read_once_and_invalidated_on_save(self):
+        setting, _ = AppSetting.objects.update_or_create(key="stale_days", defaults={"value": "7"})
+        self.assertEqual(AppSetting.get_int("stale_days"), 7)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(AppSetting.get_int("stale_days"), 7)
+            self.assertEqual(AppSetting.get_int("missing", 5), 5)
+            self.assertTrue(AppSetting.get_bool("missing", True))
+
+        setting.value = "3"
+        setting.save()
+        self.assertEqual(AppSetting.get_int("stale_days"), 3)
+        setting.delete()
+        self.assertEqual(AppSetting.get_int("stale_days", 9), 9)
+
+    def test_reads_inside_a_rolled_back_write_are_not_kept(self):
+        setting, _ = AppSetting.objects.update_or_create(key="stale_days", defaults={"value": "7"})
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            setting.value = "3"
+            setting.save()
+            self.assertEqual(AppSetting.get_int("stale_days"), 3)
+            raise RuntimeError("boom")
+
+        self.assertEqual(AppSetting.get_int("stale_days"), 7)
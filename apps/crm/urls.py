@@ -1,3 +1,18 @@
-from django.urls import path
+from django.urls import include, path, re_path
+from rest_framework.routers import DefaultRouter
 
-urlpatterns = []
+from .views import ExportView, InteractionViewSet, LeadViewSet, PipelineStageViewSet
+
+router = DefaultRouter()
+router.register("leads", LeadViewSet, basename="api-lead")
+router.register("interactions", InteractionViewSet, basename="api-interaction")
+router.register("stages", PipelineStageViewSet, basename="api-stage")
+
+urlpatterns = [
+    path("api/", include(router.urls)),
+    re_path(
+        r"^export/(?P<dataset>[a-z_]+)\.(?P<fmt>csv|ndjson)(?P<gz>\.gz)?$",
+        ExportView.as_view(),
+        name="crm-export",
+    ),
+]
@@ -0,0 +1,90 @@
+"""REST API for leads, interactions and pipeline stages, and data exports."""
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import mixins, viewsets
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.views import APIView
+
+from apps.core.api import CanExportData, CanViewLeads, ConditionalGetMixin, KeysetPagination
+from .exports import EXPORTS, stream_export
+from .models import Interaction, Lead, PipelineStage
+from .serializers import InteractionSerializer, LeadSerializer, PipelineStageSerializer
+
+
+class CRMViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    permission_classes = [CanViewLeads]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
+
+    def perform_destroy(self, instance):
+        instance.soft_delete()
+
+
+class LeadViewSet(CRMViewSet):
+    # Stage names come from the stage cache (Lead.stage_name), not a join.
+    queryset = Lead.objects.all()
+    serializer_class = LeadSerializer
+
+
+class InteractionViewSet(CRMViewSet):
+    queryset = Interaction.objects.all()
+    serializer_class = InteractionSerializer
+
+
+class PipelineStageViewSet(
+    ConditionalGetMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.CreateModelMixin,
+    mixins.UpdateModelMixin,
+    viewsets.GenericViewSet,
+):
+    # No delete: stages are PROTECTed by the leads in them.
+    queryset = PipelineStage.objects.all()
+    serializer_class = PipelineStageSerializer
+    permission_classes = [CanViewLeads]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("order", "id")
+    owner_only_writes = True
+
+
+def _time_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        # Well formed but impossible, e.g. 2026-02-30.
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: f"Invalid datetime: {value!r}"})
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+class ExportView(APIView):
+    """
+    GET /crm/export/<dataset>.<csv|ndjson>[.gz]?since=...&until=...
+
+    Streams a whole dataset (leads, interactions or audit) in constant
+    memory, gzipped on the fly for the .gz variants.
+    """
+
+    permission_classes = [CanExportData]
+
+    def get(self, request, dataset, fmt, gz=None):
+        if dataset not in EXPORTS:
+            raise NotFound(f"Unknown export: {dataset}")
+        blocks = stream_export(
+            dataset,
+            fmt=fmt,
+            compress=bool(gz),
+            since=_time_param(request, "since"),
+            until=_time_param(request, "until"),
+        )
+        filename = f"{dataset}-{timezone.localdate().isoformat()}.{fmt}{gz or ''}"
+        content_type = "application/gzip" if gz else ("text/csv" if fmt == "csv" else "application/x-ndjson")
+        response = StreamingHttpResponse(blocks, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from .models import DailyMetricRollup
+
+
+@admin.register(DailyMetricRollup)
+class DailyMetricRollupAdmin(admin.ModelAdmin):
+    list_display = ("day", "responded_leads", "follow_ups_due", "stage_movements", "computed_at")
+    readonly_fields = (
+        "day",
+        "responded_leads",
+        "response_seconds",
+        "follow_ups_due",
+        "follow_up_completions",
+        "stage_movements",
+        "computed_at",
+    )
@@ -0,0 +1,412 @@
+"""
+Synthetic data and timed hot paths for benchmarking at scale.
+
+seed_synthetic() bulk-inserts leads with interactions, lead.created and
+lead.stage_changed audit events and automation runs, all drawn from one
+seeded random generator, so the same seed and anchor give the same rows.
+run_benchmarks() times the dashboard services, the home view,
+run_automations and Lead.save under instrument() and returns plain dicts
+for JSON output.
+"""
+from __future__ import annotations
+
+import hashlib
+import random
+import statistics
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Count
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+
+from apps.audit.models import AuditEvent
+from apps.automations.models import AutomationRun
+from apps.automations.testing import StubWebhookServer
+from apps.core.cache import invalidate_version
+from apps.core.instrumentation import instrument
+from apps.crm.models import Interaction, Lead, PipelineStage
+from apps.dashboard.cache import METRICS, invalidate_fragments
+from apps.dashboard.services import (
+    due_today_q,
+    follow_up_completion_rate,
+    get_consistency_metrics,
+    lead_bucket_counts,
+    new_today_q,
+    overdue_q,
+    speed_to_lead_minutes,
+    stage_movement_count,
+    stale_q,
+)
+
+SEED_TAG = "synthetic-seed"
+SEED_EMAIL = "synthetic-seed@example.com"
+SEED_WEBHOOK_URL = "http://synthetic.invalid/webhook/"
+
+INDUSTRIES = ["Retail", "Logistics", "Hospitality", "Healthcare", "Construction", "Education", "Finance"]
+SOURCES = [code for code, _ in Lead.SOURCE_CHOICES]
+INTERACTION_TYPES = [code for code, _ in Interaction.INTERACTION_TYPES]
+# Interactions per lead: (count, weight). Averages about 1.5.
+INTERACTIONS_PER_LEAD = [(0, 30), (1, 25), (2, 20), (3, 12), (4, 8), (5, 5)]
+HISTORY_DAYS = 180
+
+
+def _uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _seeded_lead(rng, number, stages, anchor):
+    created = anchor - timedelta(days=rng.uniform(0, HISTORY_DAYS))
+    age_days = (anchor - created).total_seconds() / 86400
+    count = rng.choices(*zip(*INTERACTIONS_PER_LEAD))[0]
+    touches = sorted(created + timedelta(days=rng.uniform(0, min(age_days, 60))) for _ in range(count))
+    due_roll = rng.random()
+    lead = Lead(
+        id=_uuid(rng),
+        business_name=f"Synthetic {number:07d}",
+        contact_person="Synthetic Contact",
+        phone=f"07{rng.randrange(10**8):08d}",
+        industry=rng.choice(INDUSTRIES),
+        pain_point="Synthetic benchmark lead",
+        source=rng.choice(SOURCES),
+        stage_id=rng.choice(stages).pk,
+        value_estimate=rng.randrange(0, 50000, 500),
+        first_contact_date=created,
+        last_interaction_date=touches[-1] if touches else None,
+        first_interaction_at=touches[0] if touches else None,
+        next_action="Follow up" if due_roll < 0.8 else "",
+        next_action_due=anchor + timedelta(days=rng.uniform(-30, 30)) if due_roll < 0.8 else None,
+        tags=SEED_TAG,
+        is_deleted=rng.random() < 0.03,
+    )
+    lead.created_at = created
+    return lead, touches
+
+
+def _seeded_interactions(rng, lead, touches):
+    interactions = []
+    for touched_at in touches:
+        interaction = Interaction(
+            id=_uuid(rng),
+            lead=lead,
+            interaction_type=rng.choice(INTERACTION_TYPES),
+            summary="Synthetic interaction",
+            duration_minutes=rng.randrange(1, 60),
+        )
+        interaction.created_at = touched_at
+        interactions.append(interaction)
+    return interactions
+
+
+def _seeded_events(rng, lead, stages, anchor):
+    """The lead.created event plus zero to three lead.stage_changed events ending at the lead's stage."""
+    current = PipelineStage.cached(lead.stage_id)
+    age_days = (anchor - lead.created_at).total_seconds() / 86400
+    moves = sorted(rng.uniform(0, age_days) for _ in range(rng.choices([0, 1, 2, 3], [40, 35, 15, 10])[0]))
+    stage = rng.choice(stages) if moves else current
+    created = AuditEvent(
+        id=_uuid(rng),
+        user_email=SEED_EMAIL,
+        event_type="lead.created",
+        model_name="Lead",
+        object_id=str(lead.id),
+        action="create",
+        after_data={"business_name": lead.business_name, "stage": stage.name, "source": lead.source},
+        correlation_id=_uuid(rng),
+    )
+    created.timestamp = lead.created_at
+    events = [created]
+    for number, days in enumerate(moves, 1):
+        after = current if number == len(moves) else rng.choice(stages)
+        event = AuditEvent(
+            id=_uuid(rng),
+            user_email=SEED_EMAIL,
+            event_type="lead.stage_changed",
+            model_name="Lead",
+            object_id=str(lead.id),
+            action="update",
+            before_data={"stage": stage.name},
+            after_data={"stage": after.name},
+            metadata={"days_to_move": int(days)},
+            correlation_id=_uuid(rng),
+        )
+        event.timestamp = lead.created_at + timedelta(days=days)
+        events.append(event)
+        stage = after
+    return events
+
+
+def _seeded_run(rng, event_type, created, lead_id=None):
+    roll = rng.random()
+    if roll < 0.9:
+        status, success, status_code = AutomationRun.STATUS_SUCCEEDED, True, 200
+    elif roll < 0.95:
+        status, success, status_code = AutomationRun.STATUS_RETRY_SCHEDULED, False, 503
+    else:
+        status, success, status_code = AutomationRun.STATUS_FAILED, False, 500
+    run = AutomationRun(
+        id=_uuid(rng),
+        correlation_id=_uuid(rng),
+        event_type=event_type,
+        lead_id=lead_id,
+        webhook_url=SEED_WEBHOOK_URL + event_type,
+        payload_hash=hashlib.sha256(str(rng.random()).encode()).hexdigest(),
+        status_code=status_code,
+        success=success,
+        status=status,
+        attempts=1,
+        duration_ms=rng.randrange(20, 800),
+        last_attempt_at=created,
+    )
+    run.created_at = created
+    return run
+
+
+@contextmanager
+def _seeded_timestamps():
+    """
+    Let bulk_create keep the seeded created_at/timestamp values, which
+    auto_now_add would otherwise overwrite. Back-dating with bulk_update()
+    instead took two thirds of the seeding time.
+    """
+    fields = [
+        model._meta.get_field(name)
+        for model, name in (
+            (Lead, "created_at"),
+            (Lead, "first_contact_date"),
+            (Interaction, "created_at"),
+            (AutomationRun, "created_at"),
+            (AuditEvent, "timestamp"),
+        )
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def seed_synthetic(leads, seed=42, batch_size=5000, anchor=None):
+    """
+    Insert `leads` synthetic leads and their history. Returns {table: rows}.
+
+    Timestamps are spread over the HISTORY_DAYS before `anchor` (default:
+    now). Rows are written with bulk_create, so no signals fire and nothing
+    is queued for n8n; the dashboard caches are invalidated once at the end.
+    """
+    stages = PipelineStage.cached_all()
+    if not stages:
+        raise ValueError("No pipeline stages. Run seed_pipeline first.")
+    if Lead.all_objects.filter(tags=SEED_TAG).exists():
+        raise ValueError("Synthetic data already exists. Remove it with --cleanup first.")
+
+    anchor = anchor or timezone.now()
+    rng = random.Random(seed)
+    counts = {"leads": 0, "interactions": 0, "audit_events": 0, "automation_runs": 0}
+    number = 0
+    while number < leads:
+        size = min(batch_size, leads - number)
+        batch, interactions, events, runs = [], [], [], []
+        for _ in range(size):
+            lead, touches = _seeded_lead(rng, number, stages, anchor)
+            number += 1
+            batch.append(lead)
+            interactions.extend(_seeded_interactions(rng, lead, touches))
+            events.extend(_seeded_events(rng, lead, stages, anchor))
+            if lead.next_action_due and lead.next_action_due < anchor and rng.random() < 0.4:
+                notified = max(lead.next_action_due, anchor - timedelta(days=rng.uniform(0, 30)))
+                runs.append(_seeded_run(rng, "lead.overdue", notified, lead_id=lead.id))
+
+        with transaction.atomic(), _seeded_timestamps():
+            Lead.all_objects.bulk_create(batch)
+            Interaction.all_objects.bulk_create(interactions)
+            AuditEvent.objects.bulk_create(events)
+            AutomationRun.all_objects.bulk_create(runs)
+        counts["leads"] += len(batch)
+        counts["interactions"] += len(interactions)
+        counts["audit_events"] += len(events)
+        counts["automation_runs"] += len(runs)
+
+    summaries = [
+        _seeded_run(rng, "daily.summary", anchor - timedelta(days=day, hours=rng.uniform(0, 2)))
+        for day in range(1, HISTORY_DAYS + 1)
+    ]
+    with _seeded_timestamps():
+        AutomationRun.all_objects.bulk_create(summaries)
+    counts["automation_runs"] += len(summaries)
+
+    _invalidate_dashboard()
+    return counts
+
+
+def cleanup_synthetic():
+    """Delete every seeded row. Returns the number of leads deleted."""
+    Interaction.all_objects.filter(lead__tags=SEED_TAG).delete()
+    AuditEvent.objects.filter(user_email=SEED_EMAIL).delete()
+    AutomationRun.all_objects.filter(webhook_url__startswith=SEED_WEBHOOK_URL).delete()
+    deleted, _ = Lead.all_objects.filter(tags=SEED_TAG).delete()
+    _invalidate_dashboard()
+    return deleted
+
+
+def _invalidate_dashboard():
+    for metric in METRICS:
+        invalidate_version(f"dashboard.{metric}")
+    invalidate_fragments("leads", "health")
+
+
+def dashboard_queries(now, stale_days=7):
+    """The dashboard's Lead queries, as (name, callable) pairs."""
+    week_start = now - timedelta(days=7)
+
+    overdue = Lead.objects.filter(overdue_q(now))
+    due_today = Lead.objects.filter(due_today_q(now))
+    stale = Lead.objects.filter(stale_q(now - timedelta(days=stale_days)))
+    new_today = Lead.objects.filter(new_today_q(now))
+    next_actions = (
+        Lead.objects.exclude(next_action="").filter(next_action_due__isnull=False).order_by("next_action_due")
+    )
+    return [
+        ("overdue.count", overdue.count),
+        ("overdue.page", lambda: list(overdue.select_related("stage")[:50])),
+        ("due_today.count", due_today.count),
+        ("stale.count", stale.count),
+        ("stale.page", lambda: list(stale.select_related("stage")[:50])),
+        ("new_today.count", new_today.count),
+        ("bucket_counts", lambda: lead_bucket_counts(now, stale_days=stale_days)),
+        ("next_actions.page", lambda: list(next_actions.select_related("stage")[:10])),
+        (
+            "pipeline_counts",
+            lambda: list(Lead.objects.values("stage__name").annotate(total=Count("id")).order_by("stage__order")),
+        ),
+        ("speed_to_lead.rolling", lambda: speed_to_lead_minutes(week_start, now)),
+        ("follow_up_rate.rolling", lambda: follow_up_completion_rate(week_start, now)),
+        ("stage_movements.rolling", lambda: stage_movement_count(week_start, now)),
+    ]
+
+
+def _home(warm):
+    from apps.dashboard.views import home
+
+    user = get_user_model()(username="benchmark", is_superuser=True)
+
+    def render():
+        if not warm:
+            # Only the dashboard's own caches: settings, stages and roles stay warm as in production.
+            _invalidate_dashboard()
+        request = RequestFactory().get("/dashboard/")
+        request.user = user
+        request.gdc_roles = frozenset()
+        return home(request)
+
+    return render
+
+
+def _rolled_back(func):
+    """Run `func` in a transaction that is rolled back, so the benchmark leaves no rows."""
+
+    def run():
+        with transaction.atomic():
+            func()
+            transaction.set_rollback(True)
+
+    return run
+
+
+def _lead_saves():
+    lead = Lead.objects.filter(tags=SEED_TAG).first() or Lead.objects.first()
+    if lead is None:
+        return []
+    stages = PipelineStage.cached_all()
+    original_stage_id = lead.stage_id
+    other_stage = next((stage for stage in stages if stage.pk != original_stage_id), None)
+
+    def update():
+        lead.next_action = "Benchmark follow up"
+        lead.save()
+
+    def change_stage():
+        # The instance keeps the stage of the rolled-back save, so alternate
+        # to make every run a real change.
+        lead.stage_id = other_stage.pk if lead.stage_id == original_stage_id else original_stage_id
+        lead.save()
+
+    def create():
+        Lead(
+            business_name="Benchmark lead",
+            contact_person="Benchmark",
+            phone="0700000000",
+            pain_point="Benchmark",
+            stage_id=lead.stage_id,
+        ).save()
+
+    saves = [("lead_save.update", _rolled_back(update)), ("lead_save.create", _rolled_back(create))]
+    if other_stage is not None:
+        saves.append(("lead_save.stage_change", _rolled_back(change_stage)))
+    return saves
+
+
+def _automation(*args):
+    # The webhooks go out from worker threads, which do not query the database,
+    # so the runs, circuits and audit events recorded here all roll back.
+    def run():
+        with StubWebhookServer() as stub:
+            with override_settings(GDC_AUTOMATIONS_ENABLED=True, GDC_WEBHOOK_BASE_URL=stub.base_url):
+                call_command("run_automations", *args, stdout=StringIO())
+
+    return _rolled_back(run)
+
+
+def benchmarks(now):
+    """Every benchmark as (name, callable, runs or None for the --repeat value)."""
+    cases = [(f"dashboard.{name}", query, None) for name, query in dashboard_queries(now)]
+    cases += [
+        ("dashboard.consistency_metrics", lambda: get_consistency_metrics(now=now), None),
+        ("dashboard.home.cold", _home(warm=False), None),
+        ("dashboard.home.warm", _home(warm=True), None),
+    ]
+    cases += [(f"crm.{name}", save, None) for name, save in _lead_saves()]
+    # One webhook per overdue lead (to a local stub): run once, without a warm-up.
+    cases += [
+        ("automations.overdue", _automation("--overdue"), 1),
+        ("automations.daily_summary", _automation("--daily-summary"), 1),
+    ]
+    return cases
+
+
+def run_benchmarks(only=(), repeat=5, now=None):
+    """
+    Time each benchmark whose name starts with one of `only` (all when
+    empty). Returns {name: {runs, median_ms, min_ms, max_ms, queries, db_ms}},
+    with queries and db_ms taken from the median run.
+    """
+    now = now or timezone.now()
+    results = {}
+    for name, func, runs in benchmarks(now):
+        if only and not name.startswith(tuple(only)):
+            continue
+        if runs is None:
+            func()  # warm-up: connections, reference caches, and the fragments for home.warm
+        samples = []
+        for _ in range(runs or max(1, repeat)):
+            with instrument(name) as stats:
+                func()
+            samples.append(stats)
+        samples.sort(key=lambda stats: stats.total_seconds)
+        median = samples[len(samples) // 2]
+        results[name] = {
+            "runs": len(samples),
+            "median_ms": round(statistics.median(stats.total_seconds for stats in samples) * 1000, 3),
+            "min_ms": round(samples[0].total_seconds * 1000, 3),
+            "max_ms": round(samples[-1].total_seconds * 1000, 3),
+            "queries": median.queries,
+            "db_ms": round(median.db_seconds * 1000, 3),
+        }
+    return results
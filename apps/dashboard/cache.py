@@ -0,0 +1,154 @@
+"""
+Cached consistency metrics, and the keys for the dashboard's cached template
+fragments.
+
+Each metric and window is cached on its own, under a key that carries the
+metric's version (see apps.core.cache). Writes that can change a metric bump
+only that metric's version, and only when the write falls inside a window
+the dashboard shows. An entry older than GDC_METRICS_CACHE_FRESH_SECONDS is
+still served, but refreshed in the background, so a dashboard hit only pays
+for the aggregation when nothing usable is cached.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.core.cache import bump_version, get_version, invalidate_version
+from .services import (
+    _calendar_week_window,
+    _rolling_window,
+    follow_up_completion_rate,
+    speed_to_lead_minutes,
+    stage_movement_count,
+)
+
+METRICS = {
+    "speed_to_lead": speed_to_lead_minutes,
+    "follow_up_completion_rate": follow_up_completion_rate,
+    "stage_movements": stage_movement_count,
+}
+
+
+def _windows(now):
+    return {"week": _calendar_week_window(now), "rolling": _rolling_window(now, days=7)}
+
+
+def _cache_key(metric, label, start, version):
+    # The calendar week is keyed by its start. The rolling window moves with
+    # every request, so it keeps a single key that is refreshed as it ages.
+    scope = start.isoformat() if label == "week" else "last-7-days"
+    return f"dashboard:metrics:{metric}:{scope}:v{version}"
+
+
+def _compute(key, metric, start, end):
+    value = METRICS[metric](start, end)
+    cache.set(key, {"value": value, "computed_at": time.time()}, settings.GDC_METRICS_CACHE_TTL)
+    return value
+
+
+def _refresh_in_background(key, metric, start, end):
+    lock = f"{key}:refreshing"
+    if not cache.add(lock, 1, timeout=60):
+        return
+
+    if not settings.GDC_METRICS_REFRESH_IN_BACKGROUND:
+        try:
+            _compute(key, metric, start, end)
+        finally:
+            cache.delete(lock)
+        return
+
+    def refresh():
+        try:
+            _compute(key, metric, start, end)
+        finally:
+            cache.delete(lock)
+            connection.close()
+
+    threading.Thread(target=refresh, name=f"metrics-refresh-{metric}", daemon=True).start()
+
+
+def cached_consistency_metrics(now=None):
+    """get_consistency_metrics(), served from the cache where possible."""
+    now = now or timezone.now()
+    versions = {metric: get_version(f"dashboard.{metric}") for metric in METRICS}
+    slots = {
+        _cache_key(metric, label, start, versions[metric]): (metric, label, start, end)
+        for label, (start, end) in _windows(now).items()
+        for metric in METRICS
+    }
+    cached = cache.get_many(list(slots))
+
+    metrics = {metric: {} for metric in METRICS}
+    for key, (metric, label, start, end) in slots.items():
+        entry = cached.get(key)
+        if entry is None:
+            metrics[metric][label] = _compute(key, metric, start, end)
+            continue
+        metrics[metric][label] = entry["value"]
+        if time.time() - entry["computed_at"] > settings.GDC_METRICS_CACHE_FRESH_SECONDS:
+            _refresh_in_background(key, metric, start, end)
+    return metrics
+
+
+def invalidate_metrics(metrics, *timestamps, now=None):
+    """
+    Drop the cached `metrics` if any of `timestamps` falls inside a window
+    the dashboard shows. The bump waits for the transaction to commit, so a
+    recompute never caches data from before the write.
+    """
+    now = now or timezone.now()
+    windows = _windows(now).values()
+    start = min(window_start for window_start, _ in windows)
+    end = max(window_end for _, window_end in windows)
+    if not any(ts is not None and start <= ts < end for ts in timestamps):
+        return False
+
+    def bump():
+        for metric in metrics:
+            bump_version(f"dashboard.{metric}")
+
+    transaction.on_commit(bump)
+    return True
+
+
+# Cache namespaces for the data behind dashboard/home.html's fragments.
+FRAGMENT_DATA = {
+    "leads": "dashboard.fragments.leads",
+    "health": "dashboard.fragments.health",
+}
+
+
+def invalidate_fragments(*names):
+    """Re-render the named fragments (see FRAGMENT_DATA) on their next hit."""
+    for name in names:
+        invalidate_version(FRAGMENT_DATA[name])
+
+
+def fragment_keys(permissions, now, stale_days):
+    """
+    Vary-on values for each {% cache %} fragment of dashboard/home.html.
+
+    Every key carries the role (as the capabilities it grants, so Owner and
+    superuser share entries), the version of the data the fragment shows,
+    and a GDC_DASHBOARD_FRAGMENT_SECONDS time bucket: overdue, due-today and
+    the metric windows move with the clock even when nothing is written, and
+    the bucket also bounds staleness after writes that skip the signals
+    (QuerySet.update()).
+    """
+    bucket = int(now.timestamp()) // max(1, settings.GDC_DASHBOARD_FRAGMENT_SECONDS)
+    role = "".join(
+        "1" if permissions[name] else "0" for name in ("can_view_leads", "can_view_health", "can_view_financials")
+    )
+    metrics = ".".join(str(get_version(f"dashboard.{metric}")) for metric in METRICS)
+    return {
+        "leads": f"{role}:{stale_days}:{get_version(FRAGMENT_DATA['leads'])}:{bucket}",
+        "metrics": f"{metrics}:{bucket}",
+        "health": f"{role}:{get_version(FRAGMENT_DATA['health'])}:{bucket}",
+    }
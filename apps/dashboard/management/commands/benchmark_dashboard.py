@@ -0,0 +1,184 @@
+import json
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from apps.audit.models import AuditEvent
+from apps.crm.models import Interaction, Lead, PipelineStage
+from apps.dashboard.benchmarks import dashboard_queries
+
+SEED_TAG = "benchmark-seed"
+
+# Indexes dropped and recreated by --compare.
+DASHBOARD_INDEXES = {
+    Lead: [
+        "crm_lead_due_live_idx",
+        "crm_lead_last_touch_live_idx",
+        "crm_lead_untouched_live_idx",
+        "crm_lead_created_live_idx",
+        "crm_lead_stale_order_idx",
+    ],
+    Interaction: ["crm_interaction_lead_time_idx"],
+    AuditEvent: ["audit_type_time_idx"],
+}
+
+
+class Command(BaseCommand):
+    """
+    WHAT: Seeds synthetic leads and times the dashboard's queries with their plans
+    WHY: Shows whether the dashboard indexes are used and what they buy
+    USAGE: python manage.py benchmark_dashboard --leads 1000000 --compare
+    """
+
+    help = "Seed synthetic leads and report query plans and timings for the dashboard queries"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--leads", type=int, default=1_000_000, help="Synthetic leads to seed")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Leads inserted per batch")
+        parser.add_argument("--no-seed", action="store_true", help="Benchmark the existing data only")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per query; the median is reported")
+        parser.add_argument(
+            "--compare",
+            action="store_true",
+            help="Also run every query with the dashboard indexes dropped (they are recreated afterwards)",
+        )
+        parser.add_argument("--cleanup", action="store_true", help="Delete the synthetic leads and exit")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    def handle(self, *args, **options):
+        if options["cleanup"]:
+            deleted = self._cleanup()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} synthetic leads."))
+            return
+
+        if not options["no_seed"]:
+            started = time.perf_counter()
+            seeded = self._seed(options["leads"], max(1, options["batch_size"]))
+            self.stderr.write(f"Seeded {seeded} leads in {time.perf_counter() - started:.1f}s")
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        now = timezone.now()
+        results = {}
+        if options["compare"]:
+            removed = self._toggle_indexes(add=False)
+            try:
+                results["without_indexes"] = self._run(now, options["repeat"])
+            finally:
+                self._toggle_indexes(add=True, only=removed)
+        results["with_indexes"] = self._run(now, options["repeat"])
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for label, rows in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            for name, row in rows.items():
+                self.stdout.write(f"  {name:<26} {row['median_ms']:>10.2f} ms")
+                for line in row["plan"]:
+                    self.stdout.write(f"      {line}")
+
+    def _seed(self, total, batch_size):
+        stage_ids = list(PipelineStage.objects.values_list("id", flat=True))
+        if not stage_ids:
+            raise CommandError("No pipeline stages. Run seed_pipeline first.")
+
+        rng = random.Random(42)
+        now = timezone.now()
+        seeded = 0
+        while seeded < total:
+            size = min(batch_size, total - seeded)
+            # created_at/first_contact_date are auto_now_add, so each batch is
+            # back-dated with one UPDATE after the insert.
+            created = now - timedelta(days=rng.uniform(0, 90))
+            leads = []
+            for i in range(size):
+                # One interaction per touched lead, so it is also the first.
+                touched_at = created + timedelta(days=rng.uniform(0, 2)) if rng.random() < 0.7 else None
+                due_roll = rng.random()
+                leads.append(
+                    Lead(
+                        business_name=f"Benchmark {seeded + i}",
+                        contact_person="Synthetic",
+                        phone="0700000000",
+                        pain_point="Synthetic benchmark lead",
+                        stage_id=rng.choice(stage_ids),
+                        tags=SEED_TAG,
+                        next_action="Follow up" if due_roll < 0.8 else "",
+                        next_action_due=now + timedelta(days=rng.uniform(-30, 30)) if due_roll < 0.8 else None,
+                        last_interaction_date=touched_at,
+                        first_interaction_at=touched_at,
+                        is_deleted=rng.random() < 0.05,
+                    )
+                )
+            Lead.all_objects.bulk_create(leads)
+            ids = [lead.pk for lead in leads]
+            Lead.all_objects.filter(pk__in=ids).update(created_at=created, first_contact_date=created)
+
+            touched = [lead for lead in leads if lead.last_interaction_date]
+            Interaction.objects.bulk_create(
+                [Interaction(lead=lead, interaction_type="call", summary=SEED_TAG) for lead in touched]
+            )
+            Interaction.objects.filter(lead_id__in=[lead.pk for lead in touched]).update(
+                created_at=Subquery(
+                    Lead.all_objects.filter(pk=OuterRef("lead_id")).values("last_interaction_date")[:1]
+                )
+            )
+            seeded += size
+        return seeded
+
+    def _cleanup(self):
+        Interaction.all_objects.filter(lead__tags=SEED_TAG).delete()
+        deleted, _ = Lead.all_objects.filter(tags=SEED_TAG).delete()
+        return deleted
+
+    def _toggle_indexes(self, add, only=None):
+        changed = []
+        with connection.schema_editor() as editor:
+            for model, names in DASHBOARD_INDEXES.items():
+                for index in model._meta.indexes:
+                    if index.name not in names or (only is not None and index.name not in only):
+                        continue
+                    if add:
+                        editor.add_index(model, index)
+                    else:
+                        editor.remove_index(model, index)
+                    changed.append(index.name)
+        return changed
+
+    def _run(self, now, repeat):
+        results = {}
+        for name, query in dashboard_queries(now):
+            statements = []
+
+            def capture(execute, sql, params, many, context):
+                statements.append((sql, params))
+                return execute(sql, params, many, context)
+
+            timings = []
+            for _ in range(max(1, repeat)):
+                statements.clear()
+                with connection.execute_wrapper(capture):
+                    started = time.perf_counter()
+                    query()
+                    timings.append((time.perf_counter() - started) * 1000)
+            results[name] = {
+                "median_ms": round(statistics.median(timings), 3),
+                "plan": self._explain(statements),
+            }
+        return results
+
+    def _explain(self, statements):
+        prefix = connection.ops.explain_query_prefix()
+        plan = []
+        with connection.cursor() as cursor:
+            for sql, params in statements:
+                cursor.execute(f"{prefix} {sql}", params)
+                plan.extend(" ".join(str(col) for col in row) for row in cursor.fetchall())
+        return plan
@@ -0,0 +1,90 @@
+import json
+import subprocess
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.audit.models import AuditEvent
+from apps.automations.models import AutomationRun
+from apps.crm.models import Interaction, Lead
+from apps.dashboard.benchmarks import run_benchmarks
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    """
+    WHAT: Times the dashboard services, the home view, run_automations and Lead.save and prints JSON
+    WHY: A baseline to compare optimizations against, commit by commit (seed with seed_synthetic first)
+    USAGE: python manage.py run_benchmarks -o before.json; python manage.py run_benchmarks --baseline before.json
+    """
+
+    help = "Run the hot-path benchmarks and report timings and query counts as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark; the median is reported")
+        parser.add_argument(
+            "--only",
+            default="",
+            help="Comma-separated name prefixes to run, e.g. dashboard,crm (default: all)",
+        )
+        parser.add_argument("--baseline", default=None, help="Earlier JSON output to compare the medians against")
+        parser.add_argument("-o", "--output", default=None, help="Write the JSON here instead of stdout")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            try:
+                with open(options["baseline"], encoding="utf-8") as fileobj:
+                    baseline = json.load(fileobj)["results"]
+            except (OSError, ValueError, KeyError) as exc:
+                raise CommandError(f"Unreadable baseline: {exc}") from exc
+
+        if connection.vendor in ("sqlite", "postgresql"):
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+        only = [prefix.strip() for prefix in options["only"].split(",") if prefix.strip()]
+        results = run_benchmarks(only=only, repeat=options["repeat"])
+        if baseline:
+            for name, row in results.items():
+                before = baseline.get(name, {}).get("median_ms")
+                if before:
+                    row["baseline_median_ms"] = before
+                    row["change_pct"] = round((row["median_ms"] - before) / before * 100, 1)
+
+        report = {
+            "meta": {
+                "revision": _git_revision(),
+                "database": connection.vendor,
+                "timestamp": timezone.now().isoformat(),
+                "repeat": options["repeat"],
+                "rows": {
+                    "leads": Lead.all_objects.count(),
+                    "interactions": Interaction.all_objects.count(),
+                    "audit_events": AuditEvent.objects.count(),
+                    "automation_runs": AutomationRun.all_objects.count(),
+                },
+            },
+            "results": results,
+        }
+        payload = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fileobj:
+                fileobj.write(payload + "\n")
+            self.stderr.write(f"Wrote {len(results)} benchmarks to {options['output']}")
+        else:
+            self.stdout.write(payload)
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyMetricRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(unique=True)),
+                ("responded_leads", models.IntegerField(default=0)),
+                ("response_seconds", models.FloatField(default=0)),
+                ("follow_ups_due", models.IntegerField(default=0)),
+                ("follow_up_completions", models.JSONField(blank=True, default=dict)),
+                ("stage_movements", models.IntegerField(default=0)),
+                ("computed_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Daily Metric Rollup",
+                "verbose_name_plural": "Daily Metric Rollups",
+                "ordering": ["-day"],
+            },
+        ),
+    ]
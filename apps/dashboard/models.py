@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from django.db import models
+
+
+class DailyMetricRollup(models.Model):
+    """
+    Consistency metric totals for one closed local day, written by
+    `rollup_daily_metrics` and summed by the dashboard services.
+
+    Rows hold additive totals, not ratios, so any run of days can be summed.
+    Follow-up completions are kept per completion date because whether a
+    completion counts depends on where the reporting window ends.
+    """
+
+    day = models.DateField(unique=True)
+    responded_leads = models.IntegerField(default=0)
+    response_seconds = models.FloatField(default=0)
+    follow_ups_due = models.IntegerField(default=0)
+    follow_up_completions = models.JSONField(default=dict, blank=True)
+    stage_movements = models.IntegerField(default=0)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-day"]
+        verbose_name = "Daily Metric Rollup"
+        verbose_name_plural = "Daily Metric Rollups"
+
+    def __str__(self) -> str:
+        return f"Metrics for {self.day}"
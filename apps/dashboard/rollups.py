@@ -0,0 +1,167 @@
+"""Populate DailyMetricRollup rows from the raw Lead, Interaction and AuditEvent data."""
+from __future__ import annotations
+
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.audit.models import AuditEvent
+from apps.core.cache import bump_version
+from apps.core.utils import local_day_bounds
+from apps.crm.models import Lead
+from .cache import METRICS
+from .models import DailyMetricRollup
+
+ROLLUP_FIELDS = [
+    "responded_leads",
+    "response_seconds",
+    "follow_ups_due",
+    "follow_up_completions",
+    "stage_movements",
+    "computed_at",
+]
+
+
+def _local_day(value):
+    return timezone.localtime(value).date()
+
+
+def compute_rollups(first_day, last_day, computed_at):
+    """Unsaved DailyMetricRollup rows for every local day in [first_day, last_day)."""
+    start = local_day_bounds(first_day)[0]
+    end = local_day_bounds(last_day)[0]
+    rows = {}
+    day = first_day
+    while day < last_day:
+        rows[day] = DailyMetricRollup(day=day, follow_up_completions=Counter(), computed_at=computed_at)
+        day += timedelta(days=1)
+
+    responded = Lead.objects.filter(
+        created_at__gte=start, created_at__lt=end, first_interaction_at__isnull=False
+    ).values_list("created_at", "first_interaction_at")
+    for created_at, first_interaction in responded.iterator():
+        row = rows[_local_day(created_at)]
+        row.responded_leads += 1
+        row.response_seconds += (first_interaction - created_at).total_seconds()
+
+    due = (
+        Lead.objects.filter(next_action_due__gte=start, next_action_due__lt=end)
+        .annotate(
+            done_at=Min(
+                "interactions__created_at",
+                filter=Q(interactions__created_at__gte=F("next_action_due")),
+            )
+        )
+        .values_list("next_action_due", "done_at")
+    )
+    for due_at, done_at in due.iterator():
+        row = rows[_local_day(due_at)]
+        row.follow_ups_due += 1
+        if done_at is not None:
+            row.follow_up_completions[_local_day(done_at).isoformat()] += 1
+
+    movements = (
+        AuditEvent.objects.filter(event_type="lead.stage_changed", timestamp__gte=start, timestamp__lt=end)
+        .annotate(day=TruncDate("timestamp"))
+        .values("day")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for movement in movements:
+        rows[movement["day"]].stage_movements = movement["total"]
+
+    for row in rows.values():
+        row.follow_up_completions = dict(row.follow_up_completions)
+    return list(rows.values())
+
+
+def _changed_days(since):
+    """Local days whose totals can differ because of writes at or after `since`."""
+    days = set()
+    leads = Lead.all_objects.filter(
+        Q(updated_at__gte=since) | Q(interactions__updated_at__gte=since)
+    ).values_list("created_at", "next_action_due").distinct()
+    for created_at, due_at in leads.iterator():
+        days.add(_local_day(created_at))
+        if due_at is not None:
+            days.add(_local_day(due_at))
+    events = AuditEvent.objects.filter(event_type="lead.stage_changed", timestamp__gte=since).values_list(
+        "timestamp", flat=True
+    )
+    days.update(_local_day(timestamp) for timestamp in events.iterator())
+    return days
+
+
+def _earliest_day():
+    first = [
+        Lead.all_objects.aggregate(first=Min("created_at"))["first"],
+        AuditEvent.objects.filter(event_type="lead.stage_changed").aggregate(first=Min("timestamp"))["first"],
+    ]
+    first = [value for value in first if value is not None]
+    return _local_day(min(first)) if first else None
+
+
+def _runs(days, chunk_days):
+    """Group sorted days into consecutive [first, last) runs of at most chunk_days."""
+    run_start = previous = None
+    for day in sorted(days):
+        if run_start is not None and (day != previous + timedelta(days=1) or (day - run_start).days >= chunk_days):
+            yield run_start, previous + timedelta(days=1)
+            run_start = None
+        if run_start is None:
+            run_start = day
+        previous = day
+    if run_start is not None:
+        yield run_start, previous + timedelta(days=1)
+
+
+def rollup_daily_metrics(since=None, until=None, chunk_days=31, lookback_days=7, now=None):
+    """
+    Write DailyMetricRollup rows for closed local days and return how many
+    days were written.
+
+    With `since`, every day from `since` is recomputed (a backfill).
+    Otherwise only the days touched by writes since the previous run are,
+    plus the last `lookback_days` and any day without a row yet. Moving a
+    lead's due date leaves no trace on the old day, so older days affected
+    by such a move only pick up the change in a backfill.
+
+    Days are computed `chunk_days` at a time, one transaction per chunk.
+    Today (as of `now`) is never rolled up; the dashboard reads it raw.
+    """
+    # Rows are stamped with the time the run started, so writes made while
+    # it runs are picked up by the next one.
+    started = timezone.now()
+    today = timezone.localdate(now or started)
+    until = min(until or today, today)
+
+    if since is not None:
+        days = {since + timedelta(days=offset) for offset in range((until - since).days)}
+    else:
+        last_run = DailyMetricRollup.objects.aggregate(last=Max("computed_at"), day=Max("day"))
+        if last_run["last"] is None:
+            first = _earliest_day()
+            days = {first + timedelta(days=offset) for offset in range((until - first).days)} if first else set()
+        else:
+            days = _changed_days(last_run["last"])
+            recent = min(today - timedelta(days=lookback_days), last_run["day"] + timedelta(days=1))
+            days.update(recent + timedelta(days=offset) for offset in range((today - recent).days))
+    days = {day for day in days if day < until}
+
+    written = 0
+    for first_day, last_day in _runs(days, max(1, chunk_days)):
+        rows = compute_rollups(first_day, last_day, computed_at=started)
+        with transaction.atomic():
+            DailyMetricRollup.objects.bulk_create(
+                rows, update_conflicts=True, unique_fields=["day"], update_fields=ROLLUP_FIELDS
+            )
+        written += len(rows)
+
+    if written:
+        for metric in METRICS:
+            bump_version(f"dashboard.{metric}")
+    return written
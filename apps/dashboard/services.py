@@ -1,10 +1,26 @@
-from datetime import timedelta
-
-from django.db.models import Avg, DurationField, ExpressionWrapper, F, Min
+from datetime import date, timedelta
+
+from django.db.models import (
+    Case,
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from apps.audit.models import AuditEvent
+from apps.core.utils import local_day_bounds
 from apps.crm.models import Lead
+from .models import DailyMetricRollup
+
+LEAD_LISTS = ("overdue", "due_today", "stale")
 
 
 def _calendar_week_window(now):
@@ -19,41 +35,188 @@ def _rolling_window(now, days=7):
     return now - timedelta(days=days), now
 
 
-def speed_to_lead_minutes(start, end):
-    leads = (
-        Lead.objects.filter(created_at__gte=start, created_at__lt=end)
-        .annotate(first_interaction=Min("interactions__created_at"))
-        .exclude(first_interaction__isnull=True)
+def overdue_q(now):
+    return Q(next_action_due__lt=now)
+
+
+def due_today_q(now):
+    today_start, today_end = local_day_bounds(timezone.localdate(now))
+    return Q(next_action_due__gte=today_start, next_action_due__lt=today_end)
+
+
+def stale_q(cutoff):
+    return Q(last_interaction_date__lte=cutoff) | Q(
+        last_interaction_date__isnull=True, first_contact_date__lte=cutoff
+    )
+
+
+def new_today_q(now):
+    today_start, today_end = local_day_bounds(timezone.localdate(now))
+    return Q(created_at__gte=today_start, created_at__lt=today_end)
+
+
+def lead_bucket_counts(now=None, stale_days=7):
+    """
+    New-today, overdue, due-today and stale lead counts in one query.
+
+    Shared by the dashboard and the daily summary so both report the same
+    numbers for the same moment.
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=stale_days)
+    return Lead.objects.aggregate(
+        new_leads=Count("id", filter=new_today_q(now)),
+        overdue=Count("id", filter=overdue_q(now)),
+        due_today=Count("id", filter=due_today_q(now)),
+        stale=Count("id", filter=stale_q(cutoff)),
+    )
+
+
+def prioritized_leads(now=None, stale_days=7):
+    """Leads ranked overdue, due today, stale, then the rest; by value within a rank."""
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=stale_days)
+    return (
+        Lead.objects.annotate(
+            priority_rank=Case(
+                When(overdue_q(now), then=Value(1)),
+                When(due_today_q(now), then=Value(2)),
+                When(stale_q(cutoff), then=Value(3)),
+                default=Value(4),
+                output_field=IntegerField(),
+            )
+        )
+        .order_by("priority_rank", "-value_estimate")
     )
+
+
+def lead_list(name, now, stale_days=7):
+    """
+    Queryset and keyset ordering for one of the dashboard's LEAD_LISTS.
+
+    Overdue and due-today leads come soonest-due first; stale leads come
+    longest-untouched first. Every ordering ends in "id" so it can be paged
+    with a cursor.
+    """
+    leads = Lead.objects.all()
+    if name == "overdue":
+        return leads.filter(overdue_q(now)), ["next_action_due", "id"]
+    if name == "due_today":
+        return leads.filter(due_today_q(now)), ["next_action_due", "id"]
+    if name == "stale":
+        cutoff = now - timedelta(days=stale_days)
+        leads = leads.annotate(last_touch=Coalesce("last_interaction_date", "first_contact_date"))
+        return leads.filter(stale_q(cutoff)), ["last_touch", "id"]
+    raise ValueError(f"Unknown lead list: {name}")
+
+
+def _day_start(day):
+    return local_day_bounds(day)[0]
+
+
+def _window_segments(start, end, now):
+    """
+    Split [start, end) into the closed local days it fully covers and that
+    have a rollup row, and the raw ranges around and between them (the
+    partial first day, today onwards, and closed days not rolled up yet).
+    """
+    today = timezone.localdate(now)
+    first_day = timezone.localdate(start)
+    if _day_start(first_day) < start:
+        first_day += timedelta(days=1)
+    last_day = min(today, timezone.localdate(end))
+    if last_day <= first_day:
+        return [(start, end)], []
+
+    rollups = list(DailyMetricRollup.objects.filter(day__gte=first_day, day__lt=last_day).order_by("day"))
+    raw = []
+    cursor = start
+    for rollup in rollups:
+        day_start = _day_start(rollup.day)
+        if cursor < day_start:
+            raw.append((cursor, day_start))
+        cursor = _day_start(rollup.day + timedelta(days=1))
+    if cursor < end:
+        raw.append((cursor, end))
+    return raw, rollups
+
+
+def _speed_totals(start, end):
+    # first_interaction_at is kept on the lead, so this is a range scan over
+    # the window's leads with no join to their interactions.
+    leads = Lead.objects.filter(created_at__gte=start, created_at__lt=end,
+                                first_interaction_at__isnull=False)
     duration = ExpressionWrapper(
-        F("first_interaction") - F("created_at"), output_field=DurationField()
+        F("first_interaction_at") - F("created_at"), output_field=DurationField()
     )
-    avg = leads.annotate(response_time=duration).aggregate(
-        avg=Avg("response_time"))["avg"]
-    if not avg:
+    totals = leads.aggregate(total=Sum(duration), responded=Count("id"))
+    if not totals["responded"]:
+        return 0.0, 0
+    return totals["total"].total_seconds(), totals["responded"]
+
+
+def speed_to_lead_minutes(start, end, now=None):
+    now = now or timezone.now()
+    raw, rollups = _window_segments(start, end, now)
+    seconds, responded = 0.0, 0
+    for segment_start, segment_end in raw:
+        segment_seconds, segment_responded = _speed_totals(segment_start, segment_end)
+        seconds += segment_seconds
+        responded += segment_responded
+    for rollup in rollups:
+        seconds += rollup.response_seconds
+        responded += rollup.responded_leads
+    if not responded or not seconds:
         return None
-    return round(avg.total_seconds() / 60, 2)
+    return round(seconds / responded / 60, 2)
 
 
-def follow_up_completion_rate(start, end):
+def _follow_up_totals(start, end, done_before):
+    """Leads due in [start, end), and those with an interaction in [due, done_before)."""
     due_qs = Lead.objects.filter(next_action_due__gte=start,
                                  next_action_due__lt=end)
     due_count = due_qs.count()
     if not due_count:
-        return {"rate": None, "due": 0, "completed": 0}
-
+        return 0, 0
     completed_count = (
-        due_qs.filter(interactions__created_at__gte=F("next_action_due"))
-        .filter(interactions__created_at__gte=start,
-                interactions__created_at__lt=end)
+        due_qs.filter(interactions__created_at__gte=F("next_action_due"),
+                      interactions__created_at__lt=done_before)
         .distinct()
         .count()
     )
+    return due_count, completed_count
+
+
+def follow_up_completion_rate(start, end, now=None):
+    now = now or timezone.now()
+    end_day = timezone.localdate(end)
+    if end < now and _day_start(end_day) != end:
+        # Rollups count completions per day, so a past window ending mid-day
+        # is answered from raw data.
+        raw, rollups = [(start, end)], []
+    else:
+        raw, rollups = _window_segments(start, end, now)
+
+    due_count, completed_count = 0, 0
+    for segment_start, segment_end in raw:
+        segment_due, segment_completed = _follow_up_totals(segment_start, segment_end, end)
+        due_count += segment_due
+        completed_count += segment_completed
+    for rollup in rollups:
+        due_count += rollup.follow_ups_due
+        completed_count += sum(
+            count
+            for day, count in rollup.follow_up_completions.items()
+            if end >= now or date.fromisoformat(day) < end_day
+        )
+
+    if not due_count:
+        return {"rate": None, "due": 0, "completed": 0}
     rate = round((completed_count / due_count) * 100, 2)
     return {"rate": rate, "due": due_count, "completed": completed_count}
 
 
-def stage_movement_count(start, end):
+def _stage_movements(start, end):
     return AuditEvent.objects.filter(
         event_type="lead.stage_changed",
         timestamp__gte=start,
@@ -61,6 +224,14 @@ def stage_movement_count(start, end):
     ).count()
 
 
+def stage_movement_count(start, end, now=None):
+    now = now or timezone.now()
+    raw, rollups = _window_segments(start, end, now)
+    return sum(_stage_movements(*segment) for segment in raw) + sum(
+        rollup.stage_movements for rollup in rollups
+    )
+
+
 def get_consistency_metrics(now=None):
     now = now or timezone.now()
     week_start, week_end = _calendar_week_window(now)
@@ -68,15 +239,15 @@ def get_consistency_metrics(now=None):
 
     return {
         "speed_to_lead": {
-            "week": speed_to_lead_minutes(week_start, week_end),
-            "rolling": speed_to_lead_minutes(rolling_start, rolling_end),
+            "week": speed_to_lead_minutes(week_start, week_end, now=now),
+            "rolling": speed_to_lead_minutes(rolling_start, rolling_end, now=now),
         },
         "follow_up_completion_rate": {
-            "week": follow_up_completion_rate(week_start, week_end),
-            "rolling": follow_up_completion_rate(rolling_start, rolling_end),
+            "week": follow_up_completion_rate(week_start, week_end, now=now),
+            "rolling": follow_up_completion_rate(rolling_start, rolling_end, now=now),
         },
         "stage_movements": {
-            "week": stage_movement_count(week_start, week_end),
-            "rolling": stage_movement_count(rolling_start, rolling_end),
+            "week": stage_movement_count(week_start, week_end, now=now),
+            "rolling": stage_movement_count(rolling_start, rolling_end, now=now),
         },
     }
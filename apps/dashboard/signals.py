@@ -0,0 +1,55 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.audit.models import AuditEvent
+from apps.audit.signals import events_logged
+from apps.crm.models import Interaction, Lead, PipelineStage
+from apps.crm.signals import interactions_logged, leads_imported
+from .cache import invalidate_fragments, invalidate_metrics
+
+LEAD_METRICS = ("speed_to_lead", "follow_up_completion_rate")
+
+
+@receiver(post_save, sender=Lead)
+@receiver(post_delete, sender=Lead)
+def lead_written(sender, instance, **kwargs):
+    # post_save runs before the snapshot is refreshed, so the loaded value is
+    # the due date the lead had before this save.
+    previous_due = getattr(instance, "_loaded_values", {}).get("next_action_due")
+    invalidate_metrics(LEAD_METRICS, instance.created_at, instance.next_action_due, previous_due)
+    invalidate_fragments("leads")
+
+
+@receiver(leads_imported, sender=Lead)
+def leads_imported_written(sender, leads, **kwargs):
+    invalidate_metrics(LEAD_METRICS, *(lead.created_at for lead in leads))
+    invalidate_fragments("leads")
+
+
+@receiver(post_save, sender=Interaction)
+@receiver(post_delete, sender=Interaction)
+def interaction_written(sender, instance, **kwargs):
+    invalidate_metrics(LEAD_METRICS, instance.created_at)
+    invalidate_fragments("leads")
+
+
+@receiver(interactions_logged, sender=Interaction)
+def interactions_logged_written(sender, interactions, **kwargs):
+    invalidate_metrics(LEAD_METRICS, *(interaction.created_at for interaction in interactions))
+    invalidate_fragments("leads")
+
+
+@receiver(post_save, sender=PipelineStage)
+@receiver(post_delete, sender=PipelineStage)
+def stage_written(sender, **kwargs):
+    invalidate_fragments("leads")
+
+
+@receiver(events_logged, sender=AuditEvent)
+def stage_changes_logged(sender, events, **kwargs):
+    timestamps = [event.timestamp for event in events if event.event_type == "lead.stage_changed"]
+    if timestamps:
+        invalidate_metrics(("stage_movements",), *timestamps)
+    # Automation runs are bulk-written, so their audit events are the signal.
+    if any(event.event_type == "automation.run" for event in events):
+        invalidate_fragments("health")
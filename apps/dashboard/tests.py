@@ -1,12 +1,36 @@
-from datetime import datetime, timedelta
+import json
+from datetime import date, datetime, timedelta
+from io import StringIO
+from unittest import mock
 
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from django.utils import timezone
 
+from apps.audit.buffer import buffered_audit
 from apps.audit.models import AuditEvent
+from apps.automations.models import AutomationRun
+from apps.automations.services import send_daily_summary_webhook
+from apps.core.cache import get_version
+from apps.core.models import AppSetting
 from apps.crm.models import Interaction, Lead, PipelineStage
+from apps.crm.services import repair_first_interaction_at
+from apps.core.utils import encode_cursor, keyset_page
+from apps.dashboard.benchmarks import cleanup_synthetic, seed_synthetic
+from apps.dashboard.cache import METRICS, cached_consistency_metrics
+from apps.dashboard.models import DailyMetricRollup
+from apps.dashboard.rollups import rollup_daily_metrics
 from apps.dashboard.services import (
     follow_up_completion_rate,
+    get_consistency_metrics,
+    lead_bucket_counts,
+    lead_list,
     speed_to_lead_minutes,
     stage_movement_count,
 )
@@ -17,7 +41,7 @@ def aware_dt(year, month, day, hour=0, minute=0):
     return timezone.make_aware(datetime(year, month, day, hour, minute), tz)
 
 
-class MetricsServiceTests(TestCase):
+class MetricsDataMixin:
     def setUp(self):
         self.stage = PipelineStage.objects.create(name="Warm", order=1)
 
@@ -41,6 +65,8 @@ class MetricsServiceTests(TestCase):
             summary="Initial call",
         )
         Interaction.objects.filter(pk=interaction.pk).update(created_at=created_at)
+        # Back-dating bypasses Interaction.save, so resync the lead's copy.
+        repair_first_interaction_at(Lead.objects.filter(pk=lead.pk))
         return Interaction.objects.get(pk=interaction.pk)
 
     def _make_audit(self, event_type, timestamp, object_id):
@@ -58,6 +84,8 @@ class MetricsServiceTests(TestCase):
         AuditEvent.objects.filter(pk=event.pk).update(timestamp=timestamp)
         return AuditEvent.objects.get(pk=event.pk)
 
+
+class MetricsServiceTests(MetricsDataMixin, TestCase):
     def test_speed_to_lead_minutes_average_and_empty_window(self):
         start = aware_dt(2026, 1, 5)
         end = start + timedelta(days=7)
@@ -123,3 +151,397 @@ class MetricsServiceTests(TestCase):
         empty_end = empty_start + timedelta(days=7)
         empty_result = stage_movement_count(empty_start, empty_end)
         self.assertEqual(empty_result, 0)
+
+
+class BenchmarkDashboardCommandTests(TestCase):
+    def test_seeds_and_reports_every_query(self):
+        PipelineStage.objects.create(name="Cold", order=0)
+        out = StringIO()
+
+        call_command(
+            "benchmark_dashboard", leads=30, batch_size=10, repeat=1, json=True, stdout=out, stderr=StringIO()
+        )
+
+        results = json.loads(out.getvalue())["with_indexes"]
+        self.assertIn("overdue.count", results)
+        self.assertTrue(all(row["plan"] for row in results.values()))
+        self.assertEqual(Lead.all_objects.filter(tags="benchmark-seed").count(), 30)
+        self.assertFalse(Lead.all_objects.filter(tags="benchmark-seed", created_at__gt=timezone.now()).exists())
+
+        call_command("benchmark_dashboard", cleanup=True, stdout=StringIO())
+        self.assertFalse(Lead.all_objects.exists())
+
+
+class SyntheticBenchmarkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        for order, name in enumerate(["Cold", "Warm", "Won"]):
+            PipelineStage.objects.create(name=name, order=order)
+        self.anchor = timezone.make_aware(datetime(2026, 3, 2, 12, 0))
+
+    def _snapshot(self):
+        return (
+            list(Lead.all_objects.order_by("id").values_list("id", "stage_id", "created_at", "next_action_due")),
+            list(Interaction.all_objects.order_by("id").values_list("id", "lead_id", "created_at")),
+            list(AuditEvent.objects.order_by("id").values_list("id", "timestamp", "after_data")),
+        )
+
+    def test_same_seed_gives_the_same_rows(self):
+        counts = seed_synthetic(40, seed=7, batch_size=15, anchor=self.anchor)
+        first = self._snapshot()
+        self.assertEqual(counts["leads"], 40)
+        self.assertEqual(len(first[1]), counts["interactions"])
+        self.assertFalse(Lead.all_objects.filter(created_at__gt=self.anchor).exists())
+        self.assertTrue(AuditEvent.objects.filter(event_type="lead.stage_changed", timestamp__lt=self.anchor).exists())
+
+        cleanup_synthetic()
+        self.assertFalse(Lead.all_objects.exists() or AuditEvent.objects.exists() or Interaction.all_objects.exists())
+        seed_synthetic(40, seed=7, batch_size=40, anchor=self.anchor)
+        self.assertEqual(self._snapshot(), first)
+
+    def test_runner_reports_json_and_leaves_no_rows(self):
+        seed_synthetic(30, anchor=self.anchor)
+        rows = (Lead.all_objects.count(), AutomationRun.all_objects.count(), AuditEvent.objects.count())
+        cache.set("unrelated", 1)
+        out = StringIO()
+
+        call_command("run_benchmarks", only="crm,dashboard.home,automations", repeat=2, stdout=out)
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["meta"]["rows"]["leads"], rows[0])
+        self.assertEqual(
+            set(report["results"]),
+            {
+                "crm.lead_save.update",
+                "crm.lead_save.create",
+                "crm.lead_save.stage_change",
+                "dashboard.home.cold",
+                "dashboard.home.warm",
+                "automations.overdue",
+                "automations.daily_summary",
+            },
+        )
+        self.assertEqual(report["results"]["dashboard.home.warm"]["queries"], 0)
+        self.assertEqual(report["results"]["crm.lead_save.stage_change"]["runs"], 2)
+        self.assertGreater(report["results"]["automations.daily_summary"]["queries"], 0)
+        self.assertEqual(
+            (Lead.all_objects.count(), AutomationRun.all_objects.count(), AuditEvent.objects.count()), rows
+        )
+        self.assertEqual(cache.get("unrelated"), 1)
+
+
+class LeadListPaginationTests(TestCase):
+    def setUp(self):
+        # Rendered fragments outlive the test's rolled-back transaction.
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.stage = PipelineStage.objects.create(name="Warm", order=1)
+        self.user = get_user_model().objects.create_superuser("owner", "owner@example.com", "pw")
+        self.client.force_login(self.user)
+        now = timezone.now()
+        for i in range(25):
+            Lead.objects.create(
+                business_name=f"Lead {i:02d}",
+                contact_person="Jane Doe",
+                phone="0700000000",
+                pain_point="Needs a better process",
+                stage=self.stage,
+                next_action_due=now - timedelta(days=30 - i),
+            )
+
+    def test_cursor_walks_the_whole_list_once(self):
+        url = reverse("dashboard-lead-list", args=["overdue"])
+        names, cursor = [], ""
+        while True:
+            response = self.client.get(url, {"cursor": cursor, "limit": 10})
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+            names.extend(row["business_name"] for row in page["results"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(names, [f"Lead {i:02d}" for i in range(25)])
+
+    def test_stale_list_pages_by_last_touch(self):
+        Lead.objects.update(last_interaction_date=timezone.now() - timedelta(days=30))
+        leads, ordering = lead_list("stale", timezone.now())
+
+        first, cursor = keyset_page(leads, ordering, limit=20)
+        rest, end = keyset_page(leads, ordering, cursor=cursor, limit=20)
+
+        self.assertEqual(len(first) + len(rest), 25)
+        self.assertIsNone(end)
+        self.assertFalse({lead.pk for lead in first} & {lead.pk for lead in rest})
+
+    def test_bad_cursor_and_unknown_list(self):
+        url = reverse("dashboard-lead-list", args=["overdue"])
+        self.assertEqual(self.client.get(url, {"cursor": "not-a-cursor"}).status_code, 400)
+        # Well-formed, but the values do not fit the ordering's fields.
+        for values in (["not-a-date", "zzz"], [[1], "x"], [{"a": 1}, "x"], [1e400, "x"]):
+            self.assertEqual(self.client.get(url, {"cursor": encode_cursor(values)}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("dashboard-lead-list", args=["nope"])).status_code, 404)
+
+    def test_lead_lists_require_lead_access(self):
+        user = get_user_model().objects.create_user("ops", "ops@example.com", "pw")
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("dashboard-lead-list", args=["overdue"]))
+        self.assertEqual(response.status_code, 403)
+
+    def test_home_reads_no_reference_data_once_warm(self):
+        self.client.get(reverse("dashboard-home"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("dashboard-home"))
+        self.assertContains(response, "Warm — 25")
+        tables = " ".join(query["sql"] for query in queries.captured_queries)
+        self.assertNotIn('"core_appsetting"', tables)
+        self.assertNotIn('FROM "crm_pipelinestage"', tables)
+        self.assertNotIn('JOIN "crm_pipelinestage"', tables)
+
+    def test_home_renders_counts_and_first_page_only(self):
+        response = self.client.get(reverse("dashboard-home"))
+
+        self.assertContains(response, "Overdue Follow-ups (25)")
+        section = response.context["overdue_leads"]
+        self.assertEqual(len(section["items"]), 10)
+        self.assertIsNotNone(section["next_cursor"])
+
+
+class HomeFragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.stage = PipelineStage.objects.create(name="Warm", order=1)
+        self.lead = Lead.objects.create(
+            business_name="Acme",
+            contact_person="Jane Doe",
+            phone="0700000000",
+            pain_point="Needs a better process",
+            stage=self.stage,
+            next_action_due=timezone.now() - timedelta(days=2),
+        )
+        self.owner = get_user_model().objects.create_superuser("owner", "owner@example.com", "pw")
+        self.client.force_login(self.owner)
+
+    def test_warm_render_skips_the_section_queries(self):
+        self.client.get(reverse("dashboard-home"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("dashboard-home"))
+        self.assertContains(response, "Overdue Follow-ups (1)")
+        sql = " ".join(query["sql"] for query in queries.captured_queries)
+        self.assertNotIn('"crm_lead"', sql)
+        self.assertNotIn('"automations_automationrun"', sql)
+        self.assertNotIn('"audit_auditevent"', sql)
+
+    def test_lead_write_rerenders_the_lead_sections(self):
+        self.assertContains(self.client.get(reverse("dashboard-home")), "Acme")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lead.business_name = "Acme Renamed"
+            self.lead.save()
+
+        self.assertContains(self.client.get(reverse("dashboard-home")), "Acme Renamed")
+
+    def test_roles_do_not_share_fragments(self):
+        self.assertContains(self.client.get(reverse("dashboard-home")), "Automation Health")
+
+        sales = get_user_model().objects.create_user("sales", "sales@example.com", "pw")
+        sales.groups.add(Group.objects.get(name="Sales"))
+        self.client.force_login(sales)
+        response = self.client.get(reverse("dashboard-home"))
+
+        self.assertContains(response, "Acme")
+        self.assertNotContains(response, "Automation Health")
+
+
+class LeadBucketCountsTests(TestCase):
+    def setUp(self):
+        self.stage = PipelineStage.objects.create(name="Warm", order=1)
+
+    def _make_lead(self, **kwargs):
+        return Lead.objects.create(
+            business_name="Acme Ltd",
+            contact_person="Jane Doe",
+            phone="0700000000",
+            pain_point="Needs a better process",
+            stage=self.stage,
+            **kwargs,
+        )
+
+    def test_all_buckets_in_one_query(self):
+        now = timezone.now()
+        self._make_lead(next_action_due=now - timedelta(days=1))
+        self._make_lead(next_action_due=now - timedelta(days=2), last_interaction_date=now - timedelta(days=20))
+        stale = self._make_lead(last_interaction_date=now - timedelta(days=4))
+        Lead.objects.filter(pk=stale.pk).update(created_at=now - timedelta(days=30))
+        self._make_lead(is_deleted=True, next_action_due=now - timedelta(days=1))
+
+        with self.assertNumQueries(1):
+            counts = lead_bucket_counts(now, stale_days=3)
+
+        self.assertEqual(counts["overdue"], 2)
+        self.assertEqual(counts["stale"], 2)
+        self.assertEqual(counts["new_leads"], 2)
+        self.assertEqual(lead_bucket_counts(now, stale_days=7)["stale"], 1)
+
+    def test_daily_summary_reports_the_dashboard_counts(self):
+        now = timezone.now()
+        self._make_lead(next_action_due=now - timedelta(hours=1), last_interaction_date=now - timedelta(days=4))
+        AppSetting.objects.update_or_create(key="stale_days", defaults={"value": "3"})
+        # The settings cache outlives the test's rolled-back transaction.
+        self.addCleanup(cache.clear)
+
+        with mock.patch("apps.automations.services._send_webhook") as send:
+            send_daily_summary_webhook(now=now)
+
+        payload = send.call_args.args[1]
+        self.assertEqual(payload["summary"]["counts"], lead_bucket_counts(now, stale_days=3))
+        self.assertEqual(payload["summary"]["counts"]["stale"], 1)
+
+
+@override_settings(GDC_METRICS_REFRESH_IN_BACKGROUND=False, GDC_AUTOMATIONS_ENABLED=False)
+class CachedConsistencyMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.cold = PipelineStage.objects.create(name="Cold", order=0)
+        self.warm = PipelineStage.objects.create(name="Warm", order=1)
+
+    def _make_lead(self):
+        return Lead.objects.create(
+            business_name="Acme Ltd",
+            contact_person="Jane Doe",
+            phone="0700000000",
+            pain_point="Needs a better process",
+            stage=self.cold,
+        )
+
+    def _versions(self):
+        return {metric: get_version(f"dashboard.{metric}") for metric in METRICS}
+
+    def test_repeat_hits_are_served_from_the_cache(self):
+        first = cached_consistency_metrics()
+
+        with self.assertNumQueries(0):
+            second = cached_consistency_metrics()
+
+        self.assertEqual(first, second)
+        self.assertEqual(set(first), set(get_consistency_metrics()))
+
+    def test_interaction_invalidates_only_the_lead_metrics(self):
+        lead = self._make_lead()
+        before = self._versions()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Interaction.objects.create(lead=lead, interaction_type="call", summary="Intro call")
+
+        after = self._versions()
+        self.assertNotEqual(before["speed_to_lead"], after["speed_to_lead"])
+        self.assertNotEqual(before["follow_up_completion_rate"], after["follow_up_completion_rate"])
+        self.assertEqual(before["stage_movements"], after["stage_movements"])
+
+    def test_writes_outside_the_windows_keep_the_cache(self):
+        lead = self._make_lead()
+        Lead.objects.filter(pk=lead.pk).update(created_at=timezone.now() - timedelta(days=60))
+        lead = Lead.objects.get(pk=lead.pk)
+        before = self._versions()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            lead.notes = "Old lead, touched up"
+            lead.save()
+
+        self.assertEqual(before, self._versions())
+
+    def test_buffered_stage_change_invalidates_stage_movements(self):
+        lead = Lead.objects.get(pk=self._make_lead().pk)
+        cached_consistency_metrics()
+
+        with self.captureOnCommitCallbacks(execute=True), buffered_audit():
+            lead.stage = self.warm
+            lead.save()
+
+        self.assertEqual(cached_consistency_metrics()["stage_movements"]["rolling"], 1)
+
+    @override_settings(GDC_METRICS_CACHE_FRESH_SECONDS=-1)
+    def test_stale_entries_are_served_then_refreshed(self):
+        lead = self._make_lead()
+        self.assertEqual(cached_consistency_metrics()["stage_movements"]["rolling"], 0)
+
+        # Written around AuditEvent.log(), so nothing invalidates the cache;
+        # only the refresh of the aged entry picks it up.
+        AuditEvent.objects.create(
+            user_email="system",
+            event_type="lead.stage_changed",
+            model_name="Lead",
+            object_id=str(lead.pk),
+            action="update",
+        )
+
+        self.assertEqual(cached_consistency_metrics()["stage_movements"]["rolling"], 0)
+        self.assertEqual(cached_consistency_metrics()["stage_movements"]["rolling"], 1)
+
+
+class DailyMetricRollupTests(MetricsDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = aware_dt(2026, 1, 20, 12)
+        start = aware_dt(2026, 1, 5)
+        for day in range(6):
+            lead = self._make_lead(
+                start + timedelta(days=day, hours=9),
+                next_action_due=start + timedelta(days=day + 1, hours=10),
+            )
+            self._make_interaction(lead, start + timedelta(days=day, hours=9 + day))
+            if day % 2:
+                self._make_interaction(lead, start + timedelta(days=day + 3))
+            self._make_audit("lead.stage_changed", start + timedelta(days=day, hours=15), object_id=lead.pk)
+
+    def _metrics(self, start, end):
+        return (
+            speed_to_lead_minutes(start, end, now=self.now),
+            follow_up_completion_rate(start, end, now=self.now),
+            stage_movement_count(start, end, now=self.now),
+        )
+
+    def test_rollups_answer_the_same_as_raw_data(self):
+        windows = [
+            (aware_dt(2026, 1, 4, 18), aware_dt(2026, 1, 20, 12)),
+            (aware_dt(2026, 1, 5), aware_dt(2026, 1, 8)),
+            (aware_dt(2026, 1, 6, 3), aware_dt(2026, 1, 9, 7)),
+        ]
+        raw = [self._metrics(*window) for window in windows]
+
+        written = rollup_daily_metrics(now=self.now)
+
+        self.assertEqual(written, 15)
+        self.assertEqual(DailyMetricRollup.objects.get(day=date(2026, 1, 6)).responded_leads, 1)
+        self.assertEqual([self._metrics(*window) for window in windows], raw)
+
+    def test_closed_days_are_read_from_rollups(self):
+        rollup_daily_metrics(now=self.now)
+
+        # Rollup rows, then the raw head (Jan 4 evening) and tail (today).
+        with self.assertNumQueries(3):
+            stage_movement_count(aware_dt(2026, 1, 4, 18), self.now, now=self.now)
+
+    def test_incremental_run_recomputes_only_changed_days(self):
+        rollup_daily_metrics(now=self.now)
+        lead = Lead.objects.get(next_action_due=aware_dt(2026, 1, 6, 10))
+        self._make_interaction(lead, aware_dt(2026, 1, 7))
+
+        later = self.now + timedelta(hours=1)
+        written = rollup_daily_metrics(now=later, lookback_days=2)
+
+        # Jan 5 (created), Jan 6 (due) and the two lookback days.
+        self.assertEqual(written, 4)
+        self.assertEqual(
+            DailyMetricRollup.objects.get(day=date(2026, 1, 6)).follow_up_completions, {"2026-01-07": 1}
+        )
+        self.assertEqual(
+            follow_up_completion_rate(aware_dt(2026, 1, 5), aware_dt(2026, 1, 12), now=later),
+            follow_up_completion_rate(aware_dt(2026, 1, 5), aware_dt(2026, 1, 12), now=aware_dt(2026, 1, 4)),
+        )
@@ -1,7 +1,9 @@
 from django.urls import path
 
-from .views import home
+from .views import home, instrumentation_json, lead_list_json
 
 urlpatterns = [
     path("", home, name="dashboard-home"),
+    path("leads/<slug:name>/", lead_list_json, name="dashboard-lead-list"),
+    path("instrumentation/", instrumentation_json, name="dashboard-instrumentation"),
 ]
@@ -1,102 +1,145 @@
 from datetime import timedelta
 
-from django.db.models import Case, Count, IntegerField, Q, Value, When
+from django.conf import settings
+from django.db.models import Count
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
 from django.shortcuts import render
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 
 from apps.automations.models import AutomationRun
+from apps.core.instrumentation import recent_stats
 from apps.core.models import AppSetting
-from apps.crm.models import Lead
-from apps.dashboard.services import get_consistency_metrics
+from apps.core.permissions import request_permissions
+from apps.core.utils import keyset_page
+from apps.crm.models import Lead, PipelineStage
+from apps.dashboard.cache import cached_consistency_metrics, fragment_keys
+from apps.dashboard.services import (
+    LEAD_LISTS,
+    lead_bucket_counts,
+    lead_list,
+    prioritized_leads,
+)
+
+LIST_PAGE_SIZE = 10
+LIST_MAX_PAGE_SIZE = 100
+
+
+def _lead_section(name, count, now, stale_days):
+    leads, ordering = lead_list(name, now, stale_days=stale_days)
+    items, next_cursor = keyset_page(leads, ordering, limit=LIST_PAGE_SIZE)
+    return {
+        "count": count,
+        "items": items,
+        "next_cursor": next_cursor,
+        "url": reverse("dashboard-lead-list", args=[name]),
+    }
+
+
+def _lead_json(lead):
+    return {
+        "id": str(lead.id),
+        "business_name": lead.business_name,
+        "stage": lead.stage_name,
+        "next_action": lead.next_action,
+        "next_action_due": lead.next_action_due.isoformat() if lead.next_action_due else None,
+        "last_interaction_date": lead.last_interaction_date.isoformat() if lead.last_interaction_date else None,
+    }
+
+
+@login_required
+def lead_list_json(request, name):
+    """One cursor page of a dashboard lead list, for "show more"."""
+    if not request_permissions(request)["can_view_leads"]:
+        return JsonResponse({"error": "Forbidden."}, status=403)
+    if name not in LEAD_LISTS:
+        return JsonResponse({"error": f"Unknown list: {name}"}, status=404)
+    try:
+        limit = min(max(int(request.GET.get("limit", LIST_PAGE_SIZE)), 1), LIST_MAX_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({"error": "Invalid limit."}, status=400)
+
+    stale_days = AppSetting.get_int("stale_days", 7)
+    leads, ordering = lead_list(name, timezone.now(), stale_days=stale_days)
+    try:
+        items, next_cursor = keyset_page(leads, ordering, cursor=request.GET.get("cursor"), limit=limit)
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    return JsonResponse({"results": [_lead_json(lead) for lead in items], "next_cursor": next_cursor})
 
 
 @login_required
+def instrumentation_json(request):
+    """The sampled per-request/command stats this worker has kept, newest first."""
+    if not request.user.is_superuser:
+        return JsonResponse({"error": "Forbidden."}, status=403)
+    return JsonResponse({"results": recent_stats()})
+
+
+def _pipeline_counts():
+    # Grouped by the foreign key alone; names and order come from the stage cache.
+    totals = dict(Lead.objects.values("stage_id").annotate(total=Count("id")).values_list("stage_id", "total"))
+    return [
+        {"stage__name": stage.name, "stage__order": stage.order, "total": totals[stage.pk]}
+        for stage in PipelineStage.cached_all()
+        if stage.pk in totals
+    ]
 
+
+@login_required
 def home(request):
     now = timezone.now()
-    today = timezone.localdate()
     stale_days = AppSetting.get_int("stale_days", 7)
-    stale_cutoff = now - timedelta(days=stale_days)
-
-    user = request.user
-    groups = set(user.groups.values_list("name", flat=True)) if user.is_authenticated else set()
-    is_owner = user.is_superuser or "Owner" in groups
-    is_sales = "Sales" in groups
-    is_ops = "Ops" in groups
-
-    can_view_leads = is_owner or is_sales
-    can_view_health = is_owner or is_ops
-    can_view_financials = is_owner
-
-    overdue_leads = Lead.objects.filter(
-        next_action_due__lt=now, next_action_due__isnull=False
-    ).select_related("stage")
-    due_today_leads = Lead.objects.filter(
-        next_action_due__date=today
-    ).select_related("stage")
-    stale_leads = Lead.objects.filter(
-        Q(last_interaction_date__lte=stale_cutoff)
-        | Q(last_interaction_date__isnull=True, first_contact_date__lte=stale_cutoff)
-    ).select_related("stage")
-
-    priorities = (
-        Lead.objects.select_related("stage")
-        .annotate(
-            priority_rank=Case(
-                When(next_action_due__lt=now, then=Value(1)),
-                When(next_action_due__date=today, then=Value(2)),
-                When(
-                    Q(last_interaction_date__lte=stale_cutoff)
-                    | Q(last_interaction_date__isnull=True, first_contact_date__lte=stale_cutoff),
-                    then=Value(3),
-                ),
-                default=Value(4),
-                output_field=IntegerField(),
-            )
-        )
-        .order_by("priority_rank", "-value_estimate")
-    )
 
-    pipeline_counts = (
-        Lead.objects.values("stage__name", "stage__order")
-        .annotate(total=Count("id"))
-        .order_by("stage__order")
-    )
+    permissions = request_permissions(request)
+    can_view_leads = permissions["can_view_leads"]
+    can_view_health = permissions["can_view_health"]
+    can_view_financials = permissions["can_view_financials"]
+
+    # Everything below is lazy: a section whose template fragment is cached
+    # never evaluates the data behind it.
+    def load_lead_sections():
+        if not can_view_leads:
+            return {}
+        counts = lead_bucket_counts(now, stale_days=stale_days)
+        return {name: _lead_section(name, counts[name], now, stale_days) for name in LEAD_LISTS}
+
+    lead_sections = SimpleLazyObject(load_lead_sections)
 
     next_actions = (
         Lead.objects.exclude(next_action="")
         .filter(next_action_due__isnull=False)
         .order_by("next_action_due")
-        .select_related("stage")
     )
 
-    consistency_metrics = get_consistency_metrics(now=now)
-
-    last_daily_summary = (
-        AutomationRun.objects.filter(event_type="daily.summary", success=True)
+    last_daily_summary = SimpleLazyObject(
+        lambda: AutomationRun.objects.filter(event_type="daily.summary", success=True)
         .order_by("-created_at")
         .first()
     )
-    automation_failures_24h = AutomationRun.objects.filter(
-        created_at__gte=now - timedelta(hours=24), success=False
-    ).count()
+    automation_failures_24h = SimpleLazyObject(
+        lambda: AutomationRun.objects.filter(created_at__gte=now - timedelta(hours=24), success=False).count()
+    )
     automation_runs = AutomationRun.objects.order_by("-created_at")[:5]
 
     context = {
-        "overdue_leads": overdue_leads,
-        "due_today_leads": due_today_leads,
-        "stale_leads": stale_leads,
+        "overdue_leads": SimpleLazyObject(lambda: lead_sections.get("overdue")),
+        "due_today_leads": SimpleLazyObject(lambda: lead_sections.get("due_today")),
+        "stale_leads": SimpleLazyObject(lambda: lead_sections.get("stale")),
         "stale_days": stale_days,
-        "priorities": priorities[:10],
-        "pipeline_counts": pipeline_counts,
+        "priorities": prioritized_leads(now, stale_days=stale_days)[:10],
+        "pipeline_counts": SimpleLazyObject(_pipeline_counts),
         "next_actions": next_actions[:10],
-        "consistency_metrics": consistency_metrics,
+        "consistency_metrics": SimpleLazyObject(lambda: cached_consistency_metrics(now=now)),
         "last_daily_summary": last_daily_summary,
         "automation_failures_24h": automation_failures_24h,
         "automation_runs": automation_runs,
         "can_view_leads": can_view_leads,
         "can_view_health": can_view_health,
         "can_view_financials": can_view_financials,
+        "fragment_keys": fragment_keys(permissions, now, stale_days),
+        "fragment_seconds": settings.GDC_DASHBOARD_FRAGMENT_SECONDS,
     }
     return render(request, "dashboard/home.html", context)
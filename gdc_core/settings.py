@@ -38,11 +38,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "apps.core.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.core.permissions.RoleMiddleware",
+    "apps.audit.middleware.AuditBufferMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -107,12 +110,51 @@ MEDIA_ROOT = BASE_DIR / "media"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("GDC_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("GDC_CACHE_LOCATION", "gdc-ops"),
+    }
+}
+
 # Automations
 GDC_AUTOMATIONS_ENABLED = os.getenv("GDC_AUTOMATIONS_ENABLED", "true").lower() == "true"
 GDC_WEBHOOK_BASE_URL = os.getenv("GDC_WEBHOOK_BASE_URL", "http://127.0.0.1:5678/webhook/")
 GDC_WEBHOOK_SECRET = os.getenv("GDC_WEBHOOK_SECRET", "")
 GDC_WEBHOOK_TIMEOUT = int(os.getenv("GDC_WEBHOOK_TIMEOUT", "10"))
 GDC_AUTOMATIONS_RETRY_MAX = int(os.getenv("GDC_AUTOMATIONS_RETRY_MAX", "3"))
+GDC_AUTOMATIONS_RETRY_BASE_SECONDS = float(os.getenv("GDC_AUTOMATIONS_RETRY_BASE_SECONDS", "30"))
+GDC_AUTOMATIONS_RETRY_MAX_DELAY = float(os.getenv("GDC_AUTOMATIONS_RETRY_MAX_DELAY", "3600"))
+GDC_WEBHOOK_CIRCUIT_THRESHOLD = int(os.getenv("GDC_WEBHOOK_CIRCUIT_THRESHOLD", "5"))
+GDC_WEBHOOK_CIRCUIT_COOLDOWN = int(os.getenv("GDC_WEBHOOK_CIRCUIT_COOLDOWN", "60"))
+GDC_WEBHOOK_POOL_SIZE = int(os.getenv("GDC_WEBHOOK_POOL_SIZE", "10"))
+GDC_WEBHOOK_POOL_IDLE_TIMEOUT = float(os.getenv("GDC_WEBHOOK_POOL_IDLE_TIMEOUT", "30"))
+GDC_AUTOMATIONS_CONCURRENCY = int(os.getenv("GDC_AUTOMATIONS_CONCURRENCY", "8"))
+GDC_OUTBOX_BATCH_SIZE = int(os.getenv("GDC_OUTBOX_BATCH_SIZE", "100"))
+GDC_OUTBOX_LOCK_TIMEOUT = int(os.getenv("GDC_OUTBOX_LOCK_TIMEOUT", "300"))
+GDC_OUTBOX_POLL_INTERVAL = float(os.getenv("GDC_OUTBOX_POLL_INTERVAL", "2"))
+
+# Audit
+GDC_AUDIT_BUFFER_MAX_SIZE = int(os.getenv("GDC_AUDIT_BUFFER_MAX_SIZE", "1000"))
+# The change feed only serves events at least this old, so a poll never
+# moves past events whose transaction has not committed yet.
+GDC_CHANGE_FEED_LAG_SECONDS = float(os.getenv("GDC_CHANGE_FEED_LAG_SECONDS", "5"))
+GDC_AUDIT_RETENTION_DAYS = int(os.getenv("GDC_AUDIT_RETENTION_DAYS", "365"))
+GDC_AUDIT_ARCHIVE_DIR = Path(os.getenv("GDC_AUDIT_ARCHIVE_DIR", str(BASE_DIR / "archive" / "audit")))
+
+# Dashboard
+GDC_METRICS_CACHE_FRESH_SECONDS = int(os.getenv("GDC_METRICS_CACHE_FRESH_SECONDS", "60"))
+GDC_METRICS_CACHE_TTL = int(os.getenv("GDC_METRICS_CACHE_TTL", "3600"))
+GDC_METRICS_REFRESH_IN_BACKGROUND = os.getenv("GDC_METRICS_REFRESH_IN_BACKGROUND", "true").lower() == "true"
+GDC_DASHBOARD_FRAGMENT_SECONDS = int(os.getenv("GDC_DASHBOARD_FRAGMENT_SECONDS", "60"))
+
+# Instrumentation: every response gets query/timing headers; a sample (and
+# every slow request) is logged to "gdc.instrumentation" and kept in memory.
+GDC_INSTRUMENTATION_ENABLED = os.getenv("GDC_INSTRUMENTATION_ENABLED", "true").lower() == "true"
+GDC_INSTRUMENTATION_SAMPLE_RATE = float(os.getenv("GDC_INSTRUMENTATION_SAMPLE_RATE", "0.01"))
+GDC_INSTRUMENTATION_SLOW_MS = float(os.getenv("GDC_INSTRUMENTATION_SLOW_MS", "1000"))
+GDC_INSTRUMENTATION_SLOW_QUERIES = int(os.getenv("GDC_INSTRUMENTATION_SLOW_QUERIES", "5"))
+GDC_INSTRUMENTATION_BUFFER_SIZE = int(os.getenv("GDC_INSTRUMENTATION_BUFFER_SIZE", "200"))
 
 LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "/dashboard/"
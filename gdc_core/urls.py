@@ -7,4 +7,5 @@ urlpatterns = [
     path("", include("apps.identity.urls")),
     path("dashboard/", include("apps.dashboard.urls")),
     path("crm/", include("apps.crm.urls")),
+    path("audit/", include("apps.audit.urls")),
 ]
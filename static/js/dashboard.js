@@ -0,0 +1,47 @@
+// "Show more" for the dashboard lead lists: fetches the next cursor page
+// from the JSON endpoint and appends it to the list.
+(function () {
+  function formatDate(value) {
+    if (!value) {
+      return "";
+    }
+    return new Date(value).toLocaleDateString(undefined, { month: "short", day: "numeric", year: "numeric" });
+  }
+
+  function describe(list, lead) {
+    if (list === "stale") {
+      return lead.business_name + " — last touch " + formatDate(lead.last_interaction_date);
+    }
+    return lead.business_name + " — due " + formatDate(lead.next_action_due);
+  }
+
+  document.querySelectorAll("[data-show-more]").forEach(function (button) {
+    button.addEventListener("click", function () {
+      var list = button.dataset.showMore;
+      var target = document.querySelector('[data-lead-list="' + list + '"]');
+      button.disabled = true;
+      fetch(button.dataset.url + "?cursor=" + encodeURIComponent(button.dataset.cursor), {
+        credentials: "same-origin",
+      })
+        .then(function (response) {
+          return response.json();
+        })
+        .then(function (page) {
+          page.results.forEach(function (lead) {
+            var item = document.createElement("li");
+            item.textContent = describe(list, lead);
+            target.appendChild(item);
+          });
+          if (page.next_cursor) {
+            button.dataset.cursor = page.next_cursor;
+            button.disabled = false;
+          } else {
+            button.remove();
+          }
+        })
+        .catch(function () {
+          button.disabled = false;
+        });
+    });
+  });
+})();